@@ -3,7 +3,17 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from contextlib import contextmanager
 import json
+import os
+import threading
+import time
+
+from instrumentation import instrumentation
+from pricing import PriceCatalog
+from result_cache import ResultCache, file_digest, fingerprint
+from rules import RuleSet
+from utils import BatchValidators
 
 # =============================================================================
 # CONFIGURATION & CONSTANTS
@@ -27,6 +37,14 @@ class Config:
     FLIGHT_TRANSATLANTIC_CO2 = 1000  # kg
     HOUSEHOLD_WATER_PER_DAY = 300  # liters
     US_HOME_ENERGY_PER_YEAR = 10800  # kWh
+    HOURS_PER_YEAR = 8760
+    
+    # Bulk upload tab: rows per background chunk, retained rows, table page
+    # size and how often a running job refreshes the page
+    BULK_CHUNK_ROWS = 5000
+    BULK_MAX_ROWS = 250000
+    BULK_PAGE_SIZE = 100
+    BULK_POLL_SECONDS = 0.5
     
     # Data center locations with carbon intensity (gCO2e/kWh) and water usage (L/kWh)
     LOCATIONS = {
@@ -41,12 +59,20 @@ class Config:
     }
     
     # Hardware specifications
+    # embodied_co2: manufacturing footprint per accelerator incl. its share of
+    # the host server (kg CO2e); lifetime_years/utilization: service life and
+    # busy fraction the embodied carbon is amortized over
     HARDWARE = {
-        "NVIDIA A100": {"tdp": 400, "efficiency": 1.0, "cost_per_hour": 3.0, "generation": "Ampere"},
-        "NVIDIA H100": {"tdp": 700, "efficiency": 1.4, "cost_per_hour": 8.0, "generation": "Hopper"},
-        "NVIDIA V100": {"tdp": 300, "efficiency": 0.7, "cost_per_hour": 2.0, "generation": "Volta"},
-        "TPU v4": {"tdp": 350, "efficiency": 1.2, "cost_per_hour": 3.5, "generation": "TPU"},
-        "TPU v5": {"tdp": 400, "efficiency": 1.5, "cost_per_hour": 4.5, "generation": "TPU"}
+        "NVIDIA A100": {"tdp": 400, "efficiency": 1.0, "cost_per_hour": 3.0, "generation": "Ampere",
+                        "release_year": 2020, "embodied_co2": 150, "lifetime_years": 5, "utilization": 0.6},
+        "NVIDIA H100": {"tdp": 700, "efficiency": 1.4, "cost_per_hour": 8.0, "generation": "Hopper",
+                        "release_year": 2022, "embodied_co2": 170, "lifetime_years": 5, "utilization": 0.6},
+        "NVIDIA V100": {"tdp": 300, "efficiency": 0.7, "cost_per_hour": 2.0, "generation": "Volta",
+                        "release_year": 2017, "embodied_co2": 120, "lifetime_years": 5, "utilization": 0.5},
+        "TPU v4": {"tdp": 350, "efficiency": 1.2, "cost_per_hour": 3.5, "generation": "TPU",
+                   "release_year": 2021, "embodied_co2": 130, "lifetime_years": 5, "utilization": 0.7},
+        "TPU v5": {"tdp": 400, "efficiency": 1.5, "cost_per_hour": 4.5, "generation": "TPU",
+                   "release_year": 2023, "embodied_co2": 140, "lifetime_years": 5, "utilization": 0.7}
     }
     
     # Model type configurations
@@ -54,6 +80,22 @@ class Config:
         "Dense": {"efficiency_multiplier": 1.0, "risk_modifier": 0},
         "MoE (Mixture of Experts)": {"efficiency_multiplier": 0.8, "risk_modifier": 0.5}
     }
+    
+    # Recommendation rule files: the built-in set, then any extra files listed
+    # in ECO_CALC_RULES (separated by os.pathsep)
+    RECOMMENDATION_RULES_FILES = [
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "recommendation_rules.json")
+    ] + [path for path in os.environ.get("ECO_CALC_RULES", "").split(os.pathsep) if path]
+    
+    # Optional price catalog (see pricing.py) named by ECO_CALC_PRICING; without
+    # one, costs use the flat cost_per_hour and ENERGY_COST_PER_KWH
+    PRICE_CATALOG_FILE = os.environ.get("ECO_CALC_PRICING") or None
+    
+    # Optional persistent result cache (see result_cache.py): SQLite file named
+    # by ECO_CALC_CACHE, entry lifetime in seconds and LRU size limit
+    RESULT_CACHE_FILE = os.environ.get("ECO_CALC_CACHE") or None
+    RESULT_CACHE_TTL = float(os.environ["ECO_CALC_CACHE_TTL"]) if os.environ.get("ECO_CALC_CACHE_TTL") else None
+    RESULT_CACHE_MAX_ENTRIES = 1000000
 
 # =============================================================================
 # DATA MODELS
@@ -61,6 +103,11 @@ class Config:
 
 class CalculationInput:
     """Input parameters for calculations"""
+    
+    # Attribute names, also the column names of batch input frames
+    FIELDS = ("params_b", "model_type", "training_hours", "tokens_per_day",
+              "inference_days", "location", "hardware", "pue")
+    
     def __init__(self, params_b, model_type, training_hours, tokens_per_day, 
                  inference_days, location, hardware, pue):
         self.params_b = params_b
@@ -83,9 +130,31 @@ class CalculationInput:
             "Hardware": self.hardware,
             "PUE": self.pue
         }
+    
+    @classmethod
+    def to_frame(cls, inputs: list) -> pd.DataFrame:
+        """Stack inputs into a batch frame with one column per attribute"""
+        return pd.DataFrame(
+            [[getattr(item, field) for field in cls.FIELDS] for item in inputs],
+            columns=list(cls.FIELDS)
+        )
+    
+    @classmethod
+    def normalize_columns(cls, frame: pd.DataFrame) -> pd.DataFrame:
+        """Rename to_dict labels ("Model Parameters (B)", ...) to attribute names"""
+        labels = cls(*cls.FIELDS).to_dict().keys()
+        return frame.rename(columns=dict(zip(labels, cls.FIELDS)))
 
 class CalculationResult:
     """Results from calculations"""
+    
+    # Numeric/text attributes, also the column names of batch result frames
+    FIELDS = ("training_co2", "training_energy", "training_water", "training_cost",
+              "inference_co2", "inference_energy", "inference_water", "inference_cost",
+              "total_co2", "total_energy", "total_water", "total_cost",
+              "training_embodied_co2", "inference_embodied_co2", "total_embodied_co2", "lifecycle_co2",
+              "ethical_score", "ethical_explanation")
+    
     def __init__(self):
         self.training_co2 = 0
         self.training_energy = 0
@@ -102,6 +171,12 @@ class CalculationResult:
         self.total_water = 0
         self.total_cost = 0
         
+        # Amortized hardware manufacturing carbon, kept apart from operational CO2
+        self.training_embodied_co2 = 0
+        self.inference_embodied_co2 = 0
+        self.total_embodied_co2 = 0
+        self.lifecycle_co2 = 0
+        
         self.ethical_score = 0
         self.ethical_explanation = ""
         
@@ -112,6 +187,16 @@ class CalculationResult:
         self.total_energy = self.training_energy + self.inference_energy
         self.total_water = self.training_water + self.inference_water
         self.total_cost = self.training_cost + self.inference_cost
+        self.total_embodied_co2 = self.training_embodied_co2 + self.inference_embodied_co2
+        self.lifecycle_co2 = self.total_co2 + self.total_embodied_co2
+    
+    @classmethod
+    def from_values(cls, values) -> "CalculationResult":
+        """Result with FIELDS set from a sequence in FIELDS order"""
+        result = cls()
+        for field, value in zip(cls.FIELDS, values):
+            setattr(result, field, value)
+        return result
     
     def to_dict(self):
         return {
@@ -133,6 +218,12 @@ class CalculationResult:
                 "water_liters": self.total_water,
                 "cost_usd": self.total_cost
             },
+            "embodied": {
+                "training_co2_kg": self.training_embodied_co2,
+                "inference_co2_kg": self.inference_embodied_co2,
+                "total_co2_kg": self.total_embodied_co2,
+                "lifecycle_co2_kg": self.lifecycle_co2
+            },
             "ethical": {
                 "score": self.ethical_score,
                 "explanation": self.ethical_explanation
@@ -147,6 +238,30 @@ class CalculationResult:
 class ImpactCalculator:
     """Core calculation engine - easily extensible and testable"""
     
+    # Embodied carbon amortized per device hour (kg CO2e/h), precomputed per hardware
+    EMBODIED_CO2_PER_HOUR = {
+        name: spec["embodied_co2"] / (spec["lifetime_years"] * Config.HOURS_PER_YEAR * spec["utilization"])
+        for name, spec in Config.HARDWARE.items()
+    }
+    
+    # Price catalog used by calculate_cost and calculate_batch, None for flat pricing. A
+    # catalog without every Config.HARDWARE/LOCATIONS key fails here, not in the first batch
+    PRICING = PriceCatalog.from_file(Config.PRICE_CATALOG_FILE).require(
+        list(Config.HARDWARE), list(Config.LOCATIONS)
+    ) if Config.PRICE_CATALOG_FILE else None
+    
+    # Everything a cached result depends on: Config constants/catalogs and the price catalog
+    CACHE_VERSION = fingerprint(
+        {name: value for name, value in vars(Config).items()
+         if name.isupper() and isinstance(value, (int, float, str, dict))},
+        file_digest(Config.PRICE_CATALOG_FILE)
+    )
+    # Single calculations only: the vectorized calculate_batch is cheaper than any lookup
+    CACHE = ResultCache(
+        Config.RESULT_CACHE_FILE, CalculationResult.FIELDS, CACHE_VERSION,
+        Config.RESULT_CACHE_TTL, Config.RESULT_CACHE_MAX_ENTRIES
+    ) if Config.RESULT_CACHE_FILE else None
+    
     @staticmethod
     def calculate_training_carbon(params_b, training_hours, hardware_type, pue, 
                                   carbon_intensity, model_type):
@@ -202,16 +317,38 @@ class ImpactCalculator:
         
         return carbon_kg, energy_kwh
     
+    @staticmethod
+    def calculate_inference_hours(tokens_per_day, days):
+        """Device hours spent serving tokens (1 token ≈ 0.001 s, as in calculate_inference_carbon)"""
+        return (tokens_per_day * days * 0.001) / 3600
+    
+    @staticmethod
+    def calculate_embodied_carbon(device_hours, hardware_type):
+        """Hardware manufacturing carbon amortized over `device_hours` of use (kg CO2e)"""
+        return device_hours * ImpactCalculator.EMBODIED_CO2_PER_HOUR[hardware_type]
+    
     @staticmethod
     def calculate_water_usage(energy_kwh, water_per_kwh):
         """Calculate water consumption for cooling"""
         return energy_kwh * water_per_kwh
     
     @staticmethod
-    def calculate_cost(energy_kwh, hardware_type):
-        """Calculate financial cost"""
+    def calculate_cost(energy_kwh, hardware_type, location=None, phase=None):
+        """
+        Calculate financial cost (catalog rates and tariffs when PRICING is set).
+        
+        With PRICING, inference energy (phase="inference") is priced with the
+        catalog's inference load profile, other energy as a constant load.
+        """
         hw_specs = Config.HARDWARE[hardware_type]
         base_rate = hw_specs["cost_per_hour"]
+        energy_price = Config.ENERGY_COST_PER_KWH
+        if ImpactCalculator.PRICING is not None and location is not None:
+            base_rate = ImpactCalculator.PRICING.hourly_rate(hardware_type)
+            if phase == "inference":
+                energy_price = ImpactCalculator.PRICING.inference_price(location)
+            else:
+                energy_price = ImpactCalculator.PRICING.energy_price(location)
         tdp_kw = hw_specs["tdp"] / 1000
         
         # Compute hours
@@ -219,7 +356,7 @@ class ImpactCalculator:
         
         # Compute cost + energy cost
         compute_cost = compute_hours * base_rate
-        energy_cost = energy_kwh * Config.ENERGY_COST_PER_KWH
+        energy_cost = energy_kwh * energy_price
         
         return compute_cost + energy_cost
     
@@ -270,41 +407,296 @@ class ImpactCalculator:
         water_per_kwh = location_data["water"]
         
         # Training calculations
-        result.training_co2, result.training_energy = cls.calculate_training_carbon(
-            input_params.params_b,
-            input_params.training_hours,
-            input_params.hardware,
-            input_params.pue,
-            carbon_intensity,
-            input_params.model_type
-        )
-        result.training_water = cls.calculate_water_usage(result.training_energy, water_per_kwh)
-        result.training_cost = cls.calculate_cost(result.training_energy, input_params.hardware)
+        with instrumentation.stage("training"):
+            result.training_co2, result.training_energy = cls.calculate_training_carbon(
+                input_params.params_b,
+                input_params.training_hours,
+                input_params.hardware,
+                input_params.pue,
+                carbon_intensity,
+                input_params.model_type
+            )
         
         # Inference calculations
-        result.inference_co2, result.inference_energy = cls.calculate_inference_carbon(
-            input_params.tokens_per_day,
-            input_params.inference_days,
-            input_params.params_b,
-            input_params.hardware,
-            input_params.pue,
-            carbon_intensity,
-            input_params.model_type
-        )
-        result.inference_water = cls.calculate_water_usage(result.inference_energy, water_per_kwh)
-        result.inference_cost = cls.calculate_cost(result.inference_energy, input_params.hardware)
+        with instrumentation.stage("inference"):
+            result.inference_co2, result.inference_energy = cls.calculate_inference_carbon(
+                input_params.tokens_per_day,
+                input_params.inference_days,
+                input_params.params_b,
+                input_params.hardware,
+                input_params.pue,
+                carbon_intensity,
+                input_params.model_type
+            )
+        
+        # Water and cost per phase
+        with instrumentation.stage("water_cost"):
+            result.training_water = cls.calculate_water_usage(result.training_energy, water_per_kwh)
+            result.training_cost = cls.calculate_cost(
+                result.training_energy, input_params.hardware, input_params.location
+            )
+            result.inference_water = cls.calculate_water_usage(result.inference_energy, water_per_kwh)
+            result.inference_cost = cls.calculate_cost(
+                result.inference_energy, input_params.hardware, input_params.location, "inference"
+            )
+        
+        # Embodied hardware carbon over the device hours of each phase
+        with instrumentation.stage("embodied"):
+            result.training_embodied_co2 = cls.calculate_embodied_carbon(
+                input_params.training_hours, input_params.hardware
+            )
+            result.inference_embodied_co2 = cls.calculate_embodied_carbon(
+                cls.calculate_inference_hours(input_params.tokens_per_day, input_params.inference_days),
+                input_params.hardware
+            )
         
         # Totals
         result.calculate_totals()
         
         # Ethical risk
-        result.ethical_score = cls.calculate_ethical_risk(
-            input_params.params_b,
-            input_params.model_type
-        )
-        result.ethical_explanation = cls.get_ethical_explanation(result.ethical_score)
+        with instrumentation.stage("ethics"):
+            result.ethical_score = cls.calculate_ethical_risk(
+                input_params.params_b,
+                input_params.model_type
+            )
+            result.ethical_explanation = cls.get_ethical_explanation(result.ethical_score)
         
         return result
+    
+    @classmethod
+    def calculate_cached(cls, input_params: CalculationInput) -> CalculationResult:
+        """calculate_all behind CACHE, when one is configured"""
+        if cls.CACHE is None:
+            return cls.calculate_all(input_params)
+        key = cls.CACHE.key([getattr(input_params, field) for field in CalculationInput.FIELDS])
+        values = cls.CACHE.get(key)
+        if values is not None:
+            return CalculationResult.from_values(values)
+        result = cls.calculate_all(input_params)
+        cls.CACHE.put(key, [getattr(result, field) for field in CalculationResult.FIELDS])
+        return result
+    
+    # Size ladder of calculate_ethical_risk: params_b below ETHICAL_SIZE_BINS[i]
+    # scores ETHICAL_SIZE_SCORES[i], anything larger the last score
+    ETHICAL_SIZE_BINS = (1, 10, 50, 100, 500)
+    ETHICAL_SIZE_SCORES = (2, 4, 6, 7, 8, 9)
+    
+    @staticmethod
+    def _codes(values: pd.Series, table: dict) -> np.ndarray:
+        """Positions of a column of catalog keys within `table`"""
+        codes = pd.Categorical(values, categories=list(table.keys())).codes
+        if (codes < 0).any():
+            unknown = sorted(set(pd.Series(values)[codes < 0].astype(str)))
+            raise KeyError(f"Unknown {values.name or 'key'}: {', '.join(unknown)}")
+        return codes
+    
+    @staticmethod
+    def _lookup(values: pd.Series, table: dict, field: str, dtype=float) -> np.ndarray:
+        """Map a column of catalog keys to an array of `field` values"""
+        codes = ImpactCalculator._codes(values, table)
+        return np.array([spec[field] for spec in table.values()], dtype=dtype)[codes]
+    
+    @classmethod
+    def _price_tables(cls):
+        """($/device-hour per Config.HARDWARE entry, $/kWh per Config.LOCATIONS entry or one flat rate)"""
+        if cls.PRICING is None:
+            return (np.array([spec["cost_per_hour"] for spec in Config.HARDWARE.values()], dtype=float),
+                    Config.ENERGY_COST_PER_KWH)
+        return cls.PRICING.hourly_rates(list(Config.HARDWARE)), cls.PRICING.energy_prices(list(Config.LOCATIONS))
+    
+    @classmethod
+    def _inference_price_table(cls):
+        """Inference $/kWh per Config.LOCATIONS entry (load-profile weighted) or one flat rate"""
+        if cls.PRICING is None:
+            return Config.ENERGY_COST_PER_KWH
+        return cls.PRICING.inference_prices(list(Config.LOCATIONS))
+    
+    @classmethod
+    def _price_arrays(cls, hardware: pd.Series, location: pd.Series):
+        """($/device-hour, $/kWh) per row, from PRICING or the flat Config rates"""
+        hourly_rates, energy_prices = cls._price_tables()
+        cost_per_hour = hourly_rates[cls._codes(hardware, Config.HARDWARE)]
+        if np.ndim(energy_prices) == 0:
+            return cost_per_hour, energy_prices
+        return cost_per_hour, energy_prices[cls._codes(location, Config.LOCATIONS)]
+    
+    # Catalog columns of batch inputs and their known values
+    BATCH_CATEGORIES = {
+        "model_type": Config.MODEL_TYPES,
+        "location": Config.LOCATIONS,
+        "hardware": Config.HARDWARE
+    }
+    
+    @classmethod
+    @instrumentation.timed("batch.validation")
+    def validate_batch(cls, inputs: pd.DataFrame, policy: str = "reject"):
+        """
+        Validate a batch input frame against Validators.BOUNDS and the catalogs.
+        
+        Args:
+            inputs: Batch input frame
+            policy: "reject", "clip" or "quarantine" (see BatchValidators.apply)
+            
+        Returns:
+            (valid rows, quarantined rows, ValidationReport)
+        """
+        return BatchValidators.apply(inputs, policy, categories=cls.BATCH_CATEGORIES)
+    
+    @classmethod
+    def calculate_batch(cls, inputs: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized calculate_all over a frame of scenarios.
+        
+        Follows the scalar formulas operation for operation, so each row
+        matches calculate_all for the same input.
+        
+        With PRICING set, an optional "training_start" column (local time of
+        the location) prices each training run over the tariff hours it
+        actually spans instead of at the tariff's mean.
+        
+        Args:
+            inputs: One row per scenario, columns named as CalculationInput.FIELDS
+            
+        Returns:
+            Frame with the same index and columns named as CalculationResult.FIELDS
+            
+        Raises:
+            KeyError: If a column is missing or a location/hardware/model type is unknown
+        """
+        missing = [field for field in CalculationInput.FIELDS if field not in inputs.columns]
+        if missing:
+            raise KeyError(f"Missing input columns: {', '.join(missing)}")
+        
+        training_energy_price = None
+        if cls.PRICING is not None and "training_start" in inputs.columns:
+            with instrumentation.stage("batch.tariffs"):
+                starts = pd.to_datetime(inputs["training_start"])
+                if starts.dt.tz is not None:
+                    # Tariffs are in wall-clock time; keep it, drop the zone
+                    starts = starts.dt.tz_localize(None)
+                training_energy_price = cls.PRICING.interval_prices(
+                    inputs["location"].to_numpy(), starts.to_numpy(), inputs["training_hours"].to_numpy(dtype=float)
+                )
+        
+        out = cls.calculate_arrays(
+            inputs["params_b"].to_numpy(dtype=float),
+            inputs["training_hours"].to_numpy(dtype=float),
+            inputs["tokens_per_day"].to_numpy(dtype=float),
+            inputs["inference_days"].to_numpy(dtype=float),
+            inputs["pue"].to_numpy(dtype=float),
+            cls._codes(inputs["model_type"], Config.MODEL_TYPES),
+            cls._codes(inputs["location"], Config.LOCATIONS),
+            cls._codes(inputs["hardware"], Config.HARDWARE),
+            training_energy_price=training_energy_price
+        )
+        
+        with instrumentation.stage("batch.explanations"):
+            # Explanations only depend on the score, which takes a handful of values
+            unique_scores, inverse = np.unique(out["ethical_score"], return_inverse=True)
+            explanations = np.array([cls.get_ethical_explanation(value) for value in unique_scores], dtype=object)
+            out["ethical_explanation"] = explanations[inverse]
+        
+        return pd.DataFrame({field: out[field] for field in CalculationResult.FIELDS}, index=inputs.index)
+    
+    # Numeric CalculationResult fields, the ones calculate_arrays produces
+    ARRAY_FIELDS = tuple(field for field in CalculationResult.FIELDS if field != "ethical_explanation")
+    
+    @classmethod
+    def calculate_arrays(cls, params_b, training_hours, tokens_per_day, inference_days, pue,
+                         model_type_codes, location_codes, hardware_codes, out: dict = None,
+                         training_energy_price=None) -> dict:
+        """
+        calculate_batch on plain arrays, the core both frame and Arrow inputs share.
+        
+        Args:
+            params_b, training_hours, tokens_per_day, inference_days, pue: float arrays
+            model_type_codes, location_codes, hardware_codes: Positions in
+                Config.MODEL_TYPES / LOCATIONS / HARDWARE
+            out: Optional preallocated {field: float64 array} for ARRAY_FIELDS;
+                every result is computed in place into its buffer
+            training_energy_price: Optional $/kWh per row for training energy,
+                e.g. time-of-use prices over each run; default the location price
+            
+        Returns:
+            {field: array} for ARRAY_FIELDS (`out` when given)
+        """
+        location_table = list(Config.LOCATIONS.values())
+        hardware_table = list(Config.HARDWARE.values())
+        carbon_intensity = np.array([spec["carbon"] for spec in location_table], dtype=float)[location_codes]
+        water_per_kwh = np.array([spec["water"] for spec in location_table], dtype=float)[location_codes]
+        tdp = np.array([spec["tdp"] for spec in hardware_table], dtype=float)[hardware_codes]
+        efficiency_factor = np.array([spec["efficiency"] for spec in hardware_table], dtype=float)[hardware_codes]
+        hourly_rates, energy_prices = cls._price_tables()
+        cost_per_hour = hourly_rates[hardware_codes]
+        inference_prices = cls._inference_price_table()
+        energy_price = {
+            "training": energy_prices if np.ndim(energy_prices) == 0 else energy_prices[location_codes],
+            "inference": inference_prices if np.ndim(inference_prices) == 0 else inference_prices[location_codes]
+        }
+        if training_energy_price is not None:
+            energy_price["training"] = training_energy_price
+        embodied_rate = np.array(list(cls.EMBODIED_CO2_PER_HOUR.values()))[hardware_codes]
+        model_specs = list(Config.MODEL_TYPES.values())
+        model_efficiency = np.array([spec["efficiency_multiplier"] for spec in model_specs], dtype=float)[
+            model_type_codes
+        ]
+        risk_modifier = np.array([spec["risk_modifier"] for spec in model_specs], dtype=float)[model_type_codes]
+        
+        if out is None:
+            shape = np.broadcast(params_b, training_hours, tokens_per_day, inference_days, pue).shape
+            out = {field: np.empty(shape) for field in cls.ARRAY_FIELDS}
+        # Same operation order as calculate_all, so results stay bit-exact
+        
+        with instrumentation.stage("batch.training"):
+            base_co2 = params_b * Config.CO2_PER_BILLION_PARAMS
+            energy = np.multiply(tdp, training_hours, out=out["training_energy"])
+            np.multiply(energy, pue, out=energy)
+            np.divide(energy, 1000, out=energy)
+            carbon_from_energy = (energy * carbon_intensity) / 1000
+            co2 = np.add(base_co2, carbon_from_energy, out=out["training_co2"])
+            np.multiply(co2, efficiency_factor, out=co2)
+            np.multiply(co2, model_efficiency, out=co2)
+        
+        with instrumentation.stage("batch.inference"):
+            size_factor = 1 + (params_b / 100)
+            co2_per_1k_tokens = Config.INFERENCE_CO2_PER_1K_TOKENS * size_factor
+            total_tokens = tokens_per_day * inference_days
+            co2 = np.divide(total_tokens, 1000, out=out["inference_co2"])
+            np.multiply(co2, co2_per_1k_tokens, out=co2)
+            np.divide(co2, 1000, out=co2)
+            np.multiply(co2, model_efficiency, out=co2)
+            compute_hours = (total_tokens * 0.001) / 3600
+            energy = np.multiply(tdp, compute_hours, out=out["inference_energy"])
+            np.multiply(energy, pue, out=energy)
+            np.divide(energy, 1000, out=energy)
+            np.multiply(energy, model_efficiency, out=energy)
+        
+        with instrumentation.stage("batch.water_cost"):
+            tdp_kw = tdp / 1000
+            safe_tdp_kw = np.where(tdp_kw > 0, tdp_kw, 1.0)
+            for phase in ("training", "inference"):
+                energy = out[f"{phase}_energy"]
+                np.multiply(energy, water_per_kwh, out=out[f"{phase}_water"])
+                phase_hours = np.where(tdp_kw > 0, energy / safe_tdp_kw, 0)
+                cost = np.multiply(phase_hours, cost_per_hour, out=out[f"{phase}_cost"])
+                np.add(cost, energy * energy_price[phase], out=cost)
+        
+        with instrumentation.stage("batch.embodied"):
+            np.multiply(training_hours, embodied_rate, out=out["training_embodied_co2"])
+            inference_hours = (tokens_per_day * inference_days * 0.001) / 3600
+            np.multiply(inference_hours, embodied_rate, out=out["inference_embodied_co2"])
+        
+        for quantity in ("co2", "energy", "water", "cost", "embodied_co2"):
+            np.add(out[f"training_{quantity}"], out[f"inference_{quantity}"], out=out[f"total_{quantity}"])
+        np.add(out["total_co2"], out["total_embodied_co2"], out=out["lifecycle_co2"])
+        
+        with instrumentation.stage("batch.ethics"):
+            size_bin = np.searchsorted(cls.ETHICAL_SIZE_BINS, params_b, side="right")
+            base_score = np.array(cls.ETHICAL_SIZE_SCORES, dtype=float)[size_bin]
+            score = np.minimum(10, base_score + risk_modifier, out=out["ethical_score"])
+            np.round(score, 1, out=score)
+        
+        return out
 
 # =============================================================================
 # VISUALIZATION & REPORTING
@@ -314,6 +706,7 @@ class ReportGenerator:
     """Generate visualizations and reports"""
     
     @staticmethod
+    @instrumentation.timed("comparisons")
     def generate_comparisons(result: CalculationResult):
         """Generate real-world comparison metrics"""
         comparisons = {
@@ -332,57 +725,57 @@ class ReportGenerator:
         }
         return comparisons
     
+    # Recommendation rules, see recommendation_rules.json
+    RULES = RuleSet.from_files(Config.RECOMMENDATION_RULES_FILES)
+    
+    @staticmethod
+    def recommendation_features(result: CalculationResult, input_params: CalculationInput) -> dict:
+        """Feature row the recommendation rules are evaluated against"""
+        features = {field: getattr(input_params, field) for field in CalculationInput.FIELDS}
+        features.update({field: getattr(result, field) for field in CalculationResult.FIELDS})
+        for key, value in Config.LOCATIONS[input_params.location].items():
+            features[f"location_{key}"] = value
+        return features
+    
     @staticmethod
+    def recommendation_table(inputs: pd.DataFrame, results: pd.DataFrame) -> dict:
+        """Column-wise version of recommendation_features for batch frames"""
+        table = {field: inputs[field].to_numpy() for field in CalculationInput.FIELDS}
+        table.update({field: results[field].to_numpy() for field in CalculationResult.FIELDS})
+        for key in next(iter(Config.LOCATIONS.values())):
+            table[f"location_{key}"] = ImpactCalculator._lookup(
+                inputs["location"], Config.LOCATIONS, key, dtype=None
+            )
+        return table
+    
+    @staticmethod
+    @instrumentation.timed("recommendations")
     def generate_recommendations(result: CalculationResult, input_params: CalculationInput):
         """Generate actionable recommendations"""
-        recommendations = []
-        
-        if result.total_co2 > 10000:
-            recommendations.append({
-                "priority": "high",
-                "category": "Model Size",
-                "message": "Consider model compression techniques or distillation to reduce size"
-            })
-        
-        if input_params.pue > 2.0:
-            recommendations.append({
-                "priority": "medium",
-                "category": "Infrastructure",
-                "message": "Data center PUE is high - consider more efficient facilities"
-            })
-        
-        location_data = Config.LOCATIONS[input_params.location]
-        if location_data["carbon"] > 400:
-            recommendations.append({
-                "priority": "medium",
-                "category": "Location",
-                "message": "Consider data centers in regions with renewable energy (lower carbon intensity)"
-            })
-        
-        if result.ethical_score >= 7:
-            recommendations.append({
-                "priority": "high",
-                "category": "Ethics",
-                "message": "Implement robust bias testing, fairness audits, and transparency measures"
-            })
-        
-        if input_params.params_b > 100:
-            recommendations.append({
-                "priority": "medium",
-                "category": "Efficiency",
-                "message": "Evaluate if a smaller model could achieve similar performance"
-            })
-        
-        if location_data["renewable_pct"] < 50:
-            recommendations.append({
-                "priority": "low",
-                "category": "Sustainability",
-                "message": f"Current location uses only {location_data['renewable_pct']}% renewable energy"
-            })
-        
-        return recommendations
+        return ReportGenerator.RULES.apply(
+            ReportGenerator.recommendation_features(result, input_params)
+        )
     
     @staticmethod
+    @instrumentation.timed("batch.recommendations")
+    def generate_recommendations_batch(inputs: pd.DataFrame, results: pd.DataFrame) -> pd.DataFrame:
+        """
+        Recommendations for a whole batch, one vectorized mask per rule.
+        
+        Args:
+            inputs: Batch input frame (CalculationInput.FIELDS columns)
+            results: Matching frame from ImpactCalculator.calculate_batch
+            
+        Returns:
+            Long-format frame (row, rule_id, priority, category, message);
+            rows of one input label appear in the order generate_recommendations
+            would list them
+        """
+        table = ReportGenerator.recommendation_table(inputs, results)
+        return ReportGenerator.RULES.apply_bulk(table, index=inputs.index)
+    
+    @staticmethod
+    @instrumentation.timed("serialization")
     def export_json(input_params: CalculationInput, result: CalculationResult):
         """Export results as JSON"""
         export_data = {
@@ -397,72 +790,212 @@ class ReportGenerator:
         }
         return json.dumps(export_data, indent=2)
 
+# =============================================================================
+# BULK SCENARIOS
+# =============================================================================
+
+class BulkJob:
+    """Batch calculation over an uploaded scenario frame in a background thread"""
+    
+    SESSION_KEY = "bulk_job"
+    
+    def __init__(self, inputs: pd.DataFrame, chunk_rows: int = Config.BULK_CHUNK_ROWS):
+        self.inputs = inputs.reset_index(drop=True)
+        self.chunk_rows = chunk_rows
+        self.total = len(self.inputs)
+        self.done = 0
+        self.error = None
+        self.started = None
+        self.finished = None
+        self._chunks = []
+        self._csv = None
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="bulk-job", daemon=True)
+    
+    def start(self) -> "BulkJob":
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+    
+    def _run(self):
+        # Never touches st.*; the script thread polls progress and results
+        try:
+            for start in range(0, self.total, self.chunk_rows):
+                if self._cancel.is_set():
+                    break
+                inputs = self.inputs.iloc[start:start + self.chunk_rows]
+                chunk = pd.concat([inputs, ImpactCalculator.calculate_batch(inputs)], axis=1)
+                with self._lock:
+                    self._chunks.append(chunk)
+                    self.done += len(chunk)
+        except Exception as error:
+            self.error = error
+        finally:
+            self.finished = time.perf_counter()
+    
+    def cancel(self):
+        """Stop after the chunk in progress; finished rows are kept"""
+        self._cancel.set()
+    
+    def wait(self, timeout: float = None):
+        self._thread.join(timeout)
+    
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+    
+    @property
+    def progress(self) -> float:
+        return self.done / self.total if self.total else 1.0
+    
+    def page(self, number: int, size: int = Config.BULK_PAGE_SIZE) -> pd.DataFrame:
+        """Rows ``number * size`` up to the next page of the results finished so far"""
+        with self._lock:
+            chunks = list(self._chunks)
+        start, stop = number * size, (number + 1) * size
+        parts, offset = [], 0
+        for chunk in chunks:
+            if offset >= stop:
+                break
+            if offset + len(chunk) > start:
+                parts.append(chunk.iloc[max(start - offset, 0):stop - offset])
+            offset += len(chunk)
+        if not parts:
+            return pd.DataFrame(columns=list(CalculationInput.FIELDS) + list(CalculationResult.FIELDS))
+        return pd.concat(parts)
+    
+    def results(self) -> pd.DataFrame:
+        """All rows finished so far"""
+        with self._lock:
+            chunks = list(self._chunks)
+        if not chunks:
+            return self.page(0, 0)
+        return pd.concat(chunks)
+    
+    def to_csv(self) -> bytes:
+        """Results as CSV; serialized once when the job has stopped"""
+        if self.running:
+            return self.results().to_csv(index=False).encode("utf-8")
+        if self._csv is None:
+            self._csv = self.results().to_csv(index=False).encode("utf-8")
+        return self._csv
+
 # =============================================================================
 # UI COMPONENTS
 # =============================================================================
 
+CUSTOM_CSS = """
+<style>
+    .main {
+        padding: 2rem;
+    }
+    .stAlert {
+        margin: 1rem 0;
+    }
+    .metric-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 1.5rem;
+        border-radius: 10px;
+        color: white;
+        margin: 1rem 0;
+    }
+    .warning-box {
+        background-color: #fff3cd;
+        border-left: 4px solid #ffc107;
+        padding: 1rem;
+        margin: 1rem 0;
+        border-radius: 5px;
+    }
+    .result-box {
+        background: #f8f9fa;
+        padding: 1.5rem;
+        border-radius: 10px;
+        margin: 1rem 0;
+        border: 1px solid #dee2e6;
+    }
+    .footer {
+        text-align: center;
+        padding: 2rem;
+        margin-top: 3rem;
+        border-top: 1px solid #dee2e6;
+        color: #6c757d;
+    }
+    h1 {
+        color: #2c3e50;
+        margin-bottom: 0.5rem;
+    }
+    .subtitle {
+        color: #7f8c8d;
+        font-size: 1.1rem;
+        margin-bottom: 2rem;
+    }
+    .recommendation-high {
+        border-left: 4px solid #dc3545;
+    }
+    .recommendation-medium {
+        border-left: 4px solid #ffc107;
+    }
+    .recommendation-low {
+        border-left: 4px solid #28a745;
+    }
+</style>
+"""
+
+# st.fragment (Streamlit >= 1.37, st.experimental_fragment since 1.33) reruns
+# only the decorated section on interaction. Older releases fall back to a
+# plain function, i.e. the usual full-script rerun.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+def polling_fragment(func, seconds: float):
+    """
+    `func` as a fragment that also reruns itself every `seconds`, or None when
+    this Streamlit has no fragments (callers fall back to st.rerun).
+    """
+    decorator = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    return None if decorator is None else decorator(func, run_every=seconds)
+
+class RenderTimer:
+    """Per-section wall-clock timing for a single script run"""
+    
+    SESSION_KEY = "render_timings"
+    
+    def __init__(self):
+        self.timings = {}
+    
+    @contextmanager
+    def section(self, name: str):
+        """Time the enclosed block and record it under ``name`` (ms)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed_ms
+    
+    def total_ms(self) -> float:
+        return sum(self.timings.values())
+    
+    def to_frame(self) -> pd.DataFrame:
+        frame = pd.DataFrame({
+            "Section": list(self.timings.keys()),
+            "Time (ms)": [round(ms, 2) for ms in self.timings.values()]
+        })
+        return frame.set_index("Section")
+
 class UIComponents:
     """Reusable UI components"""
     
     @staticmethod
     def render_custom_css():
         """Apply custom CSS styling"""
-        st.markdown("""
-        <style>
-            .main {
-                padding: 2rem;
-            }
-            .stAlert {
-                margin: 1rem 0;
-            }
-            .metric-card {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                padding: 1.5rem;
-                border-radius: 10px;
-                color: white;
-                margin: 1rem 0;
-            }
-            .warning-box {
-                background-color: #fff3cd;
-                border-left: 4px solid #ffc107;
-                padding: 1rem;
-                margin: 1rem 0;
-                border-radius: 5px;
-            }
-            .result-box {
-                background: #f8f9fa;
-                padding: 1.5rem;
-                border-radius: 10px;
-                margin: 1rem 0;
-                border: 1px solid #dee2e6;
-            }
-            .footer {
-                text-align: center;
-                padding: 2rem;
-                margin-top: 3rem;
-                border-top: 1px solid #dee2e6;
-                color: #6c757d;
-            }
-            h1 {
-                color: #2c3e50;
-                margin-bottom: 0.5rem;
-            }
-            .subtitle {
-                color: #7f8c8d;
-                font-size: 1.1rem;
-                margin-bottom: 2rem;
-            }
-            .recommendation-high {
-                border-left: 4px solid #dc3545;
-            }
-            .recommendation-medium {
-                border-left: 4px solid #ffc107;
-            }
-            .recommendation-low {
-                border-left: 4px solid #28a745;
-            }
-        </style>
-        """, unsafe_allow_html=True)
+        # Streamlit drops elements that are not re-emitted, so the block is
+        # sent every run; only the string itself is built once at import.
+        st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
     
     @staticmethod
     def render_header():
@@ -481,94 +1014,138 @@ class UIComponents:
     
     @staticmethod
     def render_input_form():
-        """Render input form and return parameters"""
+        """Render input form and return (parameters, submitted)"""
         st.header("📊 Model Parameters")
         
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Model Configuration")
-            params_input = st.number_input(
-                "Model Parameters (Billions)", 
-                min_value=0.1, 
-                max_value=10000.0, 
-                value=7.0, 
-                step=0.1,
-                help="Total number of parameters in billions (e.g., GPT-3 = 175B)"
-            )
-            
-            model_type = st.selectbox(
-                "Model Type", 
-                list(Config.MODEL_TYPES.keys()),
-                help="Dense models use all parameters; MoE activates subset per input"
-            )
-            
-            st.subheader("Training")
-            training_hours = st.number_input(
-                "Training Duration (GPU hours)", 
-                min_value=1, 
-                max_value=1000000, 
-                value=1000, 
-                step=100,
-                help="Total GPU hours for training (e.g., 100 GPUs × 10 hours = 1000)"
-            )
-        
-        with col2:
-            st.subheader("Infrastructure")
-            location = st.selectbox(
-                "Data Center Location", 
-                list(Config.LOCATIONS.keys()),
-                help="Location affects carbon intensity and water usage"
-            )
+        # Widgets inside a form only send their values on submit, so editing
+        # inputs no longer reruns the script (and recomputes) per keystroke.
+        with st.form("impact_form", border=False):
+            col1, col2 = st.columns(2)
             
-            # Show location details
-            loc_data = Config.LOCATIONS[location]
-            st.caption(f"🌱 Renewable: {loc_data['renewable_pct']}% | 💨 Carbon: {loc_data['carbon']}g/kWh | 💧 Water: {loc_data['water']}L/kWh")
+            with col1:
+                st.subheader("Model Configuration")
+                params_input = st.number_input(
+                    "Model Parameters (Billions)", 
+                    min_value=0.1, 
+                    max_value=10000.0, 
+                    value=7.0, 
+                    step=0.1,
+                    help="Total number of parameters in billions (e.g., GPT-3 = 175B)"
+                )
+                
+                model_type = st.selectbox(
+                    "Model Type", 
+                    list(Config.MODEL_TYPES.keys()),
+                    help="Dense models use all parameters; MoE activates subset per input"
+                )
+                
+                st.subheader("Training")
+                training_hours = st.number_input(
+                    "Training Duration (GPU hours)", 
+                    min_value=1, 
+                    max_value=1000000, 
+                    value=1000, 
+                    step=100,
+                    help="Total GPU hours for training (e.g., 100 GPUs × 10 hours = 1000)"
+                )
             
-            hardware = st.selectbox(
-                "Hardware Type", 
-                list(Config.HARDWARE.keys()),
-                help="GPU/TPU type affects power consumption and efficiency"
-            )
-            
-            # Show hardware details
-            hw_data = Config.HARDWARE[hardware]
-            st.caption(f"⚡ TDP: {hw_data['tdp']}W | 🚀 Generation: {hw_data['generation']} | 💰 ${hw_data['cost_per_hour']}/hr")
-            
-            pue = st.slider(
-                "PUE (Power Usage Effectiveness)", 
-                min_value=1.0, 
-                max_value=3.0, 
-                value=1.5, 
-                step=0.1,
-                help="1.0 = perfect efficiency, typical datacenters: 1.2-2.0"
-            )
-            
-            st.subheader("Inference")
-            tokens_per_day = st.number_input(
-                "Tokens per Day", 
-                min_value=0, 
-                max_value=10000000000, 
-                value=10000000, 
-                step=1000000,
-                help="Total tokens processed daily (input + output)"
-            )
+            with col2:
+                st.subheader("Infrastructure")
+                location = st.selectbox(
+                    "Data Center Location", 
+                    list(Config.LOCATIONS.keys()),
+                    help="Location affects carbon intensity and water usage"
+                )
+                
+                # Show location details
+                loc_data = Config.LOCATIONS[location]
+                st.caption(f"🌱 Renewable: {loc_data['renewable_pct']}% | 💨 Carbon: {loc_data['carbon']}g/kWh | 💧 Water: {loc_data['water']}L/kWh")
+                
+                hardware = st.selectbox(
+                    "Hardware Type", 
+                    list(Config.HARDWARE.keys()),
+                    help="GPU/TPU type affects power consumption and efficiency"
+                )
+                
+                # Show hardware details
+                hw_data = Config.HARDWARE[hardware]
+                st.caption(f"⚡ TDP: {hw_data['tdp']}W | 🚀 Generation: {hw_data['generation']} | 💰 ${hw_data['cost_per_hour']}/hr")
+                
+                pue = st.slider(
+                    "PUE (Power Usage Effectiveness)", 
+                    min_value=1.0, 
+                    max_value=3.0, 
+                    value=1.5, 
+                    step=0.1,
+                    help="1.0 = perfect efficiency, typical datacenters: 1.2-2.0"
+                )
+                
+                st.subheader("Inference")
+                tokens_per_day = st.number_input(
+                    "Tokens per Day", 
+                    min_value=0, 
+                    max_value=10000000000, 
+                    value=10000000, 
+                    step=1000000,
+                    help="Total tokens processed daily (input + output)"
+                )
+                
+                inference_days = st.number_input(
+                    "Inference Period (days)", 
+                    min_value=1, 
+                    max_value=3650, 
+                    value=365, 
+                    step=1,
+                    help="Duration of model deployment"
+                )
             
-            inference_days = st.number_input(
-                "Inference Period (days)", 
-                min_value=1, 
-                max_value=3650, 
-                value=365, 
-                step=1,
-                help="Duration of model deployment"
-            )
+            submitted = st.form_submit_button("🔍 Calculate Impact", type="primary", use_container_width=True)
         
-        return CalculationInput(
+        input_params = CalculationInput(
             params_input, model_type, training_hours, tokens_per_day,
             inference_days, location, hardware, pue
         )
+        return input_params, submitted
+    
+    @staticmethod
+    @st.cache_data(show_spinner=False, max_entries=128)
+    def build_result_frames(training: tuple, inference: tuple, total: tuple):
+        """
+        Build the breakdown table and chart frames for a result.
+        
+        Cached on the (co2, water, energy, cost) tuples of each phase, so
+        reruns that show the same result reuse the frames instead of
+        rebuilding them.
+        
+        Returns:
+            (breakdown table, CO₂-by-phase chart frame, resource chart frame)
+        """
+        phases = (training, inference, total)
+        breakdown_df = pd.DataFrame({
+            "Phase": ["Training", "Inference", "Total"],
+            "CO₂ (kg)": [f"{phase[0]:,.0f}" for phase in phases],
+            "Water (L)": [f"{phase[1]:,.0f}" for phase in phases],
+            "Energy (kWh)": [f"{phase[2]:,.0f}" for phase in phases],
+            "Cost ($)": [f"{phase[3]:,.0f}" for phase in phases]
+        })
+        
+        # CO2 breakdown chart
+        co2_chart_df = pd.DataFrame({
+            "Phase": ["Training", "Inference"],
+            "CO₂ (kg)": [training[0], inference[0]]
+        }).set_index("Phase")
+        
+        # Resource usage chart
+        resource_chart_df = pd.DataFrame({
+            "Resource": ["Energy (kWh)", "Water (L)", "CO₂ (kg)"],
+            "Training": [training[2], training[1], training[0]],
+            "Inference": [inference[2], inference[1], inference[0]]
+        }).set_index("Resource")
+        
+        return breakdown_df, co2_chart_df, resource_chart_df
     
     @staticmethod
+    @fragment
     def render_results(result: CalculationResult, comparisons: dict, recommendations: list):
         """Render calculation results"""
         st.header("📈 Results")
@@ -585,35 +1162,20 @@ class UIComponents:
         with col4:
             st.metric("Estimated Cost", f"${result.total_cost:,.0f}")
         
+        st.caption(
+            f"🏭 Embodied hardware CO₂ (manufacturing, amortized over device lifetime): "
+            f"{result.total_embodied_co2:,.0f} kg | Lifecycle total: {result.lifecycle_co2:,.0f} kg"
+        )
+        
         # Detailed breakdown
         st.subheader("🔬 Detailed Breakdown")
         
-        breakdown_data = {
-            "Phase": ["Training", "Inference", "Total"],
-            "CO₂ (kg)": [
-                f"{result.training_co2:,.0f}", 
-                f"{result.inference_co2:,.0f}", 
-                f"{result.total_co2:,.0f}"
-            ],
-            "Water (L)": [
-                f"{result.training_water:,.0f}", 
-                f"{result.inference_water:,.0f}", 
-                f"{result.total_water:,.0f}"
-            ],
-            "Energy (kWh)": [
-                f"{result.training_energy:,.0f}", 
-                f"{result.inference_energy:,.0f}", 
-                f"{result.total_energy:,.0f}"
-            ],
-            "Cost ($)": [
-                f"{result.training_cost:,.0f}", 
-                f"{result.inference_cost:,.0f}", 
-                f"{result.total_cost:,.0f}"
-            ]
-        }
-        
-        df = pd.DataFrame(breakdown_data)
-        st.table(df)
+        breakdown_df, co2_chart_df, resource_chart_df = UIComponents.build_result_frames(
+            (result.training_co2, result.training_water, result.training_energy, result.training_cost),
+            (result.inference_co2, result.inference_water, result.inference_energy, result.inference_cost),
+            (result.total_co2, result.total_water, result.total_energy, result.total_cost)
+        )
+        st.table(breakdown_df)
         
         # Visualizations
         st.subheader("📊 Impact Visualization")
@@ -621,22 +1183,11 @@ class UIComponents:
         col1, col2 = st.columns(2)
         
         with col1:
-            # CO2 breakdown chart
-            chart_data = pd.DataFrame({
-                "Phase": ["Training", "Inference"],
-                "CO₂ (kg)": [result.training_co2, result.inference_co2]
-            })
-            st.bar_chart(chart_data.set_index("Phase"))
+            st.bar_chart(co2_chart_df)
             st.caption("Carbon Emissions by Phase")
         
         with col2:
-            # Resource usage chart
-            resource_data = pd.DataFrame({
-                "Resource": ["Energy (kWh)", "Water (L)", "CO₂ (kg)"],
-                "Training": [result.training_energy, result.training_water, result.training_co2],
-                "Inference": [result.inference_energy, result.inference_water, result.inference_co2]
-            })
-            st.bar_chart(resource_data.set_index("Resource"))
+            st.bar_chart(resource_chart_df)
             st.caption("Resource Usage Comparison")
         
         # Comparisons
@@ -700,6 +1251,7 @@ class UIComponents:
             st.success("✅ Your configuration shows relatively efficient resource usage!")
     
     @staticmethod
+    @fragment
     def render_export_options(input_params: CalculationInput, result: CalculationResult):
         """Render export options"""
         st.subheader("📥 Export Results")
@@ -727,6 +1279,8 @@ class UIComponents:
                 "Total_Water_L": result.total_water,
                 "Total_Energy_kWh": result.total_energy,
                 "Total_Cost_USD": result.total_cost,
+                "Embodied_CO2_kg": result.total_embodied_co2,
+                "Lifecycle_CO2_kg": result.lifecycle_co2,
                 "Ethical_Score": result.ethical_score
             }]).to_csv(index=False)
             
@@ -737,6 +1291,83 @@ class UIComponents:
                 mime="text/csv"
             )
     
+    @staticmethod
+    def render_bulk_upload():
+        """Render the bulk scenario upload tab"""
+        st.header("📂 Bulk Scenarios")
+        st.caption(
+            f"Upload a CSV with one scenario per row (columns as in the CSV/JSON export or "
+            f"{', '.join(CalculationInput.FIELDS)}). Up to {Config.BULK_MAX_ROWS:,} rows are calculated "
+            f"in the background; invalid rows are set aside."
+        )
+        
+        job = st.session_state.get(BulkJob.SESSION_KEY)
+        uploaded = st.file_uploader("Scenario CSV", type=["csv"], key="bulk_upload")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            run = st.button("▶️ Run Scenarios", disabled=uploaded is None or (job is not None and job.running))
+        with col2:
+            if st.button("⏹️ Cancel", disabled=job is None or not job.running):
+                job.cancel()
+        
+        if run:
+            try:
+                # One row past the limit is enough to tell that the file is longer
+                frame = pd.read_csv(uploaded, nrows=Config.BULK_MAX_ROWS + 1)
+            except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as error:
+                st.error(f"❌ Could not read the uploaded CSV: {error}")
+                return
+            frame = CalculationInput.normalize_columns(frame)
+            if len(frame) > Config.BULK_MAX_ROWS:
+                st.warning(f"The file has more than {Config.BULK_MAX_ROWS:,} rows; only the first "
+                           f"{Config.BULK_MAX_ROWS:,} are calculated.")
+                frame = frame.iloc[:Config.BULK_MAX_ROWS]
+            inputs, quarantined, report = ImpactCalculator.validate_batch(frame, "quarantine")
+            if len(quarantined):
+                st.warning(f"{len(quarantined):,} invalid rows were skipped.")
+                st.dataframe(report.summary(), use_container_width=True)
+            job = st.session_state[BulkJob.SESSION_KEY] = BulkJob(inputs).start()
+        
+        if job is None:
+            return
+        if job.running and _bulk_progress_live is not None:
+            # Only this section polls while the job runs, not the whole script
+            _bulk_progress_live()
+        else:
+            UIComponents.render_bulk_progress()
+    
+    @staticmethod
+    def render_bulk_progress():
+        """Render progress, the current results page and the download of the bulk job"""
+        job = st.session_state[BulkJob.SESSION_KEY]
+        status = "cancelled" if job.cancelled and not job.running else "running" if job.running else "done"
+        st.progress(job.progress, text=f"{job.done:,} / {job.total:,} scenarios ({status})")
+        if job.error is not None:
+            st.error(f"❌ Bulk calculation failed: {job.error}")
+        
+        # Only one page of rows is ever sent to the browser
+        n_pages = max(1, -(-job.done // Config.BULK_PAGE_SIZE))
+        page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1, key="bulk_page")
+        st.dataframe(job.page(min(page, n_pages) - 1), use_container_width=True)
+        st.caption(f"Page {min(page, n_pages)} of {n_pages}")
+        
+        if not job.running and job.done:
+            st.download_button(
+                label="Download Results CSV",
+                data=job.to_csv(),
+                file_name=f"ai_impact_bulk_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+    
+    @staticmethod
+    def render_bulk_progress_polling():
+        """Bulk progress while the job runs; a full rerun once it has stopped"""
+        if not st.session_state[BulkJob.SESSION_KEY].running:
+            # Refreshes the Run/Cancel buttons too and ends the polling
+            st.rerun()
+        UIComponents.render_bulk_progress()
+    
     @staticmethod
     def render_footer():
         """Render application footer"""
@@ -752,6 +1383,9 @@ class UIComponents:
         </div>
         """, unsafe_allow_html=True)
 
+# Polls every BULK_POLL_SECONDS; None on Streamlit releases without fragments
+_bulk_progress_live = polling_fragment(UIComponents.render_bulk_progress_polling, Config.BULK_POLL_SECONDS)
+
 # =============================================================================
 # MAIN APPLICATION
 # =============================================================================
@@ -767,55 +1401,64 @@ def main():
         initial_sidebar_state="collapsed"
     )
 
+    timer = RenderTimer()
+    
     # Apply custom styling
-    UIComponents.render_custom_css()
+    with timer.section("css"):
+        UIComponents.render_custom_css()
     
     # Render header
-    UIComponents.render_header()
+    with timer.section("header"):
+        UIComponents.render_header()
     
-    # Render input form
-    input_params = UIComponents.render_input_form()
+    single_tab, bulk_tab = st.tabs(["🔍 Single Model", "📂 Bulk Upload"])
     
-    # Calculate button
-    if st.button("🔍 Calculate Impact", type="primary", use_container_width=True):
-        
-        with st.spinner("Calculating environmental impact..."):
-            # Perform calculations
-            result = ImpactCalculator.calculate_all(input_params)
+    with single_tab:
+        # Render input form
+        with timer.section("input_form"):
+            input_params, submitted = UIComponents.render_input_form()
+        
+        if submitted:
+            with timer.section("calculation"):
+                with st.spinner("Calculating environmental impact..."):
+                    # Perform calculations
+                    result = ImpactCalculator.calculate_cached(input_params)
+                    
+                    # Generate comparisons and recommendations
+                    comparisons = ReportGenerator.generate_comparisons(result)
+                    recommendations = ReportGenerator.generate_recommendations(result, input_params)
+                    
+                    # Store in session state for persistence
+                    st.session_state['last_result'] = result
+                    st.session_state['last_comparisons'] = comparisons
+                    st.session_state['last_recommendations'] = recommendations
+                    st.session_state['last_input'] = input_params
+        
+        # Display current or previous results if available
+        if 'last_result' in st.session_state:
+            if not submitted:
+                st.info("📊 Showing previous calculation results. Modify parameters and click 'Calculate Impact' to recalculate.")
             
-            # Generate comparisons and recommendations
-            comparisons = ReportGenerator.generate_comparisons(result)
-            recommendations = ReportGenerator.generate_recommendations(result, input_params)
+            with timer.section("results"):
+                UIComponents.render_results(
+                    st.session_state['last_result'],
+                    st.session_state['last_comparisons'],
+                    st.session_state['last_recommendations']
+                )
             
-            # Store in session state for persistence
-            st.session_state['last_result'] = result
-            st.session_state['last_comparisons'] = comparisons
-            st.session_state['last_recommendations'] = recommendations
-            st.session_state['last_input'] = input_params
-        
-        # Render results
-        UIComponents.render_results(result, comparisons, recommendations)
-        
-        # Render export options
-        UIComponents.render_export_options(input_params, result)
-    
-    # Display previous results if available
-    elif 'last_result' in st.session_state:
-        st.info("📊 Showing previous calculation results. Modify parameters and click 'Calculate Impact' to recalculate.")
-        
-        UIComponents.render_results(
-            st.session_state['last_result'],
-            st.session_state['last_comparisons'],
-            st.session_state['last_recommendations']
-        )
-        
-        UIComponents.render_export_options(
-            st.session_state['last_input'],
-            st.session_state['last_result']
-        )
+            with timer.section("export"):
+                UIComponents.render_export_options(
+                    st.session_state['last_input'],
+                    st.session_state['last_result']
+                )
+    
+    with bulk_tab:
+        with timer.section("bulk"):
+            UIComponents.render_bulk_upload()
     
     # Render footer
-    UIComponents.render_footer()
+    with timer.section("footer"):
+        UIComponents.render_footer()
     
     # Sidebar with additional info
     with st.sidebar:
@@ -829,6 +1472,7 @@ def main():
         - Training CO₂: Based on parameter count and energy consumption
         - Inference CO₂: Scaled by model size and token volume
         - Water: Data center cooling requirements
+        - Embodied CO₂: Hardware manufacturing carbon amortized per device hour
         - Ethics: Proxy score based on model complexity
         
         **Limitations:**
@@ -859,6 +1503,19 @@ def main():
         **{Config.AUTHOR}**  
         [{Config.AUTHOR_EMAIL}](mailto:{Config.AUTHOR_EMAIL})
         """)
+        
+        # Timings cover everything above the sidebar for this run
+        st.session_state[RenderTimer.SESSION_KEY] = timer.timings
+        with st.expander("⏱️ Render Timing"):
+            st.caption(f"Last run: {timer.total_ms():.1f} ms")
+            st.dataframe(timer.to_frame(), use_container_width=True)
+    
+    # Without fragments a running bulk job refreshes the whole page until it
+    # finishes; any widget interaction interrupts the wait and reruns right away
+    job = st.session_state.get(BulkJob.SESSION_KEY)
+    if job is not None and job.running and _bulk_progress_live is None:
+        time.sleep(Config.BULK_POLL_SECONDS)
+        st.rerun()
 
 # =============================================================================
 # ENTRY POINT
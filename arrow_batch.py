@@ -0,0 +1,209 @@
+# arrow_batch.py - OPTIONAL: Arrow interchange for the batch engine
+"""
+Arrow batch interface for AI Model Eco & Ethics Calculator
+Runs ImpactCalculator.calculate_arrays directly on Arrow tables and record
+batches (Polars frames via .to_arrow()), without converting to pandas or to
+CalculationInput objects:
+- float64 columns without nulls are read as zero-copy NumPy views
+- location/hardware/model_type may be dictionary-encoded. Only the
+  dictionary is matched against the catalogs; the row indices are gathered
+  through that small mapping. Plain string columns are dictionary-encoded
+  first.
+- results are written chunk by chunk into output arrays allocated once for
+  the whole batch and handed to Arrow without copying. ethical_explanation
+  comes back dictionary-encoded.
+
+Intermediate arrays are sized by the chunk (ARROW_CHUNK_ROWS), not the batch.
+Results are bit-exact with calculate_batch.
+
+Needs the optional `pyarrow` package.
+
+Usage:
+    python arrow_batch.py scenarios.parquet -o results.parquet
+"""
+
+import argparse
+import os
+import sys
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from app import CalculationInput, CalculationResult, Config, ImpactCalculator
+
+# Rows computed at a time; bounds the size of intermediate arrays
+ARROW_CHUNK_ROWS = 1000000
+NUMERIC_FIELDS = ("params_b", "training_hours", "tokens_per_day", "inference_days", "pue")
+CATALOG_FIELDS = {
+    "model_type": Config.MODEL_TYPES,
+    "location": Config.LOCATIONS,
+    "hardware": Config.HARDWARE
+}
+
+def _explanation_table():
+    # Every score calculate_arrays can produce (size score plus model type
+    # modifier), so explanations are looked up with one searchsorted
+    scores = np.unique(np.round(np.minimum(10, np.add.outer(
+        np.array(ImpactCalculator.ETHICAL_SIZE_SCORES, dtype=float),
+        np.array([spec["risk_modifier"] for spec in Config.MODEL_TYPES.values()], dtype=float)
+    )), 1))
+    texts = [ImpactCalculator.get_ethical_explanation(score) for score in scores]
+    dictionary = list(dict.fromkeys(texts))
+    return scores, np.array([dictionary.index(text) for text in texts], dtype=np.int8), pa.array(dictionary)
+
+EXPLANATION_SCORES, EXPLANATION_CODES, EXPLANATION_DICTIONARY = _explanation_table()
+
+def numeric_view(column: pa.Array, name: str) -> np.ndarray:
+    """
+    float64 NumPy array of a numeric column, zero-copy when it is float64.
+
+    Raises:
+        ValueError: If the column has nulls
+    """
+    if column.null_count:
+        raise ValueError(f"Column {name} has {column.null_count} null values")
+    if column.type != pa.float64():
+        # Integer or float32 columns need one converted copy
+        column = pc.cast(column, pa.float64())
+    return column.to_numpy(zero_copy_only=True)
+
+def catalog_codes(column: pa.Array, name: str) -> np.ndarray:
+    """
+    Positions in the Config catalog for a string or dictionary-encoded column.
+
+    Raises:
+        KeyError: If a value is missing or not in the catalog
+    """
+    if not pa.types.is_dictionary(column.type):
+        column = pc.dictionary_encode(column)
+    if column.null_count:
+        raise KeyError(f"Missing {name} values")
+    positions = {key: position for position, key in enumerate(CATALOG_FIELDS[name])}
+    dictionary = column.dictionary.to_pylist()
+    mapping = np.array([positions.get(value, -1) for value in dictionary], dtype=np.int64)
+    indices = column.indices.to_numpy(zero_copy_only=False)
+    codes = mapping[indices]
+    if (codes < 0).any():
+        unknown = sorted({str(dictionary[index]) for index in np.unique(indices[codes < 0])})
+        raise KeyError(f"Unknown {name}: {', '.join(unknown)}")
+    return codes
+
+def _check_columns(schema: pa.Schema):
+    missing = [field for field in CalculationInput.FIELDS if field not in schema.names]
+    if missing:
+        raise KeyError(f"Missing input columns: {', '.join(missing)}")
+
+def _calculate_into(batch: pa.RecordBatch, out: dict, explanation_codes: np.ndarray):
+    """Results of one record batch, written into views of the output buffers"""
+    columns = {name: numeric_view(batch.column(name), name) for name in NUMERIC_FIELDS}
+    codes = {name: catalog_codes(batch.column(name), name) for name in CATALOG_FIELDS}
+    ImpactCalculator.calculate_arrays(
+        columns["params_b"], columns["training_hours"], columns["tokens_per_day"],
+        columns["inference_days"], columns["pue"],
+        codes["model_type"], codes["location"], codes["hardware"], out=out
+    )
+    explanation_codes[...] = EXPLANATION_CODES[np.searchsorted(EXPLANATION_SCORES, out["ethical_score"])]
+
+def _result_arrays(out: dict, explanation_codes: np.ndarray) -> list:
+    # pa.array wraps float64 NumPy buffers without copying
+    arrays = {field: pa.array(out[field]) for field in ImpactCalculator.ARRAY_FIELDS}
+    arrays["ethical_explanation"] = pa.DictionaryArray.from_arrays(
+        pa.array(explanation_codes), EXPLANATION_DICTIONARY
+    )
+    return [arrays[field] for field in CalculationResult.FIELDS]
+
+def calculate_arrow(data: Union[pa.Table, pa.RecordBatch],
+                    chunk_rows: int = ARROW_CHUNK_ROWS) -> Union[pa.Table, pa.RecordBatch]:
+    """
+    Vectorized calculate_all over an Arrow table or record batch.
+
+    Args:
+        data: One row per scenario, columns named as CalculationInput.FIELDS
+        chunk_rows: Rows computed at a time
+
+    Returns:
+        Same kind as `data` (Table or RecordBatch) with the
+        CalculationResult.FIELDS columns, in input row order
+
+    Raises:
+        KeyError: If a column is missing or a location/hardware/model type is unknown
+        ValueError: If a numeric column has nulls
+    """
+    _check_columns(data.schema)
+    rows = data.num_rows
+    out = {field: np.empty(rows) for field in ImpactCalculator.ARRAY_FIELDS}
+    explanation_codes = np.empty(rows, dtype=np.int8)
+    batches = data.to_batches(max_chunksize=chunk_rows) if isinstance(data, pa.Table) else [
+        data.slice(start, chunk_rows) for start in range(0, rows, chunk_rows)
+    ]
+
+    start = 0
+    for batch in batches:
+        stop = start + batch.num_rows
+        _calculate_into(batch, {field: values[start:stop] for field, values in out.items()},
+                        explanation_codes[start:stop])
+        start = stop
+
+    arrays = _result_arrays(out, explanation_codes)
+    if isinstance(data, pa.Table):
+        return pa.Table.from_arrays(arrays, names=list(CalculationResult.FIELDS))
+    return pa.RecordBatch.from_arrays(arrays, names=list(CalculationResult.FIELDS))
+
+def iter_calculate_arrow(batches: Iterable[pa.RecordBatch],
+                         chunk_rows: int = ARROW_CHUNK_ROWS) -> Iterator[pa.RecordBatch]:
+    """
+    Streaming calculate_arrow: one result batch per input batch, e.g. from a
+    pa.RecordBatchReader or a dataset scanner, so no batch set is held whole.
+    """
+    for batch in batches:
+        yield calculate_arrow(batch, chunk_rows)
+
+def _read_table(path: str) -> pa.Table:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".parquet":
+        import pyarrow.parquet as pq
+        return pq.read_table(path)
+    if extension == ".csv":
+        import pyarrow.csv as pv
+        return pv.read_csv(path, convert_options=pv.ConvertOptions(
+            column_types={field: pa.dictionary(pa.int32(), pa.string()) for field in CATALOG_FIELDS}
+        ))
+    import pyarrow.feather as feather
+    return feather.read_table(path)
+
+def _write_table(table: pa.Table, path: str):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, path)
+    elif extension == ".csv":
+        import pyarrow.csv as pv
+        pv.write_csv(table.set_column(
+            table.schema.get_field_index("ethical_explanation"), "ethical_explanation",
+            table.column("ethical_explanation").cast(pa.string())
+        ), path)
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, path)
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the batch engine on Arrow/Parquet/Feather/CSV files")
+    parser.add_argument("input", help="Scenarios (.parquet, .feather/.arrow or .csv) with CalculationInput columns")
+    parser.add_argument("-o", "--output", required=True, help="Results file, format by extension")
+    parser.add_argument("--chunk-rows", type=int, default=ARROW_CHUNK_ROWS)
+    parser.add_argument("--with-inputs", action="store_true", help="Write input columns before the results")
+    args = parser.parse_args(argv)
+
+    table = _read_table(args.input)
+    results = calculate_arrow(table, args.chunk_rows)
+    if args.with_inputs:
+        results = pa.Table.from_arrays(table.columns + results.columns,
+                                       names=table.column_names + results.column_names)
+    _write_table(results, args.output)
+    print(f"Calculated {table.num_rows} scenarios, written to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+# batch.py - OPTIONAL: Command-line batch calculations
+"""
+Batch mode for AI Model Eco & Ethics Calculator
+Runs ImpactCalculator.calculate_batch over a CSV of scenarios.
+
+Usage:
+    python batch.py scenarios.csv -o results.csv
+    python batch.py scenarios.csv -o results.csv --profile batch.pstats --metrics metrics.prom
+
+Input columns are the CalculationInput attribute names (params_b, model_type,
+training_hours, tokens_per_day, inference_days, location, hardware, pue) or
+the labels used by CalculationInput.to_dict ("Model Parameters (B)", ...).
+"""
+
+import argparse
+import cProfile
+import pstats
+import sys
+from typing import Optional
+
+import pandas as pd
+
+from app import CalculationInput, ImpactCalculator
+from instrumentation import instrumentation
+from utils import ArrayConversionHelpers, ArrayFormatters, BatchValidationError, BatchValidators
+
+@instrumentation.timed("input_parsing")
+def load_scenarios(path: str) -> pd.DataFrame:
+    """
+    Read a scenario CSV into a batch input frame.
+
+    Args:
+        path: CSV file with one scenario per row
+
+    Returns:
+        Frame with exactly the CalculationInput.FIELDS columns
+
+    Raises:
+        KeyError: If a required column is missing
+    """
+    return scenario_inputs(pd.read_csv(path))
+
+def scenario_inputs(frame: pd.DataFrame) -> pd.DataFrame:
+    """The CalculationInput.FIELDS columns of an already loaded scenario frame"""
+    frame = CalculationInput.normalize_columns(frame)
+    missing = [field for field in CalculationInput.FIELDS if field not in frame.columns]
+    if missing:
+        raise KeyError(f"Missing input columns: {', '.join(missing)}")
+    return frame[list(CalculationInput.FIELDS)]
+
+def run_batch(inputs: pd.DataFrame) -> pd.DataFrame:
+    """Calculate all scenarios and return inputs and results side by side"""
+    results = ImpactCalculator.calculate_batch(inputs)
+    return pd.concat([inputs, results], axis=1)
+
+def human_readable(frame: pd.DataFrame) -> pd.DataFrame:
+    """Totals in t CO2e / MWh / US gallons, formatted with thousand separators"""
+    converted = ArrayConversionHelpers.convert_columns(
+        frame,
+        {"total_co2": "kg_to_tons", "total_energy": "kwh_to_mwh", "total_water": "liters_to_gallons"},
+        renames={"total_co2": "total_co2_t", "total_energy": "total_energy_mwh", "total_water": "total_water_gal"}
+    )
+    return ArrayFormatters.format_frame(converted, {
+        "total_co2_t": ("format_number", {"decimals": 2}),
+        "total_energy_mwh": ("format_number", {"decimals": 2}),
+        "total_water_gal": "format_number",
+        "total_cost": "format_currency"
+    })
+
+@instrumentation.timed("serialization")
+def write_results(frame: pd.DataFrame, path: str):
+    """Write results as CSV, or JSON lines when the path ends in .jsonl"""
+    if path.endswith(".jsonl"):
+        frame.to_json(path, orient="records", lines=True)
+    else:
+        frame.to_csv(path, index=False)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Batch AI model impact calculations")
+    parser.add_argument("input", help="Scenario CSV file")
+    parser.add_argument("-o", "--output", required=True, help="Result file (.csv or .jsonl)")
+    parser.add_argument("--human-readable", action="store_true",
+                        help="Write totals converted to t/MWh/gal and formatted as text")
+    parser.add_argument("--on-invalid", choices=BatchValidators.POLICIES, default="reject",
+                        help="What to do with rows failing validation (default: reject the file)")
+    parser.add_argument("--errors", metavar="PATH",
+                        help="Write the validation error report (row, field, reason, value) as CSV")
+    parser.add_argument("--quarantine", metavar="PATH",
+                        help="Write quarantined input rows as CSV")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="Write a cProfile/pstats dump of the run to PATH")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="Write per-stage timing histograms in Prometheus text format")
+    parser.add_argument("--metrics-json", metavar="PATH",
+                        help="Write per-stage timing histograms as a JSON snapshot")
+    return parser
+
+def main(argv: Optional[list] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.metrics or args.metrics_json:
+        instrumentation.enable()
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    try:
+        inputs = load_scenarios(args.input)
+        try:
+            inputs, quarantined, report = ImpactCalculator.validate_batch(inputs, args.on_invalid)
+        except BatchValidationError as error:
+            report = error.report
+            if args.errors:
+                report.errors.to_csv(args.errors, index=False)
+            print(f"{error}\n{report.summary().to_string(index=False)}", file=sys.stderr)
+            return 1
+        if args.errors:
+            report.errors.to_csv(args.errors, index=False)
+        if args.quarantine:
+            quarantined.to_csv(args.quarantine, index=False)
+        if not report.ok:
+            print(f"{report.n_invalid} invalid rows ({args.on_invalid}), "
+                  f"{len(quarantined)} quarantined", file=sys.stderr)
+        frame = run_batch(inputs)
+        if args.human_readable:
+            frame = human_readable(frame)
+        write_results(frame, args.output)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+
+    if profiler:
+        stats = pstats.Stats(args.profile, stream=sys.stderr)
+        stats.sort_stats("cumulative").print_stats(15)
+    if args.metrics:
+        with open(args.metrics, "w") as handle:
+            handle.write(instrumentation.to_prometheus())
+    if args.metrics_json:
+        with open(args.metrics_json, "w") as handle:
+            handle.write(instrumentation.to_json())
+
+    print(f"Wrote {len(frame)} results to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+# batch_driver.py - OPTIONAL: Out-of-core batch runs with checkpoint/resume
+"""
+Chunked batch driver for AI Model Eco & Ethics Calculator
+Runs ImpactCalculator.calculate_batch over inputs too large for memory:
+- input partitions are read one at a time: CSV files and Parquet row
+  groups in chunks of `chunk_rows` (a partition never spans two row
+  groups); the input may be one file or a directory of files
+- every partition is validated (as in batch.py), calculated and written
+  to its own output file with write-then-rename, fsynced before the
+  manifest lists it, so neither a crash nor a power loss leaves a partial
+  partition behind
+- a manifest (manifest.jsonl in the output directory) records each
+  finished partition; a restarted run skips them. The manifest header
+  pins the inputs, chunking and config version, so results of different
+  settings are never mixed.
+- progress and throughput (rows/s) are reported after every partition
+
+Skipped CSV chunks still have to be parsed to find where the next chunk
+starts; Parquet row groups whose partitions are all finished are not read
+at all.
+
+Usage:
+    python batch_driver.py archive/ -o rescored/ --chunk-rows 1000000
+    python batch_driver.py scenarios.csv -o rescored/ --format csv --on-invalid quarantine
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from app import CalculationInput, ImpactCalculator
+from utils import BatchValidationError, BatchValidators
+
+MANIFEST_NAME = "manifest.jsonl"
+DEFAULT_CHUNK_ROWS = 1000000
+INPUT_EXTENSIONS = (".csv", ".parquet")
+FORMATS = ("parquet", "csv")
+
+class ManifestMismatchError(ValueError):
+    """The output directory holds a run of other inputs or settings"""
+
+def input_files(path: str) -> List[str]:
+    """The input file, or the CSV/Parquet files of a directory in name order"""
+    if not os.path.isdir(path):
+        return [path]
+    files = sorted(
+        os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith(INPUT_EXTENSIONS)
+    )
+    if not files:
+        raise FileNotFoundError(f"No CSV or Parquet files in {path}")
+    return files
+
+def file_signature(path: str) -> dict:
+    """What identifies an input file between runs"""
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def _row_group_chunks(parquet, group: int, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    # Record batches are re-cut, so every chunk but the last has exactly chunk_rows rows
+    import pyarrow as pa
+    pending = None
+    for batch in parquet.iter_batches(batch_size=chunk_rows, row_groups=[group]):
+        pending = pa.Table.from_batches([batch]) if pending is None else pa.concat_tables(
+            [pending, pa.Table.from_batches([batch])]
+        )
+        while pending.num_rows >= chunk_rows:
+            yield pending.slice(0, chunk_rows).to_pandas()
+            pending = pending.slice(chunk_rows)
+    if pending is not None and pending.num_rows:
+        yield pending.to_pandas()
+
+def iter_partitions(files: List[str], chunk_rows: int) -> Iterator[Tuple[str, Callable[[], pd.DataFrame]]]:
+    """
+    (partition id, loader) for every input partition, in order.
+
+    The loader reads the partition; loaders must be called in order. A
+    Parquet row group is only read once a loader of one of its chunks is
+    called, and then batch by batch.
+    """
+    for file_number, path in enumerate(files):
+        if path.lower().endswith(".parquet"):
+            import pyarrow.parquet as pq
+            parquet = pq.ParquetFile(path)
+            for group in range(parquet.num_row_groups):
+                chunks = _row_group_chunks(parquet, group, chunk_rows)
+                position = [0]
+
+                def load(chunk, chunks=chunks, position=position):
+                    # Chunks before this one were skipped as finished
+                    frame = next(itertools.islice(chunks, chunk - position[0], None))
+                    position[0] = chunk + 1
+                    return frame
+
+                for chunk in range(math.ceil(parquet.metadata.row_group(group).num_rows / chunk_rows)):
+                    yield f"{file_number:05d}-{group:06d}-{chunk:06d}", (
+                        lambda load=load, chunk=chunk: load(chunk)
+                    )
+        else:
+            for chunk_number, frame in enumerate(pd.read_csv(path, chunksize=chunk_rows)):
+                yield f"{file_number:05d}-{chunk_number:06d}", (lambda frame=frame: frame)
+
+def _fsync(path: str, flags: int = os.O_RDONLY):
+    descriptor = os.open(path, flags)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+def _atomic_write(frame: pd.DataFrame, path: str, fmt: str):
+    # Write-then-rename: the partition either exists whole or not at all. The
+    # data is on disk before the rename, and the rename before the manifest
+    # entry that _record fsyncs, so a power loss cannot list a lost partition.
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    if fmt == "parquet":
+        # Dictionary pages only pay off for the text columns, not for unique floats
+        strings = [column for column in frame.columns if frame[column].dtype == object]
+        frame.to_parquet(temp_path, index=False, use_dictionary=strings)
+        _fsync(temp_path)
+    else:
+        with open(temp_path, "w", encoding="utf-8", newline="") as handle:
+            frame.to_csv(handle, index=False)
+            handle.flush()
+            os.fsync(handle.fileno())
+    os.replace(temp_path, path)
+    if os.name == "posix":
+        # Directories can't be opened for fsync on Windows
+        _fsync(os.path.dirname(os.path.abspath(path)))
+
+class ChunkedBatchRun:
+    """One resumable run of the batch engine from an input path into an output directory"""
+
+    def __init__(self, input_path: str, output_dir: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                 fmt: str = "parquet", policy: str = "reject",
+                 progress: Optional[Callable[[dict], None]] = None):
+        """
+        Args:
+            input_path: CSV/Parquet file or a directory of them
+            output_dir: Directory for the partitions and the manifest
+            chunk_rows: Rows per partition; Parquet partitions also end at
+                row group boundaries
+            fmt: Output partition format, "parquet" or "csv"
+            policy: Validation policy, see BatchValidators.apply; "reject"
+                stops at the first invalid partition and writes its
+                errors-<id>.csv, "quarantine" writes rejected rows to
+                quarantine-<id>.csv
+            progress: Called with a progress dict after every partition
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{fmt}', expected one of {', '.join(FORMATS)}")
+        self.files = input_files(input_path)
+        self.output_dir = output_dir
+        self.chunk_rows = chunk_rows
+        self.fmt = fmt
+        self.policy = policy
+        self.progress = progress
+        self.manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        self.header = {
+            "inputs": [file_signature(path) for path in self.files],
+            "chunk_rows": chunk_rows,
+            "format": fmt,
+            "policy": policy,
+            "version": ImpactCalculator.CACHE_VERSION
+        }
+
+    def partition_path(self, partition: str) -> str:
+        return os.path.join(self.output_dir, f"part-{partition}.{self.fmt}")
+
+    def completed(self) -> dict:
+        """
+        Partitions the manifest lists as finished and whose files exist.
+
+        Raises:
+            ManifestMismatchError: If the manifest belongs to other inputs or settings
+        """
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, encoding="utf-8") as handle:
+            lines = handle.read().splitlines()
+        try:
+            header = json.loads(lines[0]) if lines else None
+        except json.JSONDecodeError:
+            header = None
+        if header != self.header:
+            raise ManifestMismatchError(f"{self.manifest_path} was written for other inputs or settings")
+        done = {}
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash while appending leaves at most one torn last line, cut by _drop_torn_tail
+                continue
+            if os.path.exists(self.partition_path(entry["partition"])):
+                done[entry["partition"]] = entry
+        return done
+
+    def _start_manifest(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        for name in os.listdir(self.output_dir):
+            if name.startswith(("part-", "quarantine-", "errors-")):
+                os.remove(os.path.join(self.output_dir, name))
+        with open(self.manifest_path, "w", encoding="utf-8") as handle:
+            handle.write(json.dumps(self.header) + "\n")
+
+    def _drop_torn_tail(self):
+        # Appending after a torn last line would join the next entry to it
+        with open(self.manifest_path, "r+b") as handle:
+            content = handle.read()
+            if content and not content.endswith(b"\n"):
+                handle.truncate(content.rfind(b"\n") + 1)
+
+    def _record(self, entry: dict):
+        with open(self.manifest_path, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def _process(self, partition: str, inputs: pd.DataFrame) -> dict:
+        inputs = CalculationInput.normalize_columns(inputs)
+        missing = [field for field in CalculationInput.FIELDS if field not in inputs.columns]
+        if missing:
+            raise KeyError(f"Partition {partition}: missing input columns: {', '.join(missing)}")
+        try:
+            valid, quarantined, report = ImpactCalculator.validate_batch(
+                inputs[list(CalculationInput.FIELDS)], self.policy
+            )
+        except BatchValidationError as error:
+            # The run stops here; the report says which rows to fix before resuming
+            error.report.errors.to_csv(os.path.join(self.output_dir, f"errors-{partition}.csv"), index=False)
+            raise
+        if len(quarantined):
+            _atomic_write(quarantined, os.path.join(self.output_dir, f"quarantine-{partition}.csv"), "csv")
+        results = ImpactCalculator.calculate_batch(valid)
+        _atomic_write(pd.concat([valid, results], axis=1), self.partition_path(partition), self.fmt)
+        return {"partition": partition, "rows": len(valid), "quarantined": len(quarantined),
+                "invalid": report.n_invalid}
+
+    def run(self, restart: bool = False) -> dict:
+        """
+        Process every partition not finished yet.
+
+        Args:
+            restart: Drop the manifest and existing partitions first
+
+        Returns:
+            Summary: partitions processed/skipped, rows, quarantined rows,
+            seconds and rows per second of this run
+        """
+        if restart or not os.path.exists(self.manifest_path):
+            self._start_manifest()
+        done = self.completed()
+        self._drop_torn_tail()
+        summary = {"processed": 0, "skipped": 0, "rows": 0, "quarantined": 0,
+                   "rows_done": sum(entry["rows"] for entry in done.values())}
+        started = time.perf_counter()
+
+        for partition, load in iter_partitions(self.files, self.chunk_rows):
+            if partition in done:
+                summary["skipped"] += 1
+                continue
+            chunk_started = time.perf_counter()
+            entry = self._process(partition, load())
+            entry["seconds"] = round(time.perf_counter() - chunk_started, 3)
+            self._record(entry)
+
+            summary["processed"] += 1
+            summary["rows"] += entry["rows"]
+            summary["quarantined"] += entry["quarantined"]
+            summary["rows_done"] += entry["rows"]
+            elapsed = time.perf_counter() - started
+            summary["seconds"] = elapsed
+            summary["rows_per_second"] = summary["rows"] / elapsed if elapsed else 0.0
+            if self.progress:
+                self.progress(dict(summary, partition=partition,
+                                   partition_rows_per_second=entry["rows"] / max(entry["seconds"], 1e-9)))
+
+        summary["seconds"] = time.perf_counter() - started
+        summary["rows_per_second"] = summary["rows"] / summary["seconds"] if summary["seconds"] else 0.0
+        return summary
+
+def print_progress(status: dict):
+    print(f"part {status['partition']}: {status['rows_done']:,} rows done, "
+          f"{status['partition_rows_per_second']:,.0f} rows/s (run average {status['rows_per_second']:,.0f})",
+          file=sys.stderr)
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Resumable out-of-core batch calculations")
+    parser.add_argument("input", help="Scenario CSV/Parquet file or a directory of them")
+    parser.add_argument("-o", "--output", required=True, help="Output directory (partitions and manifest)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Rows per partition")
+    parser.add_argument("--format", choices=FORMATS, default="parquet", help="Output partition format")
+    parser.add_argument("--on-invalid", choices=BatchValidators.POLICIES, default="reject",
+                        help="What to do with rows failing validation (default: stop the run)")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over")
+    parser.add_argument("--quiet", action="store_true", help="No per-partition progress lines")
+    args = parser.parse_args(argv)
+
+    run = ChunkedBatchRun(args.input, args.output, args.chunk_rows, args.format, args.on_invalid,
+                          progress=None if args.quiet else print_progress)
+    try:
+        summary = run.run(restart=args.restart)
+    except ManifestMismatchError as error:
+        # Resuming cannot help here; the existing partitions are of another run
+        print(f"{error}\nRerun with --restart to replace them, or write to another output directory.",
+              file=sys.stderr)
+        return 1
+    except (BatchValidationError, ValueError, KeyError) as error:
+        print(f"{error}\nFinished partitions are kept; fix the input and rerun to resume.", file=sys.stderr)
+        return 1
+    print(f"{summary['processed']} partitions processed, {summary['skipped']} skipped, "
+          f"{summary['rows']:,} rows in {summary['seconds']:.1f} s "
+          f"({summary['rows_per_second']:,.0f} rows/s); {summary['rows_done']:,} rows in {args.output}",
+          file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# bench_formatters.py - OPTIONAL: Formatter benchmark
+"""
+Benchmark ArrayFormatters / ArrayConversionHelpers against the per-cell
+Formatters / ConversionHelpers path.
+Run with: python benchmarks/bench_formatters.py [rows]
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import ArrayConversionHelpers, ArrayFormatters, ConversionHelpers, Formatters
+
+def make_table(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "total_co2": rng.lognormal(8, 3, rows),
+        "total_energy": rng.lognormal(9, 3, rows),
+        "total_water": rng.lognormal(9, 3, rows),
+        "total_cost": rng.lognormal(7, 3, rows),
+        # Rounded values repeat a lot, as in typical report tables
+        "ethical_score": rng.integers(2, 20, rows) / 2
+    })
+
+def per_cell(table: pd.DataFrame) -> dict:
+    return {
+        "total_co2": [Formatters.format_number(ConversionHelpers.kg_to_tons(v), 2) for v in table["total_co2"]],
+        "total_energy": [Formatters.format_number(ConversionHelpers.kwh_to_mwh(v), 2) for v in table["total_energy"]],
+        "total_water": [Formatters.format_number(ConversionHelpers.liters_to_gallons(v)) for v in table["total_water"]],
+        "total_cost": [Formatters.format_currency(v) for v in table["total_cost"]],
+        "ethical_score": [Formatters.format_number(v, 1) for v in table["ethical_score"]]
+    }
+
+def column_wise(table: pd.DataFrame) -> pd.DataFrame:
+    converted = ArrayConversionHelpers.convert_columns(table, {
+        "total_co2": "kg_to_tons",
+        "total_energy": "kwh_to_mwh",
+        "total_water": "liters_to_gallons"
+    })
+    return ArrayFormatters.format_frame(converted, {
+        "total_co2": ("format_number", {"decimals": 2}),
+        "total_energy": ("format_number", {"decimals": 2}),
+        "total_water": "format_number",
+        "total_cost": "format_currency",
+        "ethical_score": ("format_number", {"decimals": 1})
+    })
+
+def main():
+    check = make_table(1000)
+    assert column_wise(check).to_dict("list") == per_cell(check), "column-wise output differs"
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    table = make_table(rows)
+    cell_time = min(timeit.repeat(lambda: per_cell(table), number=1, repeat=3))
+    column_time = min(timeit.repeat(lambda: column_wise(table), number=1, repeat=3))
+    print(f"rows={rows}")
+    print(f"per-cell     {cell_time:8.3f} s")
+    print(f"column-wise  {column_time:8.3f} s  ({cell_time / column_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
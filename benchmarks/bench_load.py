@@ -0,0 +1,328 @@
+# bench_load.py - OPTIONAL: Load test and capacity report
+"""
+Load-test harness for the Streamlit deployment.
+Starts `streamlit run app.py` as in render.yaml/dockerfile. For each user
+count it drives that many simulated concurrent users over the app's
+websocket protocol, the same messages a browser sends. Each user opens
+the page, then submits the impact form `--rounds` times with random inputs
+and a think time between submits.
+
+Recorded per level: rerun latency percentiles, errors, throughput, server
+CPU and server RSS (per session = growth over the idle server / users).
+A separate in-process AppTest pass records how st.session_state grows over
+one user's flow. The report ends with how many users one container can
+serve within the latency target, memory and CPU limits.
+
+Run with: python benchmarks/bench_load.py --users 1,5,10,25 [--json report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import pickle
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.NumberInput_pb2 import NumberInput
+from tornado.websocket import websocket_connect
+
+from app import Config
+
+SUBMIT_LABEL = "🔍 Calculate Impact"
+PERCENTILES = (50, 90, 95, 99)
+# Form inputs a simulated user varies, by widget label
+FORM_VALUES = {
+    "Model Parameters (Billions)": lambda rng: rng.choice([1.0, 7.0, 13.0, 70.0, 175.0, 405.0]),
+    "Model Type": lambda rng: rng.randrange(len(Config.MODEL_TYPES)),
+    "Training Duration (GPU hours)": lambda rng: rng.choice([100, 1000, 10000, 100000]),
+    "Data Center Location": lambda rng: rng.randrange(len(Config.LOCATIONS)),
+    "Hardware Type": lambda rng: rng.randrange(len(Config.HARDWARE)),
+    "PUE (Power Usage Effectiveness)": lambda rng: round(rng.uniform(1.1, 2.0), 1),
+    "Tokens per Day": lambda rng: rng.choice([1000000, 10000000, 100000000]),
+    "Inference Period (days)": lambda rng: rng.choice([30, 365, 730])
+}
+
+class ServerProcess:
+    """`streamlit run app.py` on a free port, with RSS and CPU read from /proc"""
+
+    def __init__(self):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            self.port = probe.getsockname()[1]
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "app.py"),
+             "--server.port", str(self.port), "--server.address", "127.0.0.1",
+             "--server.headless", "true", "--browser.gatherUsageStats", "false"],
+            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        self.url = f"ws://127.0.0.1:{self.port}/_stcore/stream"
+        self._wait_healthy()
+
+    def _wait_healthy(self, timeout: float = 60.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1):
+                    return
+            except OSError:
+                time.sleep(0.2)
+        self.stop()
+        raise RuntimeError("Streamlit server did not become healthy")
+
+    def rss_mb(self) -> float:
+        with open(f"/proc/{self.process.pid}/status") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+        return float("nan")
+
+    def cpu_seconds(self) -> float:
+        with open(f"/proc/{self.process.pid}/stat") as handle:
+            fields = handle.read().rsplit(")", 1)[1].split()
+        # utime and stime, fields 14 and 15 of proc(5)
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+class SimulatedUser:
+    """One browser session: rerun requests over the websocket, timed to script_finished"""
+
+    def __init__(self, url: str, seed: int):
+        self.url = url
+        self.rng = random.Random(seed)
+        self.widgets: Dict[str, tuple] = {}
+        self.latencies: List[float] = []
+        self.failures: List[str] = []
+
+    async def _rerun(self, connection, widget_states: Optional[list] = None):
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.page_script_hash = ""
+        for state in widget_states or []:
+            message.rerun_script.widget_states.widgets.append(state)
+        start = time.perf_counter()
+        await connection.write_message(message.SerializeToString(), binary=True)
+        while True:
+            raw = await connection.read_message()
+            if raw is None:
+                raise ConnectionError("Server closed the session")
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                self._record_element(forward.delta.new_element)
+            elif kind == "script_finished":
+                if forward.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                self.latencies.append((time.perf_counter() - start) * 1000)
+                if forward.script_finished != ForwardMsg.FINISHED_SUCCESSFULLY:
+                    self.failures.append("script did not finish successfully")
+                return
+
+    def _record_element(self, element):
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.failures.append(f"{element.exception.type}: {element.exception.message}")
+            return
+        widget = getattr(element, kind)
+        if getattr(widget, "id", "") and getattr(widget, "label", ""):
+            self.widgets[widget.label] = (kind, widget)
+
+    def _form_states(self) -> list:
+        states = []
+        for label, value_of in FORM_VALUES.items():
+            kind, widget = self.widgets[label]
+            state = BackMsg().rerun_script.widget_states.widgets.add()
+            state.id = widget.id
+            value = value_of(self.rng)
+            if kind == "slider":
+                state.double_array_value.data.append(value)
+            elif kind == "selectbox" or (kind == "number_input" and widget.data_type == NumberInput.INT):
+                state.int_value = int(value)
+            else:
+                state.double_value = float(value)
+            states.append(state)
+        submit = BackMsg().rerun_script.widget_states.widgets.add()
+        submit.id = self.widgets[SUBMIT_LABEL][1].id
+        submit.trigger_value = True
+        return states + [submit]
+
+    async def run(self, rounds: int, think_seconds: float):
+        connection = await websocket_connect(self.url, subprotocols=["streamlit"])
+        try:
+            await self._rerun(connection)
+            for _ in range(rounds):
+                await asyncio.sleep(think_seconds * self.rng.uniform(0.5, 1.5))
+                await self._rerun(connection, self._form_states())
+        except (ConnectionError, KeyError) as error:
+            # KeyError: the form was not rendered, so there is nothing to submit
+            self.failures.append(f"{type(error).__name__}: {error}")
+        return connection
+
+async def run_level(url: str, users: int, rounds: int, think_seconds: float, seed: int):
+    """All users of one level concurrently; connections stay open so their sessions count in RSS"""
+    simulated = [SimulatedUser(url, seed + number) for number in range(users)]
+    # Stagger arrivals over one think time, like a class opening the page
+    async def arrive(number, user):
+        await asyncio.sleep(think_seconds * number / max(users, 1))
+        return await user.run(rounds, think_seconds)
+    connections = await asyncio.gather(*(arrive(number, user) for number, user in enumerate(simulated)))
+    return simulated, connections
+
+def measure_level(users: int, rounds: int, think_seconds: float, seed: int) -> dict:
+    server = ServerProcess()
+    try:
+        # One throwaway session loads the modules, so the baseline is a warm idle server
+        asyncio.run(run_level(server.url, 1, 0, 0.0, seed))
+        time.sleep(1.0)
+        baseline_mb = server.rss_mb()
+        cpu_before, wall_before = server.cpu_seconds(), time.perf_counter()
+
+        async def level():
+            simulated, connections = await run_level(server.url, users, rounds, think_seconds, seed)
+            rss_mb = server.rss_mb()
+            for connection in connections:
+                connection.close()
+            return simulated, rss_mb
+
+        simulated, rss_mb = asyncio.run(level())
+        cpu_seconds = server.cpu_seconds() - cpu_before
+        wall_seconds = time.perf_counter() - wall_before
+    finally:
+        server.stop()
+
+    latencies = np.concatenate([user.latencies for user in simulated]) if simulated else np.array([])
+    reruns = len(latencies)
+    row = {
+        "users": users,
+        "reruns": reruns,
+        "errors": sum(len(user.failures) for user in simulated),
+        "failures": sorted({failure for user in simulated for failure in user.failures}),
+        "throughput_rps": reruns / wall_seconds if wall_seconds else 0.0,
+        "cpu_cores": cpu_seconds / wall_seconds if wall_seconds else 0.0,
+        "cpu_ms_per_rerun": cpu_seconds * 1000 / reruns if reruns else float("nan"),
+        "baseline_rss_mb": baseline_mb,
+        "rss_mb": rss_mb,
+        "rss_mb_per_session": (rss_mb - baseline_mb) / users
+    }
+    for percentile in PERCENTILES:
+        row[f"p{percentile}_ms"] = float(np.percentile(latencies, percentile)) if reruns else float("nan")
+    row["max_ms"] = float(latencies.max()) if reruns else float("nan")
+    return row
+
+def session_state_profile(rounds: int, seed: int) -> List[dict]:
+    """st.session_state keys and pickled size after each run of one user's flow (AppTest)"""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    app = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60).run()
+    profile = []
+
+    def record(step):
+        state = app.session_state.filtered_state
+        profile.append({"step": step, "keys": len(state), "bytes": len(pickle.dumps(state))})
+
+    record("open")
+    inputs = {widget.label: widget for widget in list(app.number_input) + list(app.selectbox) + list(app.slider)}
+    for number in range(rounds):
+        for label, value_of in FORM_VALUES.items():
+            widget = inputs[label]
+            value = value_of(rng)
+            if widget.type == "selectbox":
+                value = widget.options[value]
+            widget.set_value(value)
+        next(button for button in app.button if button.label == SUBMIT_LABEL).click().run()
+        record(f"submit {number + 1}")
+    return profile
+
+def capacity(levels: List[dict], target_p95_ms: float, memory_mb: float, cpus: float,
+             think_seconds: float) -> dict:
+    """Users one container serves: the tightest of the latency, memory and CPU bounds"""
+    within = [row["users"] for row in levels if row["p95_ms"] <= target_p95_ms and row["errors"] == 0]
+    latency_bound = max(within) if within else 0
+    tested_all = bool(within) and latency_bound == max(row["users"] for row in levels)
+
+    largest = max(levels, key=lambda row: row["users"])
+    per_session = max(largest["rss_mb_per_session"], 1e-3)
+    memory_bound = int((memory_mb - largest["baseline_rss_mb"]) // per_session)
+    # Each user asks for one rerun per think time; a Streamlit process runs scripts on one core
+    cpu_ms = np.nanmedian([row["cpu_ms_per_rerun"] for row in levels])
+    cpu_bound = int(min(cpus, 1.0) * think_seconds * 1000 // cpu_ms) if cpu_ms > 0 else 0
+
+    bounds = {"latency": latency_bound, "memory": memory_bound, "cpu": cpu_bound}
+    # Latency passing at the largest level tested is a lower bound, not a limit
+    candidates = [name for name in bounds if name != "latency" or not tested_all]
+    limiting = min(candidates, key=bounds.get)
+    return {"users": bounds[limiting], "limited_by": limiting, "bounds": bounds,
+            "latency_bound_is_lower_limit": tested_all}
+
+def print_report(levels: List[dict], profile: List[dict], result: dict, args):
+    print("Load test: "
+          f"{args.rounds} submits per user, think time {args.think:.1f} s, target p95 {args.target_p95:.0f} ms")
+    print()
+    print(f"{'users':>6} {'reruns':>7} {'errors':>6} {'p50 ms':>8} {'p90 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8} {'rerun/s':>8} {'cpu':>5} {'cpu ms':>7} {'RSS MB':>7} {'MB/user':>8}")
+    for row in levels:
+        print(f"{row['users']:>6} {row['reruns']:>7} {row['errors']:>6} {row['p50_ms']:>8.0f} {row['p90_ms']:>8.0f} "
+              f"{row['p95_ms']:>8.0f} {row['p99_ms']:>8.0f} {row['max_ms']:>8.0f} {row['throughput_rps']:>8.1f} "
+              f"{row['cpu_cores']:>5.2f} {row['cpu_ms_per_rerun']:>7.0f} {row['rss_mb']:>7.0f} "
+              f"{row['rss_mb_per_session']:>8.2f}")
+    for row in levels:
+        for failure in row["failures"]:
+            print(f"  {row['users']} users: {failure}")
+    if profile:
+        print()
+        print("st.session_state over one user's flow:")
+        for step in profile:
+            print(f"  {step['step']:<10} {step['keys']:>3} keys {step['bytes']:>9,} bytes")
+    print()
+    bounds = result["bounds"]
+    latency = f"{bounds['latency']}{'+' if result['latency_bound_is_lower_limit'] else ''}"
+    print(f"Bounds: latency {latency} users, memory {bounds['memory']} users ({args.memory_mb:.0f} MB), "
+          f"CPU {bounds['cpu']} users ({args.cpus:g} CPU)")
+    print(f"Capacity: one container serves about {result['users']} concurrent users "
+          f"(limited by {result['limited_by']})")
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the Streamlit app and estimate container capacity")
+    parser.add_argument("--users", default="1,5,10,25", help="Comma-separated concurrent user counts")
+    parser.add_argument("--rounds", type=int, default=5, help="Form submits per user")
+    parser.add_argument("--think", type=float, default=2.0, help="Mean seconds between a user's submits")
+    parser.add_argument("--target-p95", type=float, default=1000.0, help="Latency target for p95 (ms)")
+    parser.add_argument("--memory-mb", type=float, default=512.0, help="Container memory limit")
+    parser.add_argument("--cpus", type=float, default=1.0, help="Container CPU limit")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-profile", action="store_true", help="Skip the AppTest session_state pass")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    levels = [measure_level(int(users), args.rounds, args.think, args.seed) for users in args.users.split(",")]
+    profile = [] if args.skip_profile else session_state_profile(args.rounds, args.seed)
+    result = capacity(levels, args.target_p95, args.memory_mb, args.cpus, args.think)
+    print_report(levels, profile, result, args)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump({"levels": levels, "session_state": profile, "capacity": result,
+                       "settings": vars(args)}, handle, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
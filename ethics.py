@@ -0,0 +1,200 @@
+# ethics.py - OPTIONAL: Multi-dimensional ethical risk scoring
+"""
+Ethical risk model for AI Model Eco & Ethics Calculator
+Scores a model inventory on several weighted dimensions (model size and
+type, deployment domain, data provenance, openness, user reach) loaded from
+a JSON model file (default: ethical_risk_model.json).
+
+Every dimension compiles to an array of scores plus a table of reason
+strings. Scoring a whole inventory gathers from those arrays with bin
+positions (np.searchsorted) or category codes, so there is no per-row
+branching.
+
+Model file format:
+    {"levels": {"edges": [3, 5, 7], "labels": [...], "explanations": [...]},
+     "dimensions": [
+        {"id": "model_size", "column": "params_b", "weight": 0.25, "kind": "bins",
+         "edges": [1, 10], "scores": [2, 4, 6], "reasons": ["...", "...", "..."]},
+        {"id": "deployment_domain", "column": "deployment_domain", "weight": 0.25,
+         "kind": "categories", "categories": {"healthcare": {"score": 9, "reason": "..."}},
+         "default": {"score": 5, "reason": "..."}}]}
+
+Bins follow calculate_ethical_risk: a value below edges[i] gets scores[i],
+larger values the last score. Bin columns must be filled in; a blank cell is
+an error rather than a (top-bin) guess. Categorical columns that are
+missing, empty or unknown get the dimension's default.
+
+Usage:
+    python ethics.py inventory.csv -o inventory_risk.csv
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MODEL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ethical_risk_model.json")
+DIMENSION_KINDS = ("bins", "categories")
+
+class RiskDimension:
+    """One weighted dimension: a score table and a reason table"""
+
+    def __init__(self, dimension_id: str, column: str, weight: float, kind: str,
+                 scores: np.ndarray, reasons: np.ndarray, edges: Optional[np.ndarray] = None,
+                 categories: Optional[List[str]] = None):
+        if kind not in DIMENSION_KINDS:
+            raise ValueError(f"Unknown dimension kind '{kind}' (expected one of {', '.join(DIMENSION_KINDS)})")
+        self.dimension_id = dimension_id
+        self.column = column
+        self.weight = float(weight)
+        self.kind = kind
+        self.scores = np.asarray(scores, dtype=float)
+        self.reasons = np.asarray(reasons, dtype=object)
+        self.edges = None if edges is None else np.asarray(edges, dtype=float)
+        # Category codes index scores/reasons; the last entry is the default
+        self.categories = categories
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "RiskDimension":
+        """
+        Build a dimension from its JSON representation.
+
+        Raises:
+            ValueError: If a required key is missing or the tables do not line up
+        """
+        missing = [key for key in ("id", "column", "weight", "kind") if key not in data]
+        if missing:
+            raise ValueError(f"Dimension {data.get('id', '?')} is missing: {', '.join(missing)}")
+        if data["kind"] == "bins":
+            if not len(data["scores"]) == len(data["reasons"]) == len(data["edges"]) + 1:
+                raise ValueError(f"Dimension {data['id']}: bins need one score and reason per interval")
+            return cls(data["id"], data["column"], data["weight"], "bins",
+                       data["scores"], data["reasons"], edges=data["edges"])
+        entries = list(data.get("categories", {}).items()) + [(None, data["default"])]
+        return cls(data["id"], data["column"], data["weight"], data["kind"],
+                   [entry["score"] for _, entry in entries], [entry["reason"] for _, entry in entries],
+                   categories=[name for name, _ in entries[:-1]])
+
+    def codes(self, inventory: pd.DataFrame) -> np.ndarray:
+        """
+        Row positions into scores/reasons.
+
+        Raises:
+            KeyError: If the column of a "bins" dimension is missing
+            ValueError: If it has blank (NaN) cells, which searchsorted
+                would put in the highest bin
+        """
+        if self.kind == "bins":
+            if self.column not in inventory.columns:
+                raise KeyError(f"Missing column for dimension {self.dimension_id}: {self.column}")
+            values = inventory[self.column].to_numpy(dtype=float)
+            blank = np.isnan(values)
+            if blank.any():
+                raise ValueError(f"Dimension {self.dimension_id}: {int(blank.sum())} rows "
+                                 f"without a {self.column} value")
+            return np.searchsorted(self.edges, values, side="right")
+        if self.column not in inventory.columns:
+            return np.full(len(inventory), len(self.categories))
+        codes = pd.Categorical(inventory[self.column], categories=self.categories).codes.astype(np.int64)
+        codes[codes < 0] = len(self.categories)
+        return codes
+
+class EthicalRiskModel:
+    """Weighted multi-dimensional risk score with explanation tables"""
+
+    def __init__(self, dimensions: List[RiskDimension], level_edges, level_labels, level_explanations):
+        if not dimensions:
+            raise ValueError("The risk model needs at least one dimension")
+        ids = [dimension.dimension_id for dimension in dimensions]
+        duplicates = sorted({dimension_id for dimension_id in ids if ids.count(dimension_id) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate dimension ids: {', '.join(duplicates)}")
+        if not len(level_labels) == len(level_explanations) == len(level_edges) + 1:
+            raise ValueError("Levels need one label and explanation per interval")
+        self.dimensions = dimensions
+        total_weight = sum(dimension.weight for dimension in dimensions)
+        self.weights = np.array([dimension.weight / total_weight for dimension in dimensions])
+        self.level_edges = np.asarray(level_edges, dtype=float)
+        self.level_labels = np.asarray(level_labels, dtype=object)
+        self.level_explanations = np.asarray(level_explanations, dtype=object)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_MODEL_FILE) -> "EthicalRiskModel":
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        levels = data["levels"]
+        return cls([RiskDimension.from_dict(item) for item in data["dimensions"]],
+                   levels["edges"], levels["labels"], levels["explanations"])
+
+    def score(self, inventory: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score every model of an inventory.
+
+        Args:
+            inventory: One row per model; needs the columns of the "bins"
+                dimensions (e.g. params_b, tokens_per_day), categorical
+                columns are optional
+
+        Returns:
+            Frame indexed like `inventory` with, per dimension,
+            "<id>_score", "<id>_contribution" (weighted points) and
+            "<id>_reason", then "risk_score" (1-10, one decimal),
+            "risk_level", "risk_explanation" and "top_dimension"
+        """
+        columns = {}
+        contributions = np.empty((len(inventory), len(self.dimensions)))
+        for position, (dimension, weight) in enumerate(zip(self.dimensions, self.weights)):
+            codes = dimension.codes(inventory)
+            scores = dimension.scores[codes]
+            contributions[:, position] = scores * weight
+            columns[f"{dimension.dimension_id}_score"] = scores
+            columns[f"{dimension.dimension_id}_contribution"] = contributions[:, position]
+            columns[f"{dimension.dimension_id}_reason"] = dimension.reasons[codes]
+
+        risk_score = np.round(contributions.sum(axis=1), 1)
+        # Same banding as get_ethical_explanation: score <= edge falls in that band
+        level = np.searchsorted(self.level_edges, risk_score, side="left")
+        ids = np.array([dimension.dimension_id for dimension in self.dimensions], dtype=object)
+        columns["risk_score"] = risk_score
+        columns["risk_level"] = self.level_labels[level]
+        columns["risk_explanation"] = self.level_explanations[level]
+        columns["top_dimension"] = ids[contributions.argmax(axis=1)] if len(inventory) else ids[:0]
+        return pd.DataFrame(columns, index=inventory.index)
+
+    def score_one(self, features: Mapping[str, Any]) -> Dict[str, Any]:
+        """Breakdown for a single model, e.g. one CalculationInput plus context fields"""
+        return self.score(pd.DataFrame([dict(features)])).iloc[0].to_dict()
+
+    def breakdown(self, scored_row: Mapping[str, Any]) -> pd.DataFrame:
+        """Per-dimension table (score, weight, contribution, reason) for one scored row"""
+        return pd.DataFrame({
+            "dimension": [dimension.dimension_id for dimension in self.dimensions],
+            "score": [scored_row[f"{dimension.dimension_id}_score"] for dimension in self.dimensions],
+            "weight": self.weights,
+            "contribution": [scored_row[f"{dimension.dimension_id}_contribution"] for dimension in self.dimensions],
+            "reason": [scored_row[f"{dimension.dimension_id}_reason"] for dimension in self.dimensions]
+        }).set_index("dimension")
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Multi-dimensional ethical risk scores for a model inventory")
+    parser.add_argument("input", help="Inventory CSV (params_b, tokens_per_day and optional context columns)")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--model", default=DEFAULT_MODEL_FILE, help="Risk model JSON")
+    args = parser.parse_args(argv)
+
+    inventory = pd.read_csv(args.input)
+    try:
+        scored = EthicalRiskModel.from_file(args.model).score(inventory)
+    except (KeyError, ValueError) as error:
+        print(error, file=sys.stderr)
+        return 1
+    pd.concat([inventory, scored], axis=1).to_csv(args.output, index=False)
+    print(f"Scored {len(inventory)} models, written to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+# forecast.py - OPTIONAL: Multi-year footprint projections
+"""
+Forecasting engine for AI Model Eco & Ethics Calculator
+Projects the inference footprint of scenarios over future years or months
+under three trajectories, where calculate_all assumes the constants stay
+fixed:
+- grid decarbonization: carbon intensity of each Config.LOCATIONS region
+  falls by a yearly rate down to a floor
+- hardware efficiency: the fleet is replaced at the end of each
+  lifetime_years cycle, counted from the hardware's release_year. Each
+  replacement brings the generation of that year, and energy per token
+  falls by a yearly rate per generation year gained since the fleet
+  installed at base_year (which the catalog values describe)
+- traffic growth: tokens_per_day compounds yearly from the start of the
+  forecast (per scenario via a "traffic_growth" column, else the model rate)
+
+Every scenario is reduced to its per-day footprint with one calculate_batch
+call, and scenarios x time steps are projected with one broadcast multiply.
+Scenarios are processed in chunks, so large portfolios stay bounded in memory.
+
+Trajectory file format:
+    {"grid_decline": {"US-East (Virginia)": 0.04, ...}, "grid_floor": 25,
+     "hardware_improvement": 0.15, "traffic_growth": 0.3}
+
+Usage:
+    python forecast.py scenarios.csv -o forecast.csv --start 2027 --years 5
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app import Config, ImpactCalculator
+
+# Yearly relative decline of grid carbon intensity per location
+GRID_DECLINE = {
+    "US-West (Oregon)": 0.05,
+    "US-East (Virginia)": 0.04,
+    "EU-West (Ireland)": 0.06,
+    "EU-Central (Germany)": 0.06,
+    "EU-North (Finland)": 0.05,
+    "Asia-Pacific (Singapore)": 0.02,
+    "Asia-East (Tokyo)": 0.03,
+    "Global Average": 0.03
+}
+
+BASE_YEAR = 2025  # year the Config.LOCATIONS intensities describe
+GRID_FLOOR = 25.0  # gCO2e/kWh no grid falls below
+HARDWARE_IMPROVEMENT = 0.15  # yearly fall in energy per token across hardware generations
+# Scenario x period cells per quantity in one chunk (about 16 MB of float64)
+CHUNK_CELLS = 2000000
+FREQUENCIES = ("year", "month")
+QUANTITIES = ("co2", "energy", "water", "cost", "embodied_co2", "lifecycle_co2")
+
+class ForecastModel:
+    """Grid, hardware and traffic trajectories applied to per-day footprints"""
+
+    def __init__(self, grid_decline: Optional[Dict[str, float]] = None, grid_floor: float = GRID_FLOOR,
+                 hardware_improvement: float = HARDWARE_IMPROVEMENT, traffic_growth: float = 0.0,
+                 base_year: int = BASE_YEAR):
+        """
+        Args:
+            grid_decline: Location -> yearly relative decline of carbon intensity
+            grid_floor: Lowest carbon intensity any grid reaches (gCO2e/kWh)
+            hardware_improvement: Yearly relative fall in energy per token of
+                new hardware generations
+            traffic_growth: Yearly relative growth of tokens_per_day for
+                scenarios without a "traffic_growth" column
+            base_year: Year the catalog values and calculate_all describe
+
+        Raises:
+            KeyError: If a Config.LOCATIONS entry has no grid decline
+        """
+        self.grid_decline = grid_decline or GRID_DECLINE
+        missing = [location for location in Config.LOCATIONS if location not in self.grid_decline]
+        if missing:
+            raise KeyError(f"No grid decline for: {', '.join(missing)}")
+        self.grid_floor = grid_floor
+        self.hardware_improvement = hardware_improvement
+        self.traffic_growth = traffic_growth
+        self.base_year = base_year
+        self.decline = np.array([self.grid_decline[location] for location in Config.LOCATIONS], dtype=float)
+        self.carbon = np.array([spec["carbon"] for spec in Config.LOCATIONS.values()], dtype=float)
+        self.release_year = np.array([spec["release_year"] for spec in Config.HARDWARE.values()])
+        self.lifetime_years = np.array([spec["lifetime_years"] for spec in Config.HARDWARE.values()])
+
+    @classmethod
+    def from_file(cls, path: str) -> "ForecastModel":
+        """Load trajectories from a JSON object (see the module docstring)"""
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        return cls(data.get("grid_decline"), data.get("grid_floor", GRID_FLOOR),
+                   data.get("hardware_improvement", HARDWARE_IMPROVEMENT),
+                   data.get("traffic_growth", 0.0), data.get("base_year", BASE_YEAR))
+
+    def periods(self, start_year: int, years: int, freq: str = "year") -> Tuple[pd.PeriodIndex, dict]:
+        """
+        Time steps of a forecast.
+
+        Returns:
+            (period labels, arrays per step: "days", "elapsed" (years from
+            base_year to the step's midpoint), "since_start" (years from the
+            forecast start to the midpoint) and "year" (calendar year))
+        """
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unknown frequency '{freq}', expected one of {', '.join(FREQUENCIES)}")
+        labels = pd.period_range(str(start_year), periods=years * (12 if freq == "month" else 1),
+                                 freq="M" if freq == "month" else "Y")
+        starts = labels.start_time
+        days = (labels.end_time.normalize() - starts).days.to_numpy(dtype=float) + 1
+        midpoints = starts + pd.to_timedelta(days / 2, unit="D")
+
+        def years_since(year):
+            return ((midpoints - pd.Timestamp(f"{year}-01-01")).days.to_numpy(dtype=float)
+                    + midpoints.hour.to_numpy() / 24) / 365.25
+
+        return labels, {
+            "days": days,
+            "elapsed": years_since(self.base_year),
+            "since_start": years_since(start_year),
+            "year": labels.year.to_numpy()
+        }
+
+    def grid_factors(self, steps: dict) -> np.ndarray:
+        """(locations, steps) carbon intensity relative to Config.LOCATIONS"""
+        decline = (1 - self.decline[:, None]) ** np.maximum(steps["elapsed"], 0)
+        return np.maximum(decline, np.minimum(1.0, self.grid_floor / self.carbon)[:, None])
+
+    def hardware_factors(self, steps: dict) -> np.ndarray:
+        """(hardware, steps) energy per token relative to the catalog hardware, 1 at base_year"""
+        lifetime = self.lifetime_years[:, None]
+
+        def generation(year):
+            # Release year plus the years gained at every lifetime_years refresh since
+            age = np.maximum(year - self.release_year[:, None], 0)
+            return (age // lifetime) * lifetime
+
+        generation_gap = np.maximum(generation(steps["year"][None, :]) - generation(self.base_year), 0)
+        return (1 - self.hardware_improvement) ** generation_gap
+
+    def iter_forecast(self, inputs: pd.DataFrame, start_year: int, years: int, freq: str = "year",
+                      chunk_rows: Optional[int] = None,
+                      include_training: bool = False) -> Iterator[pd.DataFrame]:
+        """
+        Projections per scenario, one chunk of scenarios at a time.
+
+        With all rates at 0, a year of projection equals the inference part
+        of calculate_batch with inference_days set to that year's days.
+        inference_days of the inputs is ignored; the horizon sets the days.
+
+        Args:
+            inputs: Batch input frame, optionally with a "traffic_growth" column
+            start_year: First forecast year
+            years: Number of years
+            freq: "year" or "month" steps
+            chunk_rows: Scenarios per chunk, by default as many as fit in
+                CHUNK_CELLS at the chosen resolution
+            include_training: Add the training footprint to the first step
+
+        Yields:
+            Frames indexed like the chunk with (quantity, period) columns,
+            quantities as in QUANTITIES ("co2" is operational carbon, kg;
+            energy kWh, water L, cost USD)
+        """
+        labels, steps = self.periods(start_year, years, freq)
+        grid = self.grid_factors(steps)
+        hardware = self.hardware_factors(steps)
+        chunk_rows = chunk_rows or max(1, CHUNK_CELLS // len(labels))
+        columns = pd.MultiIndex.from_product([list(QUANTITIES), labels], names=["quantity", freq])
+
+        for start in range(0, len(inputs), chunk_rows):
+            chunk = inputs.iloc[start:start + chunk_rows]
+            daily = ImpactCalculator.calculate_batch(chunk.assign(inference_days=1.0))
+            growth_rate = (chunk["traffic_growth"].to_numpy(dtype=float) if "traffic_growth" in chunk.columns
+                           else np.full(len(chunk), self.traffic_growth))
+
+            # scenarios x steps: tokens served per step relative to one day at the start
+            volume = steps["days"] * (1 + growth_rate[:, None]) ** steps["since_start"]
+            volume = volume * hardware[ImpactCalculator._codes(chunk["hardware"], Config.HARDWARE)]
+            carbon = volume * grid[ImpactCalculator._codes(chunk["location"], Config.LOCATIONS)]
+
+            out = {"co2": daily["inference_co2"].to_numpy()[:, None] * carbon}
+            for quantity in ("energy", "water", "cost", "embodied_co2"):
+                out[quantity] = daily[f"inference_{quantity}"].to_numpy()[:, None] * volume
+            if include_training:
+                for quantity in ("co2", "energy", "water", "cost", "embodied_co2"):
+                    out[quantity][:, 0] += daily[f"training_{quantity}"].to_numpy()
+            out["lifecycle_co2"] = out["co2"] + out["embodied_co2"]
+            yield pd.DataFrame(np.hstack([out[quantity] for quantity in QUANTITIES]),
+                               index=chunk.index, columns=columns)
+
+    def portfolio(self, inputs: pd.DataFrame, start_year: int, years: int, freq: str = "year",
+                  chunk_rows: Optional[int] = None, include_training: bool = False) -> pd.DataFrame:
+        """Totals over all scenarios: one row per period, one column per quantity"""
+        total = None
+        for frame in self.iter_forecast(inputs, start_year, years, freq, chunk_rows, include_training):
+            summed = frame.sum()
+            total = summed if total is None else total + summed
+        if total is None:
+            return pd.DataFrame(columns=list(QUANTITIES))
+        return total.unstack(level="quantity")[list(QUANTITIES)]
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Multi-year footprint projections for a scenario CSV")
+    parser.add_argument("input", help="Scenario CSV (batch.py columns, optional traffic_growth)")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--start", type=int, default=BASE_YEAR + 1, help="First forecast year")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--freq", choices=FREQUENCIES, default="year")
+    parser.add_argument("--trajectories", metavar="PATH", help="JSON trajectories replacing the defaults")
+    parser.add_argument("--traffic-growth", type=float, help="Yearly traffic growth for all scenarios")
+    parser.add_argument("--include-training", action="store_true", help="Count training in the first step")
+    parser.add_argument("--portfolio", action="store_true", help="Write totals per period only")
+    parser.add_argument("--chunk-rows", type=int, help="Scenarios per chunk (default: sized by horizon)")
+    args = parser.parse_args(argv)
+
+    from batch import scenario_inputs
+    model = ForecastModel.from_file(args.trajectories) if args.trajectories else ForecastModel()
+    if args.traffic_growth is not None:
+        model.traffic_growth = args.traffic_growth
+    scenarios = pd.read_csv(args.input)
+    inputs = scenario_inputs(scenarios)
+    if "traffic_growth" in scenarios.columns:
+        inputs = inputs.assign(traffic_growth=scenarios["traffic_growth"])
+    if args.portfolio:
+        model.portfolio(inputs, args.start, args.years, args.freq, args.chunk_rows,
+                        args.include_training).to_csv(args.output)
+    else:
+        # Chunks are appended as they are computed, so monthly output never sits in memory whole
+        frames = model.iter_forecast(inputs, args.start, args.years, args.freq, args.chunk_rows,
+                                     args.include_training)
+        for number, frame in enumerate(frames):
+            frame.columns = [f"{quantity}_{period}" for quantity, period in frame.columns]
+            frame.to_csv(args.output, mode="w" if number == 0 else "a", header=number == 0)
+    print(f"Wrote {args.years}-year forecast for {len(inputs)} scenarios to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+# golden.py - OPTIONAL: Golden-result regression corpus
+"""
+Golden-result regression corpus for AI Model Eco & Ethics Calculator
+Generates a deterministic, seeded set of scenarios, stores the reference
+(scalar calculate_all) outputs in a compressed .npz file and checks any
+engine against them with vectorized tolerance comparisons.
+
+Usage:
+    python golden.py generate -n 1000000 -o golden.npz
+    python golden.py check golden.npz --engine batch
+"""
+
+import argparse
+import itertools
+import json
+import sys
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from app import CalculationInput, CalculationResult, Config, ImpactCalculator
+from utils import Validators
+
+DEFAULT_SEED = 2026
+FORMAT_VERSION = 1
+
+# Values sitting exactly on the ethical-risk ladder and recommendation thresholds
+PARAMS_THRESHOLDS = (1, 10, 50, 100, 500)
+PUE_THRESHOLDS = (2.0,)
+
+def scalar_engine(inputs: pd.DataFrame) -> pd.DataFrame:
+    """Reference engine: ImpactCalculator.calculate_all row by row"""
+    rows = []
+    for values in inputs[list(CalculationInput.FIELDS)].itertuples(index=False):
+        result = ImpactCalculator.calculate_all(CalculationInput(*values))
+        rows.append([getattr(result, field) for field in CalculationResult.FIELDS])
+    return pd.DataFrame(rows, columns=list(CalculationResult.FIELDS), index=inputs.index)
+
+ENGINES: Dict[str, Callable[[pd.DataFrame], pd.DataFrame]] = {
+    "scalar": scalar_engine,
+    "batch": ImpactCalculator.calculate_batch
+}
+
+def _log_uniform(rng: np.random.Generator, low: float, high: float, size: int) -> np.ndarray:
+    return np.exp(rng.uniform(np.log(low), np.log(high), size))
+
+def generate_corpus(n_rows: int, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """
+    Build a deterministic scenario corpus.
+
+    The first rows pin every model type x location x hardware combination to
+    the Validators bounds (all minimums, all maximums) and the params/PUE
+    thresholds; the remainder is random, log-uniform for the wide ranges.
+
+    Args:
+        n_rows: Total number of scenarios
+        seed: Seed for numpy's default_rng
+
+    Returns:
+        Frame with the CalculationInput.FIELDS columns
+    """
+    rng = np.random.default_rng(seed)
+    combos = list(itertools.product(Config.MODEL_TYPES, Config.LOCATIONS, Config.HARDWARE))
+    bounds = Validators.BOUNDS
+
+    edge_rows = []
+    for model_type, location, hardware in combos:
+        for side in (0, 1):
+            edge_rows.append((
+                bounds["params_b"][side], model_type, bounds["training_hours"][side],
+                bounds["tokens_per_day"][side], bounds["inference_days"][side],
+                location, hardware, bounds["pue"][side]
+            ))
+        for params_b in PARAMS_THRESHOLDS:
+            for pue in PUE_THRESHOLDS:
+                edge_rows.append((params_b, model_type, 1000, 10000000, 365, location, hardware, pue))
+    edges = pd.DataFrame(edge_rows, columns=list(CalculationInput.FIELDS)).iloc[:n_rows]
+
+    n_random = n_rows - len(edges)
+    tokens = np.floor(_log_uniform(rng, 1, bounds["tokens_per_day"][1], n_random))
+    tokens[rng.random(n_random) < 0.05] = 0
+    combo_index = rng.integers(0, len(combos), n_random)
+    random_rows = pd.DataFrame({
+        "params_b": _log_uniform(rng, *bounds["params_b"], n_random),
+        "model_type": np.array([combo[0] for combo in combos], dtype=object)[combo_index],
+        "training_hours": np.floor(_log_uniform(rng, *bounds["training_hours"], n_random)),
+        "tokens_per_day": tokens,
+        "inference_days": rng.integers(bounds["inference_days"][0], bounds["inference_days"][1] + 1, n_random),
+        "location": np.array([combo[1] for combo in combos], dtype=object)[combo_index],
+        "hardware": np.array([combo[2] for combo in combos], dtype=object)[combo_index],
+        "pue": rng.uniform(*bounds["pue"], n_random)
+    })
+    return pd.concat([edges, random_rows], ignore_index=True)
+
+class GoldenCorpus:
+    """Scenario inputs plus reference outputs, stored as a compressed .npz"""
+
+    def __init__(self, inputs: pd.DataFrame, outputs: pd.DataFrame, meta: Optional[dict] = None):
+        self.inputs = inputs
+        self.outputs = outputs
+        self.meta = meta or {}
+
+    @classmethod
+    def build(cls, n_rows: int, seed: int = DEFAULT_SEED, engine: str = "scalar") -> "GoldenCorpus":
+        """Generate a corpus and its reference outputs"""
+        inputs = generate_corpus(n_rows, seed)
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "app_version": Config.VERSION,
+            "seed": seed,
+            "rows": n_rows,
+            "reference_engine": engine
+        }
+        return cls(inputs, ENGINES[engine](inputs), meta)
+
+    @staticmethod
+    def _pack(prefix: str, frame: pd.DataFrame, arrays: dict):
+        # Text columns become small integer codes plus a category table
+        for column in frame.columns:
+            values = frame[column]
+            if values.dtype == object:
+                codes, uniques = pd.factorize(values)
+                arrays[f"{prefix}/{column}"] = codes.astype(np.int32)
+                arrays[f"{prefix}_categories/{column}"] = np.array(uniques, dtype=str)
+            else:
+                arrays[f"{prefix}/{column}"] = values.to_numpy()
+
+    @staticmethod
+    def _unpack(prefix: str, data) -> pd.DataFrame:
+        columns = {}
+        for key in data.files:
+            if not key.startswith(f"{prefix}/"):
+                continue
+            column = key.split("/", 1)[1]
+            categories_key = f"{prefix}_categories/{column}"
+            if categories_key in data.files:
+                columns[column] = data[categories_key].astype(object)[data[key]]
+            else:
+                columns[column] = data[key]
+        return pd.DataFrame(columns)
+
+    def save(self, path: str):
+        meta = dict(self.meta, output_fields=list(self.outputs.columns))
+        arrays = {"meta": np.array(json.dumps(meta))}
+        self._pack("inputs", self.inputs, arrays)
+        self._pack("outputs", self.outputs, arrays)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "GoldenCorpus":
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            inputs = cls._unpack("inputs", data)[list(CalculationInput.FIELDS)]
+            outputs = cls._unpack("outputs", data)[meta["output_fields"]]
+        return cls(inputs, outputs, meta)
+
+def compare_results(expected: pd.DataFrame, actual: pd.DataFrame,
+                    rtol: float = 1e-9, atol: float = 1e-9) -> dict:
+    """
+    Compare two result frames column by column.
+
+    Numeric columns use np.isclose(actual, expected, rtol, atol), text
+    columns exact equality. Only columns present in `expected` are checked.
+
+    Returns:
+        {"passed": bool, "rows": int, "fields": {name: {...}}} with mismatch
+        counts, worst absolute/relative error and up to five mismatching rows
+    """
+    if len(expected) != len(actual):
+        raise ValueError(f"Row count differs: expected {len(expected)}, got {len(actual)}")
+
+    fields = {}
+    for column in expected.columns:
+        if column not in actual.columns:
+            fields[column] = {"mismatches": len(expected), "missing": True}
+            continue
+        want = expected[column].to_numpy()
+        got = actual[column].to_numpy()
+        if want.dtype == object:
+            bad = want != got
+            report = {}
+        else:
+            want = want.astype(float)
+            got = got.astype(float)
+            abs_err = np.abs(got - want)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rel_err = np.where(want != 0, abs_err / np.abs(want), 0.0)
+            bad = ~np.isclose(got, want, rtol=rtol, atol=atol)
+            report = {
+                "max_abs_err": float(abs_err.max()) if len(abs_err) else 0.0,
+                "max_rel_err": float(rel_err.max()) if len(rel_err) else 0.0
+            }
+        report["mismatches"] = int(bad.sum())
+        report["first_rows"] = np.flatnonzero(bad)[:5].tolist()
+        fields[column] = report
+
+    return {
+        "passed": all(report["mismatches"] == 0 for report in fields.values()),
+        "rows": len(expected),
+        "fields": fields
+    }
+
+def check_engine(corpus: GoldenCorpus, engine: Callable[[pd.DataFrame], pd.DataFrame],
+                 rtol: float = 1e-9, atol: float = 1e-9) -> dict:
+    """Run `engine` over the corpus inputs and compare with the stored outputs"""
+    return compare_results(corpus.outputs, engine(corpus.inputs), rtol=rtol, atol=atol)
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Golden-result regression corpus")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="Generate a corpus with reference outputs")
+    generate.add_argument("-n", "--rows", type=int, default=1000000)
+    generate.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    generate.add_argument("--engine", choices=sorted(ENGINES), default="scalar",
+                          help="Engine producing the reference outputs")
+    generate.add_argument("-o", "--output", required=True)
+
+    check = commands.add_parser("check", help="Check an engine against a stored corpus")
+    check.add_argument("corpus")
+    check.add_argument("--engine", choices=sorted(ENGINES), default="batch")
+    check.add_argument("--rtol", type=float, default=1e-9)
+    check.add_argument("--atol", type=float, default=1e-9)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        GoldenCorpus.build(args.rows, args.seed, args.engine).save(args.output)
+        print(f"Wrote {args.rows} golden results to {args.output}", file=sys.stderr)
+        return 0
+
+    report = check_engine(GoldenCorpus.load(args.corpus), ENGINES[args.engine], args.rtol, args.atol)
+    print(json.dumps(report, indent=2))
+    return 0 if report["passed"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
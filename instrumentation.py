@@ -0,0 +1,166 @@
+# instrumentation.py - OPTIONAL: Opt-in timing instrumentation
+"""
+Per-stage timing instrumentation for AI Model Eco & Ethics Calculator
+Records latency histograms and call counts for calculation pipeline stages
+and exports them as Prometheus text or a JSON snapshot.
+
+Disabled by default. Enable with the ECO_CALC_INSTRUMENT=1 environment
+variable or `instrumentation.enable()`. While disabled, `stage()` hands back
+a shared no-op context manager and `timed()` wrappers only check a flag.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Sequence
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0, 10.0, 60.0)
+
+_NULL_CONTEXT = nullcontext()
+
+class StageHistogram:
+    """Latency histogram for a single pipeline stage"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        """Add one observation"""
+        self.bucket_counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative_counts(self) -> list:
+        """Bucket counts as Prometheus expects them (cumulative, ending at +Inf)"""
+        running = 0
+        cumulative = []
+        for count in self.bucket_counts:
+            running += count
+            cumulative.append(running)
+        return cumulative
+
+    def to_dict(self) -> Dict[str, Any]:
+        bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum_seconds": self.sum,
+            "mean_seconds": self.sum / self.count if self.count else 0.0,
+            "buckets": dict(zip(bounds, self.cumulative_counts()))
+        }
+
+class Instrumentation:
+    """Registry of per-stage histograms with context-manager/decorator timing"""
+
+    ENV_VAR = "ECO_CALC_INSTRUMENT"
+    METRIC_NAME = "eco_calc_stage_seconds"
+
+    def __init__(self, enabled: Optional[bool] = None, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        if enabled is None:
+            enabled = os.environ.get(self.ENV_VAR, "").lower() in ("1", "true", "yes")
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._stages: Dict[str, StageHistogram] = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Drop all recorded observations"""
+        with self._lock:
+            self._stages = {}
+
+    def observe(self, stage: str, seconds: float):
+        """Record one timing for `stage`"""
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = StageHistogram(self.buckets)
+            histogram.observe(seconds)
+
+    def stage(self, name: str):
+        """
+        Context manager timing the enclosed block as stage `name`.
+
+        Returns a shared no-op context manager while disabled.
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._timed_block(name)
+
+    @contextmanager
+    def _timed_block(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """
+        Decorator timing every call of the wrapped function.
+
+        Args:
+            name: Stage name, defaults to the function's qualified name
+        """
+        def decorator(func: Callable) -> Callable:
+            stage_name = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(stage_name, time.perf_counter() - start)
+
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current histograms as plain data, keyed by stage name"""
+        with self._lock:
+            stages = {name: histogram.to_dict() for name, histogram in self._stages.items()}
+        return {
+            "enabled": self.enabled,
+            "unit": "seconds",
+            "stages": stages
+        }
+
+    def to_json(self, indent: int = 2) -> str:
+        """JSON snapshot of all stages"""
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self) -> str:
+        """All stages in Prometheus text exposition format (one histogram family)"""
+        metric = self.METRIC_NAME
+        lines = [
+            f"# HELP {metric} Calculation pipeline stage latency in seconds.",
+            f"# TYPE {metric} histogram"
+        ]
+        with self._lock:
+            stages = sorted(self._stages.items())
+            for name, histogram in stages:
+                label = name.replace("\\", "\\\\").replace('"', '\\"')
+                bounds = [repr(float(bound)) for bound in histogram.buckets] + ["+Inf"]
+                for bound, count in zip(bounds, histogram.cumulative_counts()):
+                    lines.append(f'{metric}_bucket{{stage="{label}",le="{bound}"}} {count}')
+                lines.append(f'{metric}_sum{{stage="{label}"}} {histogram.sum!r}')
+                lines.append(f'{metric}_count{{stage="{label}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+# Process-wide registry used by app.py and batch.py
+instrumentation = Instrumentation()
@@ -0,0 +1,234 @@
+# pricing.py - OPTIONAL: Price catalog and time-of-use tariffs
+"""
+Pricing engine for AI Model Eco & Ethics Calculator
+Replaces the flat hardware cost_per_hour and global ENERGY_COST_PER_KWH
+with a loadable price catalog:
+- accelerator rates per purchase option (on_demand, reserved, spot), with
+  an interruption overhead on spot capacity (share of hours redone)
+- per-region time-of-use electricity tariffs
+
+A tariff compiles to sorted minute-of-week breakpoints and a price per
+segment, so looking up any number of timestamps is one np.searchsorted.
+Running totals of price x minutes at the breakpoints give the mean price
+of any time span the same way: flat loads with a known start, weekly load
+shapes and metered intervals are all priced without per-interval loops.
+
+Catalog file format:
+    {"purchase_option": "on_demand",
+     "hardware": {"NVIDIA A100": {"on_demand": 3.0, "reserved": 1.9, "spot": 1.1,
+                                  "spot_interruption_overhead": 0.15}},
+     "tariffs": {"US-East (Virginia)": {"default": 0.09, "bands": [
+         {"days": "weekday", "start": "07:00", "end": "21:00", "price": 0.14}]}},
+     "inference_profile": [24 or 168 hourly load weights from Monday 00:00]}
+
+Without an inference_profile, inference energy is priced as a constant
+load (the tariff's mean price); training is priced the same way unless the
+batch input gives its start (see ImpactCalculator.calculate_batch).
+
+Later bands override earlier ones where they overlap. Timestamps are read
+as local time of the region.
+"""
+
+import json
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+MINUTES_PER_WEEK = 7 * 24 * 60
+PURCHASE_OPTIONS = ("on_demand", "reserved", "spot")
+DAY_SETS = {"all": range(7), "weekday": range(5), "weekend": range(5, 7)}
+
+def _minutes(clock: str) -> int:
+    """Minutes since midnight for "HH:MM" ("24:00" is the end of the day)"""
+    hours, minutes = clock.split(":")
+    return int(hours) * 60 + int(minutes)
+
+def minute_of_week(timestamps) -> np.ndarray:
+    """Minutes (with fractions) since Monday 00:00 for datetime64-compatible timestamps"""
+    seconds = np.asarray(timestamps, dtype="datetime64[s]").astype(np.int64)
+    # 1970-01-01 was a Thursday; shift so minute 0 is Monday 00:00
+    return ((seconds + 3 * 86400) % (MINUTES_PER_WEEK * 60)) / 60
+
+class TariffSchedule:
+    """Weekly time-of-use electricity tariff ($/kWh) as an interval lookup table"""
+
+    def __init__(self, default: float, bands: Sequence[Mapping] = ()):
+        # Paint the bands onto the week in order, then keep only the edges
+        intervals = []
+        for band in bands:
+            days = band.get("days", "all")
+            days = DAY_SETS[days] if isinstance(days, str) else days
+            start, end = _minutes(band.get("start", "00:00")), _minutes(band.get("end", "24:00"))
+            if not 0 <= start < end <= 24 * 60:
+                raise ValueError(f"Invalid tariff band {band.get('start')}-{band.get('end')}")
+            for day in days:
+                intervals.append((day * 1440 + start, day * 1440 + end, float(band["price"])))
+
+        edges = np.unique([0, MINUTES_PER_WEEK] + [edge for start, end, _ in intervals for edge in (start, end)])
+        prices = np.full(len(edges) - 1, float(default))
+        for start, end, price in intervals:
+            prices[(edges[:-1] >= start) & (edges[:-1] < end)] = price
+        # Merge neighbouring segments with the same price
+        keep = np.concatenate([[True], prices[1:] != prices[:-1]])
+        self.starts = edges[:-1][keep]
+        self.prices = prices[keep]
+        lengths = np.diff(np.append(self.starts, MINUTES_PER_WEEK))
+        # $/kWh x minutes from Monday 00:00 up to each breakpoint
+        self.cumulative = np.concatenate([[0.0], np.cumsum(lengths * self.prices)[:-1]])
+        self.week_total = float(lengths @ self.prices)
+        self.mean_price = self.week_total / MINUTES_PER_WEEK
+
+    @classmethod
+    def from_dict(cls, data) -> "TariffSchedule":
+        if isinstance(data, (int, float)):
+            return cls(float(data))
+        return cls(data["default"], data.get("bands", ()))
+
+    def price_at(self, timestamps) -> np.ndarray:
+        """Price per kWh at each timestamp (datetime64-compatible, local time)"""
+        minutes = np.floor(minute_of_week(timestamps))
+        return self.prices[np.searchsorted(self.starts, minutes, side="right") - 1]
+
+    def _integral(self, minutes: np.ndarray) -> np.ndarray:
+        # $/kWh x minutes from minute 0 of the first week up to `minutes` (any length)
+        weeks, minutes = np.divmod(minutes, MINUTES_PER_WEEK)
+        segment = np.searchsorted(self.starts, minutes, side="right") - 1
+        return weeks * self.week_total + self.cumulative[segment] + (minutes - self.starts[segment]) * self.prices[segment]
+
+    def average_price(self, starts, hours) -> np.ndarray:
+        """
+        Mean price per kWh of flat loads running `hours` from each start.
+
+        Spans of any length are priced exactly, whole weeks included; a
+        zero-length span gets the price at its start.
+        """
+        start = minute_of_week(starts)
+        duration = np.broadcast_to(np.asarray(hours, dtype=float) * 60, start.shape)
+        spent = self._integral(start + duration) - self._integral(start)
+        return np.divide(spent, duration, out=self.price_at(starts).astype(float), where=duration > 0)
+
+    def profile_price(self, weights: Sequence[float]) -> float:
+        """Mean price per kWh of a weekly load shape (168 hourly weights from Monday 00:00)"""
+        edges = np.arange(0, MINUTES_PER_WEEK + 60, 60, dtype=float)
+        hourly = np.diff(self._integral(edges)) / 60
+        weights = np.asarray(weights, dtype=float)
+        return float(hourly @ weights / weights.sum())
+
+    def energy_cost(self, timestamps, energy_kwh, interval_hours=None) -> float:
+        """
+        Cost of energy drawn in the intervals starting at `timestamps`.
+
+        With `interval_hours` each interval is priced at its mean price,
+        which matters for intervals crossing a band edge; otherwise at the
+        price of its start.
+        """
+        prices = self.price_at(timestamps) if interval_hours is None else self.average_price(timestamps, interval_hours)
+        return float(np.dot(prices, np.asarray(energy_kwh, dtype=float)))
+
+class PriceCatalog:
+    """Accelerator rates and electricity tariffs for the cost calculations"""
+
+    def __init__(self, hardware: Dict[str, Mapping], tariffs: Dict[str, object],
+                 purchase_option: str = "on_demand", inference_profile: Optional[Sequence[float]] = None):
+        """
+        Raises:
+            ValueError: If the purchase option is unknown or the inference
+                profile is not 24 (one day, repeated) or 168 hourly weights
+        """
+        if purchase_option not in PURCHASE_OPTIONS:
+            raise ValueError(
+                f"Unknown purchase option '{purchase_option}' (expected one of {', '.join(PURCHASE_OPTIONS)})"
+            )
+        self.hardware = {name: dict(rates) for name, rates in hardware.items()}
+        self.tariffs = {location: TariffSchedule.from_dict(data) for location, data in tariffs.items()}
+        self.purchase_option = purchase_option
+        self.inference_profile = None
+        if inference_profile is not None:
+            profile = np.asarray(inference_profile, dtype=float)
+            if len(profile) not in (24, 168) or (profile < 0).any() or not profile.sum() > 0:
+                raise ValueError("inference_profile needs 24 or 168 non-negative hourly weights")
+            self.inference_profile = np.tile(profile, 7) if len(profile) == 24 else profile
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "PriceCatalog":
+        return cls(data["hardware"], data["tariffs"], data.get("purchase_option", "on_demand"),
+                   data.get("inference_profile"))
+
+    @classmethod
+    def from_file(cls, path: str) -> "PriceCatalog":
+        with open(path, encoding="utf-8") as handle:
+            return cls.from_dict(json.load(handle))
+
+    def hourly_rate(self, hardware: str, purchase_option: Optional[str] = None) -> float:
+        """
+        Effective $/device-hour, spot rates grossed up by the interruption overhead.
+
+        Raises:
+            KeyError: If the hardware or its rate for the option is not in the catalog
+        """
+        option = purchase_option or self.purchase_option
+        rates = self.hardware[hardware]
+        if option not in rates:
+            raise KeyError(f"No {option} rate for {hardware}")
+        rate = rates[option]
+        if option == "spot":
+            rate *= 1 + rates.get("spot_interruption_overhead", 0.0)
+        return rate
+
+    def hourly_rates(self, hardware_names: Sequence[str], purchase_option: Optional[str] = None) -> np.ndarray:
+        """hourly_rate for a sequence of catalog keys, in order"""
+        return np.array([self.hourly_rate(name, purchase_option) for name in hardware_names], dtype=float)
+
+    def energy_price(self, location: str) -> float:
+        """Time-averaged $/kWh, the effective price of a constant load"""
+        return self.tariffs[location].mean_price
+
+    def energy_prices(self, locations: Sequence[str]) -> np.ndarray:
+        """energy_price for a sequence of catalog keys, in order"""
+        return np.array([self.energy_price(location) for location in locations], dtype=float)
+
+    def inference_price(self, location: str) -> float:
+        """$/kWh of inference load, shaped by inference_profile when the catalog has one"""
+        if self.inference_profile is None:
+            return self.energy_price(location)
+        return self.tariffs[location].profile_price(self.inference_profile)
+
+    def inference_prices(self, locations: Sequence[str]) -> np.ndarray:
+        """inference_price for a sequence of catalog keys, in order"""
+        return np.array([self.inference_price(location) for location in locations], dtype=float)
+
+    def interval_prices(self, locations, starts, hours) -> np.ndarray:
+        """
+        Mean $/kWh per row for flat loads of `hours` from `starts` in each
+        row's location; one vectorized lookup per distinct location.
+        """
+        locations = np.asarray(locations, dtype=object)
+        starts = np.asarray(starts, dtype="datetime64[s]")
+        hours = np.broadcast_to(np.asarray(hours, dtype=float), locations.shape)
+        prices = np.empty(len(locations))
+        for location in dict.fromkeys(locations):
+            rows = locations == location
+            prices[rows] = self.tariffs[location].average_price(starts[rows], hours[rows])
+        return prices
+
+    def energy_cost_series(self, location: str, timestamps, energy_kwh, interval_hours=None) -> float:
+        """Electricity cost of a metered time series (energy drawn per interval)"""
+        return self.tariffs[location].energy_cost(timestamps, energy_kwh, interval_hours)
+
+    def missing(self, hardware_names: Sequence[str], locations: Sequence[str]) -> List[str]:
+        """Catalog keys without a rate for the purchase option or without a tariff"""
+        return [name for name in hardware_names if self.purchase_option not in self.hardware.get(name, {})] + [
+            location for location in locations if location not in self.tariffs
+        ]
+
+    def require(self, hardware_names: Sequence[str], locations: Sequence[str]) -> "PriceCatalog":
+        """
+        The catalog itself, once it is known to price every given key.
+
+        Raises:
+            ValueError: Listing every key missing() reports
+        """
+        missing = self.missing(hardware_names, locations)
+        if missing:
+            raise ValueError(f"Price catalog has no {self.purchase_option} rate or tariff for: {', '.join(missing)}")
+        return self
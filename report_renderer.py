@@ -0,0 +1,345 @@
+# report_renderer.py - OPTIONAL: Offline HTML/PDF reports
+"""
+Offline report generation for AI Model Eco & Ethics Calculator
+Renders one self-contained HTML report per scenario (optionally PDF) from
+ImpactCalculator / ReportGenerator outputs, in parallel worker processes.
+
+Templates are compiled once per process and chart SVGs are cached by the
+hash of their content, in memory and optionally on disk.
+
+Usage:
+    python report_renderer.py scenarios.csv -o reports/ --workers 4 [--pdf]
+
+PDF output needs the optional `weasyprint` package.
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from string import Template
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from app import CalculationInput, Config, ImpactCalculator, ReportGenerator
+
+PAGE_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>$title</title>
+<style>
+    body { font-family: Helvetica, Arial, sans-serif; color: #2c3e50; max-width: 960px; margin: 2rem auto; }
+    h1 { margin-bottom: 0.25rem; }
+    .subtitle { color: #7f8c8d; margin-bottom: 2rem; }
+    table { border-collapse: collapse; width: 100%; margin: 1rem 0; }
+    th, td { border: 1px solid #dee2e6; padding: 0.4rem 0.6rem; text-align: right; }
+    th:first-child, td:first-child { text-align: left; }
+    .charts { display: flex; gap: 1rem; flex-wrap: wrap; }
+    .result-box { background: #f8f9fa; padding: 1rem 1.5rem; border-radius: 10px; border: 1px solid #dee2e6; margin: 1rem 0; }
+    .recommendation-high { border-left: 4px solid #dc3545; }
+    .recommendation-medium { border-left: 4px solid #ffc107; }
+    .recommendation-low { border-left: 4px solid #28a745; }
+    .footer { color: #6c757d; font-size: 0.85rem; border-top: 1px solid #dee2e6; margin-top: 2rem; padding-top: 1rem; }
+</style>
+</head>
+<body>
+<h1>$title</h1>
+<p class="subtitle">$app_title v$version &middot; generated $generated</p>
+<h2>Inputs</h2>
+<table>$input_rows</table>
+<h2>Results</h2>
+<table>
+<tr><th>Phase</th><th>CO&#8322; (kg)</th><th>Water (L)</th><th>Energy (kWh)</th><th>Cost ($$)</th></tr>
+$result_rows
+</table>
+<p>Embodied hardware CO&#8322; (amortized): <strong>$embodied kg</strong> &middot; Lifecycle total: <strong>$lifecycle kg</strong></p>
+<div class="charts">$charts</div>
+<h2>Real-World Comparisons</h2>
+<div class="result-box"><ul>$comparisons</ul></div>
+<h2>Ethical Risk Assessment</h2>
+<div class="result-box"><strong>Score: $ethical_score/10</strong> &mdash; $ethical_explanation</div>
+<h2>Recommendations</h2>
+$recommendations
+<div class="footer">Rough estimates for educational purposes only; not a replacement for professional environmental auditing.
+Created with $app_title by $author.</div>
+</body>
+</html>
+""")
+
+ROW_TEMPLATE = Template("<tr><td>$label</td>$cells</tr>")
+RECOMMENDATION_TEMPLATE = Template(
+    '<div class="result-box recommendation-$priority"><strong>$category:</strong> $message</div>'
+)
+
+class ChartCache:
+    """SVG charts keyed by the SHA-256 of their spec, in memory and optionally on disk"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self.memory: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(spec: dict) -> str:
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get_or_render(self, spec: dict) -> str:
+        key = self.key(spec)
+        svg = self.memory.get(key)
+        path = os.path.join(self.directory, f"{key}.svg") if self.directory else None
+        if svg is None and path and os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                svg = handle.read()
+        if svg is not None:
+            self.hits += 1
+            self.memory[key] = svg
+            return svg
+
+        self.misses += 1
+        svg = bar_chart_svg(**spec)
+        self.memory[key] = svg
+        if path:
+            # Write-then-rename so concurrent workers never read a partial file
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                handle.write(svg)
+            os.replace(temp_path, path)
+        return svg
+
+def bar_chart_svg(title: str, labels: Sequence[str], series: Dict[str, Sequence[float]],
+                  width: int = 440, height: int = 260) -> str:
+    """
+    Grouped bar chart as a standalone SVG string.
+
+    Args:
+        title: Chart title
+        labels: Category labels along the x axis
+        series: Series name -> one value per label
+    """
+    colors = ["#667eea", "#764ba2", "#28a745", "#ffc107"]
+    top, bottom, left = 30, 40, 10
+    plot_height = height - top - bottom
+    max_value = max([value for values in series.values() for value in values] + [0]) or 1
+    group_width = (width - 2 * left) / max(len(labels), 1)
+    bar_width = group_width * 0.8 / max(len(series), 1)
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="Helvetica, Arial, sans-serif" font-size="11">',
+        f'<text x="{width / 2}" y="18" text-anchor="middle" font-size="13">{html.escape(title)}</text>'
+    ]
+    for index, label in enumerate(labels):
+        x0 = left + index * group_width + group_width * 0.1
+        for series_index, (name, values) in enumerate(series.items()):
+            bar_height = plot_height * max(values[index], 0) / max_value
+            x = x0 + series_index * bar_width
+            parts.append(
+                f'<rect x="{x:.1f}" y="{top + plot_height - bar_height:.1f}" width="{bar_width:.1f}" '
+                f'height="{bar_height:.1f}" fill="{colors[series_index % len(colors)]}">'
+                f'<title>{html.escape(name)}: {values[index]:,.0f}</title></rect>'
+            )
+        parts.append(
+            f'<text x="{left + (index + 0.5) * group_width:.1f}" y="{height - bottom + 16}" '
+            f'text-anchor="middle">{html.escape(label)}</text>'
+        )
+    for series_index, name in enumerate(series):
+        parts.append(
+            f'<text x="{left + series_index * 110}" y="{height - 6}" '
+            f'fill="{colors[series_index % len(colors)]}">&#9632; {html.escape(name)}</text>'
+        )
+    parts.append("</svg>")
+    return "".join(parts)
+
+class ReportRenderer:
+    """Renders ReportGenerator outputs into HTML (and optionally PDF)"""
+
+    def __init__(self, chart_cache: Optional[ChartCache] = None):
+        self.chart_cache = chart_cache or ChartCache()
+
+    def chart_specs(self, result) -> List[dict]:
+        """Chart specs equivalent to the bar charts of the Streamlit results view"""
+        return [
+            {
+                "title": "Carbon Emissions by Phase",
+                "labels": ["Training", "Inference"],
+                "series": {"CO₂ (kg)": [result.training_co2, result.inference_co2]}
+            },
+            {
+                "title": "Resource Usage Comparison",
+                "labels": ["Energy (kWh)", "Water (L)", "CO₂ (kg)"],
+                "series": {
+                    "Training": [result.training_energy, result.training_water, result.training_co2],
+                    "Inference": [result.inference_energy, result.inference_water, result.inference_co2]
+                }
+            }
+        ]
+
+    def render_html(self, title: str, input_params: CalculationInput, result=None) -> str:
+        """Self-contained HTML report for one scenario"""
+        if result is None:
+            result = ImpactCalculator.calculate_all(input_params)
+        comparisons = ReportGenerator.generate_comparisons(result)
+        recommendations = ReportGenerator.generate_recommendations(result, input_params)
+
+        input_rows = "".join(
+            ROW_TEMPLATE.substitute(label=html.escape(label), cells=f"<td>{html.escape(str(value))}</td>")
+            for label, value in input_params.to_dict().items()
+        )
+        result_rows = "".join(
+            ROW_TEMPLATE.substitute(label=phase, cells="".join(
+                f"<td>{getattr(result, f'{prefix}_{quantity}'):,.0f}</td>"
+                for quantity in ("co2", "water", "energy", "cost")
+            ))
+            for phase, prefix in (("Training", "training"), ("Inference", "inference"), ("Total", "total"))
+        )
+        comparison_items = "".join([
+            f"<li><strong>{comparisons['carbon']['car_km']:,.0f} km</strong> driven by average car</li>",
+            f"<li><strong>{comparisons['carbon']['flights_transatlantic']:.1f}</strong> transatlantic flights</li>",
+            f"<li><strong>{comparisons['carbon']['trees_year']:,.0f}</strong> trees needed for 1 year to offset</li>",
+            f"<li><strong>{comparisons['water']['bottles_500ml']:,.0f}</strong> 500ml water bottles</li>",
+            f"<li><strong>{comparisons['energy']['homes_year']:.2f}</strong> US homes powered for 1 year</li>"
+        ])
+        recommendation_blocks = "".join(
+            RECOMMENDATION_TEMPLATE.substitute(
+                priority=rec["priority"], category=html.escape(rec["category"]), message=html.escape(rec["message"])
+            )
+            for rec in recommendations
+        ) or '<div class="result-box">Your configuration shows relatively efficient resource usage.</div>'
+        charts = "".join(self.chart_cache.get_or_render(spec) for spec in self.chart_specs(result))
+
+        return PAGE_TEMPLATE.substitute(
+            title=html.escape(title),
+            app_title=Config.APP_TITLE,
+            version=Config.VERSION,
+            author=Config.AUTHOR,
+            generated=datetime.now().strftime("%Y-%m-%d %H:%M"),
+            input_rows=input_rows,
+            result_rows=result_rows,
+            embodied=f"{result.total_embodied_co2:,.0f}",
+            lifecycle=f"{result.lifecycle_co2:,.0f}",
+            charts=charts,
+            comparisons=comparison_items,
+            ethical_score=result.ethical_score,
+            ethical_explanation=html.escape(result.ethical_explanation),
+            recommendations=recommendation_blocks
+        )
+
+    @staticmethod
+    def write_pdf(html_text: str, path: str):
+        """
+        Convert an HTML report to PDF.
+
+        Raises:
+            RuntimeError: If the optional weasyprint package is not installed
+        """
+        try:
+            from weasyprint import HTML
+        except ImportError as error:
+            raise RuntimeError("PDF output needs the optional 'weasyprint' package") from error
+        HTML(string=html_text).write_pdf(path)
+
+# Per-process renderer, created once by the pool initializer
+_worker_renderer: Optional[ReportRenderer] = None
+
+def _init_worker(chart_dir: Optional[str]):
+    global _worker_renderer
+    _worker_renderer = ReportRenderer(ChartCache(chart_dir))
+
+def _safe_filename(name: str) -> str:
+    return "".join(char if char.isalnum() or char in "-_." else "_" for char in name)[:120] or "report"
+
+def _unique_filenames(names: List[str]) -> List[str]:
+    # Names that sanitize to the same file ("m/3" and "m_3", or repeats) get
+    # a -2, -3, ... suffix; compared case-insensitively for macOS/Windows
+    taken = set()
+    filenames = []
+    for name in names:
+        base = candidate = _safe_filename(name)
+        suffix = 1
+        while candidate.lower() in taken:
+            suffix += 1
+            candidate = f"{base}-{suffix}"
+        taken.add(candidate.lower())
+        filenames.append(candidate)
+    return filenames
+
+def _render_chunk(rows: List[dict], output_dir: str, pdf: bool) -> List[str]:
+    renderer = _worker_renderer or ReportRenderer()
+    paths = []
+    for row in rows:
+        name = row.pop("name")
+        input_params = CalculationInput(**{field: row[field] for field in CalculationInput.FIELDS})
+        html_text = renderer.render_html(name, input_params)
+        base = os.path.join(output_dir, row.pop("filename"))
+        with open(f"{base}.html", "w", encoding="utf-8") as handle:
+            handle.write(html_text)
+        paths.append(f"{base}.html")
+        if pdf:
+            renderer.write_pdf(html_text, f"{base}.pdf")
+            paths.append(f"{base}.pdf")
+    return paths
+
+def render_fleet(scenarios: pd.DataFrame, output_dir: str, workers: int = 0, pdf: bool = False,
+                 chart_dir: Optional[str] = None, chunk_size: int = 16) -> List[str]:
+    """
+    Render one report per scenario row.
+
+    Args:
+        scenarios: Batch input frame, optionally with a "name" column
+        output_dir: Directory for the .html (and .pdf) files
+        workers: Worker processes; 0 renders in this process
+        pdf: Also write PDFs (needs weasyprint)
+        chart_dir: Optional on-disk chart cache shared by the workers
+        chunk_size: Scenarios per task sent to a worker
+
+    Returns:
+        Paths of the written files, in scenario order; names that map to
+        the same file name get a -2, -3, ... suffix
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    records = scenarios[list(CalculationInput.FIELDS)].to_dict("records")
+    names = scenarios["name"].astype(str).tolist() if "name" in scenarios.columns else [
+        f"scenario_{index}" for index in range(len(scenarios))
+    ]
+    for record, name, filename in zip(records, names, _unique_filenames(names)):
+        record["name"] = name
+        record["filename"] = filename
+    chunks = [records[start:start + chunk_size] for start in range(0, len(records), chunk_size)]
+
+    if workers <= 0:
+        _init_worker(chart_dir)
+        return [path for chunk in chunks for path in _render_chunk(chunk, output_dir, pdf)]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(chart_dir,)) as pool:
+        results = pool.map(_render_chunk, chunks, [output_dir] * len(chunks), [pdf] * len(chunks))
+        return [path for chunk_paths in results for path in chunk_paths]
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render per-scenario HTML/PDF impact reports")
+    parser.add_argument("input", help="Scenario CSV (batch.py columns, optional 'name')")
+    parser.add_argument("-o", "--output-dir", required=True)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--pdf", action="store_true", help="Also write PDFs (needs weasyprint)")
+    parser.add_argument("--chart-cache", metavar="DIR", help="Directory for cached chart SVGs")
+    args = parser.parse_args(argv)
+
+    from batch import scenario_inputs
+    scenarios = pd.read_csv(args.input)
+    frame = scenario_inputs(scenarios)
+    if "name" in scenarios.columns:
+        frame = frame.assign(name=scenarios["name"])
+    paths = render_fleet(frame, args.output_dir, args.workers, args.pdf, args.chart_cache)
+    print(f"Wrote {len(paths)} files to {args.output_dir}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+# result_cache.py - OPTIONAL: Persistent calculation result cache
+"""
+Disk-backed result cache for AI Model Eco & Ethics Calculator
+Stores single-scenario results (ImpactCalculator.calculate_cached) in SQLite
+keyed by a canonical hash of the input values and a config version, so
+identical scenarios are computed once across app restarts and worker
+processes. Batches skip the cache: the vectorized calculate_batch is cheaper
+than looking its rows up.
+
+Keys are 128-bit SHA-256 prefixes of the version and the canonicalized input
+values. Result fields are stored as typed SQLite columns (REAL floats are
+bit-exact), not encoded blobs.
+
+SQLite runs in WAL mode, so several processes can read while one writes;
+writers wait up to `timeout` seconds for the lock. Each process (and each
+fork) opens its own connection. Reads only write back the LRU access time
+of entries not touched for `touch_interval` seconds, so repeated hits stay
+read-only.
+"""
+
+import hashlib
+import json
+import numbers
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+_KEY_COLUMNS = ("k1", "k2")
+
+def fingerprint(*parts: Any) -> str:
+    """Short stable hash of JSON-serializable parts, e.g. the config a result depends on"""
+    text = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+def file_digest(path: Optional[str]) -> Optional[str]:
+    """SHA-256 of a file's contents, None without a path"""
+    if not path:
+        return None
+    with open(path, "rb") as handle:
+        return hashlib.sha256(handle.read()).hexdigest()
+
+def _canonical(value: Any) -> str:
+    # 70, 70.0 and np.float64(70) are the same input, and so are 0.0 and -0.0
+    if isinstance(value, (numbers.Real, np.bool_)):
+        return repr(float(value) + 0.0)
+    return str(value)
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+class ResultCache:
+    """SQLite cache of result rows keyed by input hash"""
+
+    def __init__(self, path: str, columns: Sequence[str], version: str = "",
+                 ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None,
+                 evict_every: int = 10000, timeout: float = 30.0, touch_interval: float = 60.0):
+        """
+        Args:
+            path: SQLite database file, created if missing
+            columns: Names of the stored result fields, in order
+            version: Config/catalog version; seeds every key, and rows of
+                other versions are dropped by evict()
+            ttl_seconds: Entries older than this count as misses and are evicted
+            max_entries: Least recently used entries beyond this are evicted
+            evict_every: Run evict() automatically after this many puts
+            timeout: Seconds to wait for a database lock held by another process
+            touch_interval: A hit refreshes the LRU access time only when it
+                is older than this, so most reads write nothing
+        """
+        self.path = path
+        self.columns = list(columns)
+        self.version = version
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self.timeout = timeout
+        self.touch_interval = touch_interval
+        self.hits = 0
+        self.misses = 0
+        self.puts = 0
+        self.evictions = 0
+        self._puts_since_evict = 0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._connection = None
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection must not cross a fork; reopen in the child
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            expected = list(_KEY_COLUMNS) + ["version", "created", "accessed"] + self.columns
+            existing = [row[1] for row in connection.execute("PRAGMA table_info(results)")]
+            if existing and existing != expected:
+                # A cache of other result fields (or the old JSON layout) is rebuilt
+                connection.execute("DROP TABLE results")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results (k1 INTEGER, k2 INTEGER, version TEXT, created REAL, "
+                f"accessed REAL, {', '.join(_quote(column) for column in self.columns)}, "
+                "PRIMARY KEY (k1, k2)) WITHOUT ROWID"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def key(self, values: Sequence[Any]) -> Tuple[int, int]:
+        """Canonical key of one input given as a sequence of field values, as two signed 64-bit halves"""
+        text = json.dumps([self.version] + [_canonical(value) for value in values])
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return (int.from_bytes(digest[:8], "little", signed=True),
+                int.from_bytes(digest[8:16], "little", signed=True))
+
+    def get(self, key: Tuple[int, int]) -> Optional[list]:
+        """Stored values of one key in `columns` order, None on a miss or an expired entry"""
+        now = time.time()
+        oldest = now - self.ttl_seconds if self.ttl_seconds is not None else float("-inf")
+        columns = ", ".join(_quote(column) for column in self.columns)
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                f"SELECT accessed, {columns} FROM results WHERE k1 = ? AND k2 = ? AND created >= ?",
+                (*key, oldest)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if row[0] < now - self.touch_interval:
+                connection.execute("UPDATE results SET accessed = ? WHERE k1 = ? AND k2 = ?", (now, *key))
+                connection.commit()
+        return list(row[1:])
+
+    def put(self, key: Tuple[int, int], values: Sequence[Any]):
+        """Store one row of `columns` values; an existing key is replaced"""
+        now = time.time()
+        placeholders = ", ".join("?" * (5 + len(self.columns)))
+        with self._lock:
+            connection = self._connect()
+            connection.execute(f"INSERT OR REPLACE INTO results VALUES ({placeholders})",
+                               (*key, self.version, now, now, *values))
+            connection.commit()
+            self.puts += 1
+            self._puts_since_evict += 1
+        if self._puts_since_evict >= self.evict_every:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Drop expired entries, entries of other versions and, above
+        max_entries, the least recently used ones.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            connection = self._connect()
+            removed = connection.execute("DELETE FROM results WHERE version != ?", (self.version,)).rowcount
+            if self.ttl_seconds is not None:
+                removed += connection.execute(
+                    "DELETE FROM results WHERE created < ?", (time.time() - self.ttl_seconds,)
+                ).rowcount
+            if self.max_entries is not None:
+                (count,) = connection.execute("SELECT COUNT(*) FROM results").fetchone()
+                if count > self.max_entries:
+                    removed += connection.execute(
+                        "DELETE FROM results WHERE (k1, k2) IN "
+                        "(SELECT k1, k2 FROM results ORDER BY accessed LIMIT ?)",
+                        (count - self.max_entries,)
+                    ).rowcount
+            connection.commit()
+            self.evictions += removed
+            self._puts_since_evict = 0
+        return removed
+
+    def clear(self):
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM results")
+            connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of this process plus the current entry count"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "puts": self.puts,
+            "evictions": self.evictions,
+            "entries": len(self)
+        }
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
@@ -0,0 +1,187 @@
+# rules.py - OPTIONAL: Declarative recommendation rules
+"""
+Recommendation rule engine for AI Model Eco & Ethics Calculator
+Rules are loaded from JSON data files and evaluated either against one
+feature row (dict) or a whole feature table (column name -> array), where
+each rule compiles to one vectorized boolean mask.
+
+Rule file format:
+    {"rules": [{"id": "pue_high", "priority": "medium", "category": "Infrastructure",
+                "message": "Data center PUE is high ...",
+                "when": [{"field": "pue", "op": ">", "value": 2.0}]}]}
+
+All conditions in "when" must hold. Messages may reference feature columns
+as str.format placeholders, e.g. "{location_renewable_pct}%".
+"""
+
+import json
+import operator
+import string
+from typing import Any, Dict, Iterable, List, Mapping
+
+import numpy as np
+import pandas as pd
+
+# Comparison operators allowed in rule conditions
+OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne
+}
+
+class Condition:
+    """Single `field op value` comparison"""
+
+    def __init__(self, field: str, op: str, value: Any):
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator '{op}' (expected one of {', '.join(OPERATORS)})")
+        self.field = field
+        self.op = op
+        self.value = value
+        self._compare = OPERATORS[op]
+
+    def matches(self, row: Mapping[str, Any]) -> bool:
+        return bool(self._compare(row[self.field], self.value))
+
+    def mask(self, table: Mapping[str, np.ndarray]) -> np.ndarray:
+        return np.asarray(self._compare(np.asarray(table[self.field]), self.value), dtype=bool)
+
+class RecommendationRule:
+    """One recommendation and the conditions that trigger it"""
+
+    def __init__(self, rule_id: str, priority: str, category: str, message: str,
+                 conditions: List[Condition]):
+        self.rule_id = rule_id
+        self.priority = priority
+        self.category = category
+        self.message = message
+        self.conditions = conditions
+        # Feature columns referenced by the message template
+        self.message_fields = [
+            name for _, name, _, _ in string.Formatter().parse(message) if name
+        ]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RecommendationRule":
+        """
+        Build a rule from its JSON representation.
+
+        Raises:
+            ValueError: If a required key is missing or an operator is unknown
+        """
+        missing = [key for key in ("id", "priority", "category", "message", "when") if key not in data]
+        if missing:
+            raise ValueError(f"Rule {data.get('id', '?')} is missing: {', '.join(missing)}")
+        conditions = [Condition(cond["field"], cond["op"], cond["value"]) for cond in data["when"]]
+        return cls(data["id"], data["priority"], data["category"], data["message"], conditions)
+
+    def matches(self, row: Mapping[str, Any]) -> bool:
+        return all(condition.matches(row) for condition in self.conditions)
+
+    def mask(self, table: Mapping[str, np.ndarray], n_rows: int) -> np.ndarray:
+        """Boolean mask of rows that trigger this rule"""
+        result = np.ones(n_rows, dtype=bool)
+        for condition in self.conditions:
+            result &= condition.mask(table)
+        return result
+
+    def render(self, row: Mapping[str, Any]) -> Dict[str, str]:
+        """Recommendation dict in the shape ReportGenerator has always returned"""
+        return {
+            "priority": self.priority,
+            "category": self.category,
+            "message": self.message.format(**row) if self.message_fields else self.message
+        }
+
+    def render_bulk(self, table: Mapping[str, np.ndarray], rows: np.ndarray) -> np.ndarray:
+        """Messages for the given row positions, formatting each distinct value combination once"""
+        if not self.message_fields:
+            return np.full(len(rows), self.message, dtype=object)
+        referenced = pd.DataFrame({name: np.asarray(table[name])[rows] for name in self.message_fields})
+        codes, uniques = pd.MultiIndex.from_frame(referenced).factorize()
+        messages = np.array(
+            [self.message.format(**dict(zip(self.message_fields, values))) for values in uniques],
+            dtype=object
+        )
+        return messages[codes]
+
+class RuleSet:
+    """Ordered collection of recommendation rules"""
+
+    def __init__(self, rules: Iterable[RecommendationRule]):
+        self.rules = list(rules)
+        ids = [rule.rule_id for rule in self.rules]
+        duplicates = sorted({rule_id for rule_id in ids if ids.count(rule_id) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate rule ids: {', '.join(duplicates)}")
+
+    @classmethod
+    def from_file(cls, path: str) -> "RuleSet":
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        return cls(RecommendationRule.from_dict(rule) for rule in data["rules"])
+
+    @classmethod
+    def from_files(cls, paths: Iterable[str]) -> "RuleSet":
+        """Concatenate rule files in order"""
+        rules = []
+        for path in paths:
+            rules.extend(cls.from_file(path).rules)
+        return cls(rules)
+
+    def apply(self, row: Mapping[str, Any]) -> List[Dict[str, str]]:
+        """Recommendations for a single feature row, in rule order"""
+        return [rule.render(row) for rule in self.rules if rule.matches(row)]
+
+    def evaluate(self, table: Mapping[str, np.ndarray], index=None) -> pd.DataFrame:
+        """
+        Evaluate every rule over a feature table.
+
+        Args:
+            table: Column name -> equally long arrays
+            index: Optional index for the returned frame
+
+        Returns:
+            Boolean frame, one row per table row and one column per rule id
+        """
+        n_rows = len(next(iter(table.values()))) if table else 0
+        masks = {rule.rule_id: rule.mask(table, n_rows) for rule in self.rules}
+        return pd.DataFrame(masks, index=index, columns=[rule.rule_id for rule in self.rules])
+
+    def apply_bulk(self, table: Mapping[str, np.ndarray], index=None) -> pd.DataFrame:
+        """
+        Recommendations for every row of a feature table in long format.
+
+        Rows are ordered by table row, then rule order, so grouping by "row"
+        yields exactly what apply() returns for each row.
+
+        Returns:
+            Frame with columns row, rule_id, priority, category, message
+        """
+        n_rows = len(next(iter(table.values()))) if table else 0
+        positions, rule_order, messages = [], [], []
+        for order, rule in enumerate(self.rules):
+            rows = np.flatnonzero(rule.mask(table, n_rows))
+            positions.append(rows)
+            rule_order.append(np.full(len(rows), order))
+            messages.append(rule.render_bulk(table, rows))
+
+        positions = np.concatenate(positions) if positions else np.empty(0, dtype=int)
+        rule_order = np.concatenate(rule_order) if rule_order else np.empty(0, dtype=int)
+        messages = np.concatenate(messages) if messages else np.empty(0, dtype=object)
+        order = np.lexsort((rule_order, positions))
+
+        rule_ids = np.array([rule.rule_id for rule in self.rules], dtype=object)
+        priorities = np.array([rule.priority for rule in self.rules], dtype=object)
+        categories = np.array([rule.category for rule in self.rules], dtype=object)
+        row_labels = np.asarray(index)[positions] if index is not None else positions
+        return pd.DataFrame({
+            "row": row_labels[order],
+            "rule_id": rule_ids[rule_order[order]],
+            "priority": priorities[rule_order[order]],
+            "category": categories[rule_order[order]],
+            "message": messages[order]
+        })
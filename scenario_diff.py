@@ -0,0 +1,167 @@
+# scenario_diff.py - OPTIONAL: Before/after scenario comparison
+"""
+Scenario diff engine for AI Model Eco & Ethics Calculator
+Computes the change in CO2/cost/water/energy between two CalculationInputs
+and attributes it to the changed fields with Shapley values.
+
+For a pair with k changed fields every one of the 2^k mixes of "before" and
+"after" values is needed. Pairs are grouped by which fields changed and all
+mixes of all pairs go through a single ImpactCalculator.calculate_batch call.
+"""
+
+from math import factorial
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app import CalculationInput, ImpactCalculator
+
+DEFAULT_METRICS = ("total_co2", "total_cost", "total_water", "total_energy")
+
+class ScenarioDiff:
+    """Delta and Shapley attribution between before/after scenarios"""
+
+    @staticmethod
+    def _shapley_weights(k: int) -> np.ndarray:
+        """Weight of a coalition of size s (0..k-1) when adding one more player"""
+        return np.array([factorial(s) * factorial(k - s - 1) / factorial(k) for s in range(k)])
+
+    @staticmethod
+    def _changed(before: pd.DataFrame, after: pd.DataFrame) -> np.ndarray:
+        """n x len(FIELDS) boolean matrix of fields that differ per pair"""
+        return np.column_stack([
+            before[field].to_numpy() != after[field].to_numpy() for field in CalculationInput.FIELDS
+        ])
+
+    @classmethod
+    def diff_batch(cls, before: pd.DataFrame, after: pd.DataFrame,
+                   metrics: Sequence[str] = DEFAULT_METRICS) -> pd.DataFrame:
+        """
+        Delta and per-field attribution for row-aligned before/after frames.
+
+        Args:
+            before: Batch input frame (CalculationInput.FIELDS columns)
+            after: Same length, row i is the proposal for before row i
+            metrics: CalculationResult fields to attribute
+
+        Returns:
+            Frame indexed like `before` with (metric, component) columns;
+            components are "before", "after", "delta" and one per input
+            field. Field contributions of a row sum to its delta.
+
+        Raises:
+            ValueError: If the frames differ in length
+        """
+        if len(before) != len(after):
+            raise ValueError(f"before has {len(before)} rows, after has {len(after)}")
+        fields = list(CalculationInput.FIELDS)
+        index = before.index
+        before = before[fields].reset_index(drop=True)
+        after = after[fields].reset_index(drop=True)
+        n_pairs = len(before)
+
+        changed = cls._changed(before, after)
+        # Group pairs by which fields changed; each group shares its subset layout
+        pattern = changed.astype(np.int64) @ (1 << np.arange(len(fields), dtype=np.int64))
+        groups = []
+        row_parts, take_parts = [], []
+        offset = 0
+        for code in np.unique(pattern):
+            rows = np.flatnonzero(pattern == code)
+            players = [j for j in range(len(fields)) if code >> j & 1]
+            n_subsets = 1 << len(players)
+            subsets = np.arange(n_subsets)
+            # take_after[s, j]: field j uses the "after" value in subset s
+            take_after = np.zeros((n_subsets, len(fields)), dtype=bool)
+            for bit, j in enumerate(players):
+                take_after[:, j] = (subsets >> bit) & 1
+            row_parts.append(np.repeat(rows, n_subsets))
+            take_parts.append(np.tile(take_after, (len(rows), 1)))
+            groups.append((rows, players, offset))
+            offset += len(rows) * n_subsets
+
+        row_index = np.concatenate(row_parts) if row_parts else np.empty(0, dtype=int)
+        take = np.concatenate(take_parts) if take_parts else np.empty((0, len(fields)), dtype=bool)
+        mixes = pd.DataFrame({
+            field: np.where(
+                take[:, j],
+                after[field].to_numpy()[row_index],
+                before[field].to_numpy()[row_index]
+            )
+            for j, field in enumerate(fields)
+        })
+        values = ImpactCalculator.calculate_batch(mixes)
+
+        columns = {}
+        for metric in metrics:
+            metric_values = values[metric].to_numpy(dtype=float)
+            before_value = np.empty(n_pairs)
+            after_value = np.empty(n_pairs)
+            contributions = np.zeros((n_pairs, len(fields)))
+            for rows, players, start in groups:
+                k = len(players)
+                n_subsets = 1 << k
+                v = metric_values[start:start + len(rows) * n_subsets].reshape(len(rows), n_subsets)
+                before_value[rows] = v[:, 0]
+                after_value[rows] = v[:, -1]
+                if not k:
+                    continue
+                weights = cls._shapley_weights(k)
+                subsets = np.arange(n_subsets)
+                sizes = np.array([bin(s).count("1") for s in subsets])
+                for bit, j in enumerate(players):
+                    without = subsets[(subsets >> bit & 1) == 0]
+                    marginal = v[:, without | (1 << bit)] - v[:, without]
+                    contributions[rows, j] = marginal @ weights[sizes[without]]
+            columns[(metric, "before")] = before_value
+            columns[(metric, "after")] = after_value
+            columns[(metric, "delta")] = after_value - before_value
+            for j, field in enumerate(fields):
+                columns[(metric, field)] = contributions[:, j]
+
+        result = pd.DataFrame(columns, index=index)
+        result.columns = pd.MultiIndex.from_tuples(result.columns, names=["metric", "component"])
+        return result
+
+    @classmethod
+    def diff(cls, before: CalculationInput, after: CalculationInput,
+             metrics: Sequence[str] = DEFAULT_METRICS) -> Dict[str, dict]:
+        """
+        Delta report for one before/after pair.
+
+        Returns:
+            {metric: {"before", "after", "delta", "attribution": {field: contribution}}}
+            with only the changed fields listed in "attribution", largest
+            absolute contribution first
+        """
+        row = cls.diff_batch(
+            CalculationInput.to_frame([before]), CalculationInput.to_frame([after]), metrics
+        ).iloc[0]
+        changed = [
+            field for field in CalculationInput.FIELDS if getattr(before, field) != getattr(after, field)
+        ]
+        report = {}
+        for metric in metrics:
+            attribution = {field: float(row[(metric, field)]) for field in changed}
+            report[metric] = {
+                "before": float(row[(metric, "before")]),
+                "after": float(row[(metric, "after")]),
+                "delta": float(row[(metric, "delta")]),
+                "attribution": dict(sorted(attribution.items(), key=lambda item: -abs(item[1])))
+            }
+        return report
+
+    @staticmethod
+    def format_report(report: Dict[str, dict], labels: Optional[Dict[str, str]] = None) -> str:
+        """Plain-text delta breakdown, e.g. for logs or review comments"""
+        labels = labels or dict(zip(
+            CalculationInput.FIELDS, CalculationInput(*CalculationInput.FIELDS).to_dict().keys()
+        ))
+        lines = []
+        for metric, data in report.items():
+            lines.append(f"{metric}: {data['before']:,.2f} -> {data['after']:,.2f} ({data['delta']:+,.2f})")
+            for field, contribution in data["attribution"].items():
+                share = contribution / data["delta"] * 100 if data["delta"] else 0.0
+                lines.append(f"  {labels.get(field, field)}: {contribution:+,.2f} ({share:.1f}%)")
+        return "\n".join(lines)
@@ -0,0 +1,306 @@
+# telemetry.py - OPTIONAL: Measured-power ingestion
+"""
+Telemetry ingestion for AI Model Eco & Ethics Calculator
+Computes the actual footprint of jobs that already ran from per-node power
+logs (NVML-style CSV or JSON lines with a timestamp and a power reading)
+instead of estimating energy from TDP.
+
+Logs are read in chunks and integrated with the trapezoidal rule per
+(job, node) series. Only the last sample of every series and one row of
+running totals per job are kept between chunks, so memory does not grow
+with the size of the log.
+
+With a price catalog (ImpactCalculator.PRICING) and the job locations
+known up front, every interval's energy is priced at the time-of-use
+tariff over that interval. Timestamps are read as the location's local
+time, like the tariffs.
+
+Usage:
+    python telemetry.py power.csv --jobs jobs.csv -o footprint.csv
+    python telemetry.py power.jsonl --location "EU-North (Finland)" --hardware "NVIDIA H100" --pue 1.2 -o out.csv
+"""
+
+import argparse
+import sys
+from typing import Callable, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from app import CalculationResult, Config, ImpactCalculator
+
+# Default column names of the telemetry logs
+TELEMETRY_COLUMNS = {"job": "job_id", "node": "node_id", "timestamp": "timestamp", "power": "power_w"}
+DEFAULT_CHUNKSIZE = 1000000
+_SUMS = ["energy_wh", "device_seconds", "samples", "skipped_intervals", "energy_cost_wh"]
+
+def read_telemetry(path: str, chunksize: int = DEFAULT_CHUNKSIZE,
+                   columns: Optional[Dict[str, str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV or JSON-lines (.jsonl) telemetry log in chunks.
+
+    Yields:
+        Frames with "job", "node", "timestamp" (epoch seconds) and "power" columns.
+        Logs without a node column are treated as a single node per job.
+    """
+    columns = dict(TELEMETRY_COLUMNS, **(columns or {}))
+    if path.endswith(".jsonl"):
+        reader = pd.read_json(path, lines=True, chunksize=chunksize)
+    else:
+        reader = pd.read_csv(path, chunksize=chunksize)
+
+    for chunk in reader:
+        missing = [name for key, name in columns.items() if key != "node" and name not in chunk.columns]
+        if missing:
+            raise KeyError(f"Missing telemetry columns: {', '.join(missing)}")
+        timestamps = chunk[columns["timestamp"]]
+        if pd.api.types.is_numeric_dtype(timestamps):
+            seconds = timestamps.to_numpy(dtype=float)
+        else:
+            seconds = pd.to_datetime(timestamps, utc=True).to_numpy(dtype="datetime64[ns]").astype(np.int64) / 1e9
+        yield pd.DataFrame({
+            "job": chunk[columns["job"]].to_numpy(),
+            "node": chunk[columns["node"]].to_numpy() if columns["node"] in chunk.columns else 0,
+            "timestamp": seconds,
+            "power": chunk[columns["power"]].to_numpy(dtype=float)
+        })
+
+class TelemetryIntegrator:
+    """Running trapezoidal integration of power samples per job"""
+
+    def __init__(self, max_gap_s: Optional[float] = None,
+                 locations: Optional[Callable[[np.ndarray], np.ndarray]] = None, pricing=None):
+        """
+        Args:
+            max_gap_s: Intervals longer than this (seconds) are treated as
+                missing data and not integrated; None integrates every gap
+            locations: Maps an array of job ids to their Config.LOCATIONS
+                keys (None where unknown); enables time-of-use pricing
+            pricing: PriceCatalog for the tariffs, default ImpactCalculator.PRICING
+        """
+        self.max_gap_s = max_gap_s
+        self.locations = locations
+        self.pricing = pricing if pricing is not None else ImpactCalculator.PRICING
+        # Last sample of every (job, node) series seen so far
+        self._carry = pd.DataFrame(columns=["job", "node", "timestamp", "power"])
+        self._totals = pd.DataFrame(columns=_SUMS + ["start", "end"], dtype=float)
+
+    def update(self, chunk: pd.DataFrame):
+        """Integrate one chunk of samples (job, node, timestamp, power)"""
+        if chunk.empty:
+            return
+        frame = pd.concat([self._carry, chunk], ignore_index=True) if len(self._carry) else chunk
+        is_new = np.ones(len(frame), dtype=bool)
+        is_new[:len(self._carry)] = False
+        order = np.lexsort((frame["timestamp"].to_numpy(), frame["node"].to_numpy(), frame["job"].to_numpy()))
+        frame = frame.iloc[order].reset_index(drop=True)
+        is_new = is_new[order]
+
+        job = frame["job"].to_numpy()
+        node = frame["node"].to_numpy()
+        timestamp = frame["timestamp"].to_numpy(dtype=float)
+        power = frame["power"].to_numpy(dtype=float)
+
+        # Interval i runs from sample i-1 to sample i of the same series
+        same_series = np.zeros(len(frame), dtype=bool)
+        same_series[1:] = (job[1:] == job[:-1]) & (node[1:] == node[:-1])
+        dt = np.zeros(len(frame))
+        dt[1:] = np.diff(timestamp)
+        mean_power = np.zeros(len(frame))
+        mean_power[1:] = (power[1:] + power[:-1]) / 2
+        valid = same_series & (dt >= 0) & np.isfinite(mean_power)
+        if self.max_gap_s is not None:
+            valid &= dt <= self.max_gap_s
+        skipped = same_series & ~valid
+        dt = np.where(valid, dt, 0.0)
+        energy_wh = mean_power * dt / 3600
+
+        by_job = pd.DataFrame({
+            "energy_wh": energy_wh,
+            "device_seconds": dt,
+            "samples": is_new.astype(float),
+            "skipped_intervals": skipped.astype(float),
+            "energy_cost_wh": self._interval_prices(job, timestamp, dt) * energy_wh,
+            "start": np.where(is_new, timestamp, np.nan),
+            "end": np.where(is_new, timestamp, np.nan)
+        }).groupby(job, sort=False)
+        # min_count keeps unpriced jobs NaN instead of a zero cost
+        per_job = by_job[_SUMS].sum(min_count=1).join(by_job["start"].min()).join(by_job["end"].max())
+        combined = pd.concat([self._totals, per_job]) if len(self._totals) else per_job
+        grouped = combined.groupby(level=0, sort=False)
+        self._totals = grouped[_SUMS].sum(min_count=1).join(grouped["start"].min()).join(grouped["end"].max())
+
+        last = np.ones(len(frame), dtype=bool)
+        last[:-1] = ~same_series[1:]
+        self._carry = frame[last].reset_index(drop=True)
+
+    def _interval_prices(self, job: np.ndarray, timestamp: np.ndarray, dt: np.ndarray) -> np.ndarray:
+        # Mean tariff price ($/kWh) of interval i, which runs from timestamp[i] - dt[i];
+        # NaN without pricing, so the job falls back to the location's mean price
+        prices = np.full(len(job), np.nan)
+        if self.pricing is None or self.locations is None or not len(job):
+            return prices
+        locations = np.asarray(self.locations(job), dtype=object)
+        known = pd.Series(locations).isin(list(self.pricing.tariffs)).to_numpy()
+        if known.any():
+            starts = np.round((timestamp[known] - dt[known]) * 1e9).astype(np.int64).astype("datetime64[ns]")
+            prices[known] = self.pricing.interval_prices(locations[known], starts, dt[known] / 3600)
+        return prices
+
+    def totals(self) -> pd.DataFrame:
+        """
+        Measured totals per job.
+
+        Returns:
+            Frame indexed by job with it_energy_kwh, device_hours, samples,
+            skipped_intervals, start and end (epoch seconds) and
+            it_energy_cost (time-of-use $ for the IT energy, NaN if unpriced)
+        """
+        totals = self._totals.copy()
+        totals.index.name = "job"
+        totals["it_energy_kwh"] = totals.pop("energy_wh") / 1000
+        totals["device_hours"] = totals.pop("device_seconds") / 3600
+        totals["it_energy_cost"] = totals.pop("energy_cost_wh") / 1000
+        totals[["samples", "skipped_intervals"]] = totals[["samples", "skipped_intervals"]].astype(np.int64)
+        return totals[["it_energy_kwh", "device_hours", "samples", "skipped_intervals", "start", "end",
+                       "it_energy_cost"]]
+
+def measured_footprint(totals: pd.DataFrame, jobs: Optional[pd.DataFrame] = None,
+                       defaults: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Turn measured energy into a CalculationResult-compatible frame.
+
+    Facility energy is IT energy x PUE; CO2, water and energy cost use the
+    location catalog, compute cost and embodied carbon the measured device
+    hours. Jobs priced interval by interval (it_energy_cost) pay that
+    time-of-use cost x PUE for energy instead of the mean price. Each job's
+    values go to its phase ("training" by default or "inference"), the
+    other phase is zero. The ethical score is only filled in when the job
+    metadata has params_b and model_type.
+
+    Args:
+        totals: Output of TelemetryIntegrator.totals()
+        jobs: Metadata indexed by job: location, hardware, pue and optionally
+            phase, params_b, model_type
+        defaults: Values used for jobs or columns missing from `jobs`
+
+    Returns:
+        Frame indexed by job with CalculationResult.FIELDS columns followed
+        by the measured columns of `totals`
+
+    Raises:
+        KeyError: If a job has no location/hardware/pue or an unknown one
+    """
+    meta = jobs.reindex(totals.index) if jobs is not None else pd.DataFrame(index=totals.index)
+    for column, value in dict({"phase": "training"}, **(defaults or {})).items():
+        meta[column] = meta[column].fillna(value) if column in meta.columns else value
+    for column in ("location", "hardware", "pue"):
+        if column not in meta.columns or meta[column].isna().any():
+            raise KeyError(f"No {column} for some jobs; pass it in the job metadata or as a default")
+    unknown_phase = set(meta["phase"]) - {"training", "inference"}
+    if unknown_phase:
+        raise KeyError(f"Unknown phase: {', '.join(sorted(map(str, unknown_phase)))}")
+
+    device_hours = totals["device_hours"].to_numpy(dtype=float)
+    energy = totals["it_energy_kwh"].to_numpy(dtype=float) * meta["pue"].to_numpy(dtype=float)
+    carbon_intensity = ImpactCalculator._lookup(meta["location"], Config.LOCATIONS, "carbon")
+    water_per_kwh = ImpactCalculator._lookup(meta["location"], Config.LOCATIONS, "water")
+    cost_per_hour, energy_price = ImpactCalculator._price_arrays(meta["hardware"], meta["location"])
+    embodied_rate = np.array(list(ImpactCalculator.EMBODIED_CO2_PER_HOUR.values()))[
+        ImpactCalculator._codes(meta["hardware"], Config.HARDWARE)
+    ]
+
+    energy_cost = energy * energy_price
+    if "it_energy_cost" in totals.columns:
+        time_of_use = totals["it_energy_cost"].to_numpy(dtype=float) * meta["pue"].to_numpy(dtype=float)
+        energy_cost = np.where(np.isnan(time_of_use), energy_cost, time_of_use)
+
+    measured = {
+        "co2": energy * carbon_intensity / 1000,
+        "energy": energy,
+        "water": energy * water_per_kwh,
+        "cost": device_hours * cost_per_hour + energy_cost,
+        "embodied_co2": device_hours * embodied_rate
+    }
+    out = {}
+    for phase in ("training", "inference"):
+        in_phase = (meta["phase"] == phase).to_numpy()
+        for quantity, values in measured.items():
+            out[f"{phase}_{quantity}"] = np.where(in_phase, values, 0.0)
+    for quantity in measured:
+        out[f"total_{quantity}"] = out[f"training_{quantity}"] + out[f"inference_{quantity}"]
+    out["lifecycle_co2"] = out["total_co2"] + out["total_embodied_co2"]
+
+    scores = np.full(len(meta), np.nan)
+    explanations = np.full(len(meta), "", dtype=object)
+    if {"params_b", "model_type"} <= set(meta.columns):
+        known = (meta["params_b"].notna() & meta["model_type"].notna()).to_numpy()
+        for position in np.flatnonzero(known):
+            scores[position] = ImpactCalculator.calculate_ethical_risk(
+                meta["params_b"].iloc[position], meta["model_type"].iloc[position]
+            )
+            explanations[position] = ImpactCalculator.get_ethical_explanation(scores[position])
+    out["ethical_score"] = scores
+    out["ethical_explanation"] = explanations
+
+    result = pd.DataFrame({field: out[field] for field in CalculationResult.FIELDS}, index=totals.index)
+    return result.join(totals)
+
+def to_calculation_results(footprint: pd.DataFrame) -> Dict[object, CalculationResult]:
+    """CalculationResult objects per job, e.g. for ReportGenerator"""
+    results = {}
+    for job, row in footprint.iterrows():
+        result = CalculationResult()
+        for field in CalculationResult.FIELDS:
+            setattr(result, field, row[field])
+        results[job] = result
+    return results
+
+def job_locations(jobs: Optional[pd.DataFrame] = None,
+                  defaults: Optional[dict] = None) -> Callable[[np.ndarray], np.ndarray]:
+    """Location lookup for TelemetryIntegrator from job metadata and defaults"""
+    known = jobs["location"].dropna() if jobs is not None and "location" in jobs.columns else pd.Series(dtype=object)
+    default = (defaults or {}).get("location")
+
+    def locations(job: np.ndarray) -> np.ndarray:
+        found = pd.Series(job).map(known)
+        return (found.fillna(default) if default is not None else found).to_numpy(dtype=object)
+    return locations
+
+def ingest(path: str, jobs: Optional[pd.DataFrame] = None, defaults: Optional[dict] = None,
+           chunksize: int = DEFAULT_CHUNKSIZE, max_gap_s: Optional[float] = None,
+           columns: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """Stream a telemetry log and return the measured footprint per job"""
+    integrator = TelemetryIntegrator(max_gap_s, job_locations(jobs, defaults))
+    for chunk in read_telemetry(path, chunksize, columns):
+        integrator.update(chunk)
+    return measured_footprint(integrator.totals(), jobs, defaults)
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measured footprint from power telemetry logs")
+    parser.add_argument("input", help="Telemetry log (.csv or .jsonl)")
+    parser.add_argument("-o", "--output", required=True, help="Result CSV")
+    parser.add_argument("--jobs", metavar="PATH",
+                        help="Job metadata CSV: job_id, location, hardware, pue[, phase, params_b, model_type]")
+    parser.add_argument("--location", choices=list(Config.LOCATIONS))
+    parser.add_argument("--hardware", choices=list(Config.HARDWARE))
+    parser.add_argument("--pue", type=float)
+    parser.add_argument("--phase", choices=["training", "inference"])
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--max-gap", type=float, metavar="SECONDS",
+                        help="Skip intervals between samples longer than this")
+    args = parser.parse_args(argv)
+
+    jobs = pd.read_csv(args.jobs).set_index("job_id") if args.jobs else None
+    defaults = {
+        column: value for column, value in
+        (("location", args.location), ("hardware", args.hardware), ("pue", args.pue), ("phase", args.phase))
+        if value is not None
+    }
+    footprint = ingest(args.input, jobs, defaults, args.chunksize, args.max_gap)
+    footprint.to_csv(args.output, index_label="job_id")
+    print(f"Wrote measured footprint for {len(footprint)} jobs to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
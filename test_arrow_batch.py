@@ -0,0 +1,117 @@
+# test_arrow_batch.py - OPTIONAL: Unit tests
+"""
+Unit tests for the Arrow batch interface
+Run with: pytest test_arrow_batch.py
+"""
+
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from app import CalculationResult, Config, ImpactCalculator
+from arrow_batch import calculate_arrow, catalog_codes, iter_calculate_arrow, main, numeric_view
+from golden import generate_corpus
+
+@pytest.fixture(scope="module")
+def scenarios():
+    return generate_corpus(1000, seed=21)
+
+def to_frame(results) -> pd.DataFrame:
+    frame = results.to_pandas()
+    frame["ethical_explanation"] = frame["ethical_explanation"].astype(object)
+    return frame
+
+class TestArrowColumns:
+    """Test cases for zero-copy views and catalog codes"""
+    
+    def test_float_columns_are_zero_copy(self):
+        column = pa.array([1.0, 2.5, 70.0])
+        view = numeric_view(column, "params_b")
+        
+        assert view.ctypes.data == column.buffers()[1].address
+        assert list(numeric_view(pa.array([1, 2], pa.int32()), "params_b")) == [1.0, 2.0]
+        with pytest.raises(ValueError):
+            numeric_view(pa.array([1.0, None]), "params_b")
+    
+    def test_dictionary_and_plain_catalog_columns(self):
+        values = ["EU-North (Finland)", "US-West (Oregon)", "EU-North (Finland)"]
+        plain = catalog_codes(pa.array(values), "location")
+        
+        assert list(plain) == [4, 0, 4]
+        assert list(catalog_codes(pa.array(values).dictionary_encode(), "location")) == [4, 0, 4]
+        with pytest.raises(KeyError, match="Mars"):
+            catalog_codes(pa.array(["Mars", "US-West (Oregon)"]).dictionary_encode(), "location")
+
+class TestCalculateArrow:
+    """Test cases for Arrow in, Arrow out"""
+    
+    def test_table_matches_calculate_batch(self, scenarios):
+        """Bit-exact with calculate_batch, across chunk boundaries and dictionary columns"""
+        table = pa.Table.from_pandas(scenarios, preserve_index=False)
+        for name in ("location", "hardware"):
+            table = table.set_column(table.schema.get_field_index(name), name, table.column(name).dictionary_encode())
+        results = calculate_arrow(table, chunk_rows=128)
+        
+        assert isinstance(results, pa.Table)
+        assert results.column_names == list(CalculationResult.FIELDS)
+        assert pa.types.is_dictionary(results.schema.field("ethical_explanation").type)
+        pd.testing.assert_frame_equal(to_frame(results), ImpactCalculator.calculate_batch(scenarios))
+    
+    def test_record_batches_stream(self, scenarios):
+        batches = pa.Table.from_pandas(scenarios, preserve_index=False).to_batches(max_chunksize=300)
+        results = list(iter_calculate_arrow(batches))
+        
+        assert all(isinstance(batch, pa.RecordBatch) for batch in results)
+        assert [batch.num_rows for batch in results] == [300, 300, 300, 100]
+        pd.testing.assert_frame_equal(to_frame(pa.Table.from_batches(results)),
+                                      ImpactCalculator.calculate_batch(scenarios))
+    
+    def test_results_are_computed_in_the_buffers(self, scenarios):
+        """With out=, no result array is allocated and copied over; the buffers are the results"""
+        columns = [scenarios[name].to_numpy(dtype=float)
+                   for name in ("params_b", "training_hours", "tokens_per_day", "inference_days", "pue")]
+        codes = [ImpactCalculator._codes(scenarios[name], catalog) for name, catalog in
+                 (("model_type", Config.MODEL_TYPES), ("location", Config.LOCATIONS), ("hardware", Config.HARDWARE))]
+        out = {field: np.full(len(scenarios), np.nan) for field in ImpactCalculator.ARRAY_FIELDS}
+        buffers = dict(out)
+        
+        def peak_bytes(**kwargs):
+            tracemalloc.start()
+            try:
+                results = ImpactCalculator.calculate_arrays(*columns, *codes, **kwargs)
+                return results, tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        
+        fresh, fresh_peak = peak_bytes()
+        results, peak = peak_bytes(out=out)
+        
+        assert results is out
+        assert all(results[field] is buffers[field] for field in ImpactCalculator.ARRAY_FIELDS)
+        for field in ImpactCalculator.ARRAY_FIELDS:
+            np.testing.assert_array_equal(results[field], fresh[field])
+        # Allocating every output array again would cost at least as much as the fresh run
+        result_bytes = len(ImpactCalculator.ARRAY_FIELDS) * len(scenarios) * 8
+        assert peak < fresh_peak - result_bytes * 0.9
+    
+    def test_missing_column(self, scenarios):
+        with pytest.raises(KeyError, match="pue"):
+            calculate_arrow(pa.Table.from_pandas(scenarios.drop(columns="pue")))
+    
+    def test_cli_parquet_roundtrip(self, scenarios, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        pq.write_table(pa.Table.from_pandas(scenarios.iloc[:50], preserve_index=False), tmp_path / "in.parquet")
+        
+        assert main([str(tmp_path / "in.parquet"), "-o", str(tmp_path / "out.parquet"), "--with-inputs"]) == 0
+        written = pq.read_table(tmp_path / "out.parquet")
+        assert written.num_rows == 50
+        assert written.column_names[:2] == ["params_b", "model_type"]
+        np.testing.assert_array_equal(written.column("total_co2").to_numpy(),
+                                      ImpactCalculator.calculate_batch(scenarios.iloc[:50])["total_co2"])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
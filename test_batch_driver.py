@@ -0,0 +1,182 @@
+# test_batch_driver.py - OPTIONAL: Unit tests
+"""
+Unit tests for the chunked batch driver
+Run with: pytest test_batch_driver.py
+"""
+
+import glob
+import json
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from app import CalculationInput, CalculationResult, ImpactCalculator
+from batch_driver import MANIFEST_NAME, ChunkedBatchRun, ManifestMismatchError, main
+from golden import generate_corpus
+from utils import BatchValidationError
+
+@pytest.fixture
+def scenario_csv(tmp_path):
+    path = tmp_path / "scenarios.csv"
+    generate_corpus(1000, seed=31).to_csv(path, index=False)
+    return str(path)
+
+def read_output(output_dir, fmt="parquet") -> pd.DataFrame:
+    paths = sorted(glob.glob(os.path.join(output_dir, f"part-*.{fmt}")))
+    reader = pd.read_parquet if fmt == "parquet" else pd.read_csv
+    return pd.concat([reader(path) for path in paths], ignore_index=True)
+
+class Interrupted(Exception):
+    pass
+
+class TestChunkedBatchRun:
+    """Test cases for partitions, checkpoints and resume"""
+    
+    def test_partitions_match_calculate_batch(self, scenario_csv, tmp_path):
+        updates = []
+        summary = ChunkedBatchRun(scenario_csv, str(tmp_path / "out"), chunk_rows=300,
+                                  progress=updates.append).run()
+        inputs = pd.read_csv(scenario_csv)
+        expected = pd.concat([inputs, ImpactCalculator.calculate_batch(inputs)], axis=1)
+        
+        assert summary["processed"] == 4 and summary["rows"] == 1000
+        assert [update["rows_done"] for update in updates] == [300, 600, 900, 1000]
+        assert all(update["rows_per_second"] > 0 for update in updates)
+        output = read_output(str(tmp_path / "out"))
+        assert list(output.columns) == list(CalculationInput.FIELDS) + list(CalculationResult.FIELDS)
+        pd.testing.assert_frame_equal(output, expected)
+    
+    def test_resume_skips_finished_partitions(self, scenario_csv, tmp_path):
+        """A run killed after two partitions resumes with the other two"""
+        output_dir = str(tmp_path / "out")
+    
+        def crash(update):
+            if update["processed"] == 2:
+                raise Interrupted()
+        
+        with pytest.raises(Interrupted):
+            ChunkedBatchRun(scenario_csv, output_dir, chunk_rows=300, progress=crash).run()
+        with open(os.path.join(output_dir, MANIFEST_NAME), "a") as handle:
+            handle.write('{"partition": "00000-0000')  # torn line of a crash mid-append
+        summary = ChunkedBatchRun(scenario_csv, output_dir, chunk_rows=300).run()
+        
+        assert summary["skipped"] == 2 and summary["processed"] == 2
+        assert summary["rows_done"] == 1000
+        assert len(read_output(output_dir)) == 1000
+        assert not glob.glob(os.path.join(output_dir, "*.tmp"))
+        # The entries appended after the torn line are readable
+        summary = ChunkedBatchRun(scenario_csv, output_dir, chunk_rows=300).run()
+        assert summary["processed"] == 0 and summary["skipped"] == 4
+    
+    @pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc to name fsynced files")
+    @pytest.mark.parametrize("fmt", ["parquet", "csv"])
+    def test_partitions_are_durable_before_the_manifest(self, scenario_csv, tmp_path, monkeypatch, fmt):
+        """Partition data and its rename reach the disk before the manifest lists it"""
+        output_dir = str(tmp_path / "out")
+        events = []
+        fsync, replace = os.fsync, os.replace
+        
+        def logged_fsync(descriptor):
+            events.append(("fsync", os.path.basename(os.readlink(f"/proc/self/fd/{descriptor}"))))
+            fsync(descriptor)
+        
+        def logged_replace(source, target):
+            events.append(("replace", os.path.basename(target)))
+            replace(source, target)
+        
+        monkeypatch.setattr(os, "fsync", logged_fsync)
+        monkeypatch.setattr(os, "replace", logged_replace)
+        ChunkedBatchRun(scenario_csv, output_dir, chunk_rows=600, fmt=fmt).run()
+        
+        partition = f"part-00000-000000.{fmt}"
+        temp = next(name for kind, name in events if kind == "fsync" and name.startswith(partition))
+        assert events[events.index(("fsync", temp)):][:4] == [
+            ("fsync", temp), ("replace", partition), ("fsync", "out"), ("fsync", MANIFEST_NAME)
+        ]
+    
+    def test_missing_partition_file_is_redone(self, scenario_csv, tmp_path):
+        output_dir = str(tmp_path / "out")
+        ChunkedBatchRun(scenario_csv, output_dir, chunk_rows=500, fmt="csv").run()
+        os.remove(os.path.join(output_dir, "part-00000-000001.csv"))
+        
+        summary = ChunkedBatchRun(scenario_csv, output_dir, chunk_rows=500, fmt="csv").run()
+        assert summary["processed"] == 1
+        assert len(read_output(output_dir, "csv")) == 1000
+    
+    def test_manifest_of_other_settings(self, scenario_csv, tmp_path):
+        """Changed chunking is refused unless the run restarts"""
+        output_dir = str(tmp_path / "out")
+        ChunkedBatchRun(scenario_csv, output_dir, chunk_rows=500).run()
+        
+        with pytest.raises(ManifestMismatchError):
+            ChunkedBatchRun(scenario_csv, output_dir, chunk_rows=400).run()
+        summary = ChunkedBatchRun(scenario_csv, output_dir, chunk_rows=400).run(restart=True)
+        assert summary["processed"] == 3
+        assert len(glob.glob(os.path.join(output_dir, "part-*"))) == 3
+        with open(os.path.join(output_dir, MANIFEST_NAME)) as handle:
+            assert json.loads(handle.readline())["chunk_rows"] == 400
+    
+    def test_invalid_rows(self, tmp_path):
+        """reject stops with an error report; quarantine sets rows aside"""
+        inputs = generate_corpus(100, seed=2)
+        inputs.loc[[5, 70], "pue"] = 9.0
+        path = str(tmp_path / "bad.csv")
+        inputs.to_csv(path, index=False)
+        
+        with pytest.raises(BatchValidationError):
+            ChunkedBatchRun(path, str(tmp_path / "rejected"), chunk_rows=50).run()
+        assert os.path.exists(str(tmp_path / "rejected" / "errors-00000-000000.csv"))
+        
+        summary = ChunkedBatchRun(path, str(tmp_path / "kept"), chunk_rows=50, policy="quarantine").run()
+        assert summary["rows"] == 98 and summary["quarantined"] == 2
+        assert len(pd.read_csv(tmp_path / "kept" / "quarantine-00000-000001.csv")) == 1
+    
+    def test_parquet_row_groups_are_chunked(self, tmp_path):
+        """Row groups larger than chunk_rows are split; resuming reads only unfinished groups"""
+        inputs = generate_corpus(250, seed=4)
+        path = str(tmp_path / "scenarios.parquet")
+        inputs.to_parquet(path, index=False, row_group_size=120)
+        output_dir = str(tmp_path / "out")
+        
+        def crash(update):
+            if update["processed"] == 4:
+                raise Interrupted()
+        
+        with pytest.raises(Interrupted):
+            ChunkedBatchRun(path, output_dir, chunk_rows=50, progress=crash).run()
+        summary = ChunkedBatchRun(path, output_dir, chunk_rows=50).run()
+        
+        assert summary["skipped"] == 4 and summary["processed"] == 3
+        assert sorted(os.listdir(output_dir))[1:] == [
+            f"part-00000-{group:06d}-{chunk:06d}.parquet"
+            for group, chunk in [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (2, 0)]
+        ]
+        expected = pd.concat([inputs, ImpactCalculator.calculate_batch(inputs)], axis=1)
+        pd.testing.assert_frame_equal(read_output(output_dir), expected)
+    
+    def test_cli_directory_of_files(self, tmp_path):
+        archive = tmp_path / "archive"
+        archive.mkdir()
+        generate_corpus(200, seed=1).to_csv(archive / "2024.csv", index=False)
+        generate_corpus(150, seed=2).to_parquet(archive / "2025.parquet", index=False)
+        
+        assert main([str(archive), "-o", str(tmp_path / "out"), "--chunk-rows", "100", "--quiet"]) == 0
+        assert len(glob.glob(str(tmp_path / "out" / "part-*"))) == 4
+        assert len(read_output(str(tmp_path / "out"))) == 350
+        assert main([str(archive), "-o", str(tmp_path / "out"), "--chunk-rows", "100", "--quiet"]) == 0
+    
+    def test_cli_other_settings_hint(self, scenario_csv, tmp_path, capsys):
+        """A manifest of other settings points to --restart, not to resuming"""
+        output_dir = str(tmp_path / "out")
+        assert main([scenario_csv, "-o", output_dir, "--chunk-rows", "500", "--quiet"]) == 0
+        
+        assert main([scenario_csv, "-o", output_dir, "--chunk-rows", "400", "--quiet"]) == 1
+        message = capsys.readouterr().err
+        assert "--restart" in message and "rerun to resume" not in message
+        assert main([scenario_csv, "-o", output_dir, "--chunk-rows", "400", "--quiet", "--restart"]) == 0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
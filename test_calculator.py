@@ -4,8 +4,12 @@ Unit tests for AI Model Eco & Ethics Calculator
 Run with: pytest test_calculator.py
 """
 
+import itertools
+
+import pandas as pd
 import pytest
-from app import ImpactCalculator, CalculationInput, Config
+from app import (BulkJob, ImpactCalculator, CalculationInput, CalculationResult, Config, RenderTimer,
+                 ReportGenerator, UIComponents)
 
 class TestImpactCalculator:
     """Test cases for impact calculator"""
@@ -139,6 +143,187 @@ class TestImpactCalculator:
         assert result.total_cost > 0
         assert 1 <= result.ethical_score <= 10
         assert len(result.ethical_explanation) > 0
+    
+    def test_embodied_carbon_amortization(self):
+        """Test embodied hardware carbon is amortized per device hour"""
+        input_params = CalculationInput(
+            params_b=7.0,
+            model_type="Dense",
+            training_hours=1000,
+            tokens_per_day=3600000,
+            inference_days=10,
+            location="Global Average",
+            hardware="NVIDIA A100",
+            pue=1.5
+        )
+        
+        result = ImpactCalculator.calculate_all(input_params)
+        
+        rate = 150 / (5 * 8760 * 0.6)
+        assert result.training_embodied_co2 == pytest.approx(1000 * rate)
+        # 36M tokens at 0.001 s each = 10 device hours
+        assert result.inference_embodied_co2 == pytest.approx(10 * rate)
+        assert result.lifecycle_co2 == pytest.approx(result.total_co2 + result.total_embodied_co2)
+
+class TestBatchCalculation:
+    """Test cases for the vectorized batch path"""
+    
+    def test_batch_matches_scalar(self):
+        """Every location/hardware/model type combination matches calculate_all"""
+        inputs = [
+            CalculationInput(params_b, model_type, 1000, 10000000, 365, location, hardware, 1.5)
+            for params_b, model_type, location, hardware in itertools.product(
+                [0.5, 7.0, 75.0, 1000.0],
+                Config.MODEL_TYPES,
+                Config.LOCATIONS,
+                Config.HARDWARE
+            )
+        ]
+        
+        batch = ImpactCalculator.calculate_batch(CalculationInput.to_frame(inputs))
+        
+        assert len(batch) == len(inputs)
+        for row, input_params in zip(batch.itertuples(index=False), inputs):
+            expected = ImpactCalculator.calculate_all(input_params)
+            for field in CalculationResult.FIELDS:
+                assert getattr(row, field) == getattr(expected, field), field
+    
+    def test_batch_unknown_location(self):
+        """Unknown catalog keys raise KeyError"""
+        frame = CalculationInput.to_frame([
+            CalculationInput(7.0, "Dense", 1000, 0, 1, "Mars Base", "NVIDIA A100", 1.5)
+        ])
+        
+        with pytest.raises(KeyError, match="Mars Base"):
+            ImpactCalculator.calculate_batch(frame)
+    
+    def test_batch_keeps_index(self):
+        """Result rows are aligned with the input index"""
+        frame = CalculationInput.to_frame([
+            CalculationInput(7.0, "Dense", 1000, 0, 1, "Global Average", "NVIDIA A100", 1.5)
+        ] * 3)
+        frame.index = [10, 20, 30]
+        
+        batch = ImpactCalculator.calculate_batch(frame)
+        
+        assert list(batch.index) == [10, 20, 30]
+        assert list(batch.columns) == list(CalculationResult.FIELDS)
+
+class TestRecommendations:
+    """Test cases for rule-based recommendations"""
+    
+    def test_built_in_rules(self):
+        """Large model in a high-carbon region triggers the expected rules in order"""
+        input_params = CalculationInput(
+            params_b=175.0,
+            model_type="Dense",
+            training_hours=100000,
+            tokens_per_day=10000000,
+            inference_days=365,
+            location="Asia-Pacific (Singapore)",
+            hardware="NVIDIA A100",
+            pue=2.5
+        )
+        result = ImpactCalculator.calculate_all(input_params)
+        
+        recommendations = ReportGenerator.generate_recommendations(result, input_params)
+        
+        assert [rec["category"] for rec in recommendations] == [
+            "Model Size", "Infrastructure", "Location", "Ethics", "Efficiency", "Sustainability"
+        ]
+        assert recommendations[-1]["message"] == "Current location uses only 25% renewable energy"
+    
+    def test_batch_matches_scalar(self):
+        """Bulk evaluation groups back into the per-row recommendation lists"""
+        inputs = [
+            CalculationInput(params_b, "Dense", hours, 10000000, 365, location, "NVIDIA H100", pue)
+            for params_b, hours, location, pue in itertools.product(
+                [0.5, 150.0], [10, 100000], Config.LOCATIONS, [1.2, 2.5]
+            )
+        ]
+        frame = CalculationInput.to_frame(inputs)
+        
+        bulk = ReportGenerator.generate_recommendations_batch(
+            frame, ImpactCalculator.calculate_batch(frame)
+        )
+        
+        for row, input_params in enumerate(inputs):
+            expected = ReportGenerator.generate_recommendations(
+                ImpactCalculator.calculate_all(input_params), input_params
+            )
+            rows = bulk[bulk["row"] == row]
+            assert rows[["priority", "category", "message"]].to_dict("records") == expected
+
+class TestUIComponents:
+    """Test cases for UI helpers that don't need a running app"""
+    
+    def test_result_frames(self):
+        """Test cached breakdown and chart frames"""
+        breakdown, co2_chart, resource_chart = UIComponents.build_result_frames(
+            (100.0, 30.0, 10.0, 5.0),
+            (50.0, 15.0, 5.0, 2.5),
+            (150.0, 45.0, 15.0, 7.5)
+        )
+        
+        assert list(breakdown["Phase"]) == ["Training", "Inference", "Total"]
+        assert list(breakdown["CO₂ (kg)"]) == ["100", "50", "150"]
+        assert list(co2_chart["CO₂ (kg)"]) == [100.0, 50.0]
+        assert resource_chart.loc["Energy (kWh)", "Training"] == 10.0
+        assert resource_chart.loc["Water (L)", "Inference"] == 15.0
+    
+    def test_render_timer_sections(self):
+        """Test per-section render timing accumulation"""
+        timer = RenderTimer()
+        
+        with timer.section("results"):
+            pass
+        with timer.section("results"):
+            pass
+        with timer.section("footer"):
+            pass
+        
+        assert list(timer.timings) == ["results", "footer"]
+        assert timer.total_ms() >= 0
+        assert list(timer.to_frame().index) == ["results", "footer"]
+
+class TestBulkJob:
+    """Test cases for background bulk calculations"""
+    
+    def scenarios(self, n):
+        scenario = CalculationInput(70.0, "Dense", 10000, 100000000, 365, "US-East (Virginia)", "NVIDIA A100", 1.5)
+        return CalculationInput.to_frame([scenario] * n).assign(params_b=[float(i + 1) for i in range(n)])
+    
+    def test_job_matches_batch_engine(self):
+        """Chunked background results equal one calculate_batch call"""
+        inputs = self.scenarios(250)
+        job = BulkJob(inputs, chunk_rows=40).start()
+        job.wait(30)
+        
+        expected = pd.concat([inputs, ImpactCalculator.calculate_batch(inputs)], axis=1)
+        assert not job.running and job.error is None
+        assert job.progress == 1.0
+        pd.testing.assert_frame_equal(job.results(), expected)
+        assert job.to_csv() is job.to_csv()
+        assert job.to_csv() == expected.to_csv(index=False).encode("utf-8")
+    
+    def test_pages_span_chunks(self):
+        """Pages are cut across chunk boundaries and stop at the last row"""
+        job = BulkJob(self.scenarios(250), chunk_rows=40).start()
+        job.wait(30)
+        
+        assert list(job.page(1, 100)["params_b"]) == [float(i) for i in range(101, 201)]
+        assert len(job.page(2, 100)) == 50
+        assert job.page(3, 100).empty
+    
+    def test_cancel_before_first_chunk(self):
+        """A cancelled job stops without calculating further chunks"""
+        job = BulkJob(self.scenarios(100), chunk_rows=10)
+        job.cancel()
+        job.start().wait(30)
+        
+        assert job.cancelled
+        assert job.done == 0
+        assert job.results().empty
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
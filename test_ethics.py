@@ -0,0 +1,118 @@
+# test_ethics.py - OPTIONAL: Unit tests
+"""
+Unit tests for the multi-dimensional ethical risk model
+Run with: pytest test_ethics.py
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from app import ImpactCalculator
+from ethics import DEFAULT_MODEL_FILE, EthicalRiskModel, RiskDimension, main
+
+@pytest.fixture(scope="module")
+def model():
+    return EthicalRiskModel.from_file()
+
+class TestRiskDimension:
+    """Test cases for bin and category lookups"""
+    
+    def test_bins_match_scalar_size_score(self, model):
+        """Size bins reproduce the base score of calculate_ethical_risk"""
+        sizes = np.array([0.5, 1.0, 9.9, 10.0, 70.0, 100.0, 499.0, 500.0, 1800.0])
+        dimension = model.dimensions[0]
+        scores = dimension.scores[dimension.codes(pd.DataFrame({"params_b": sizes}))]
+        
+        for params_b, score in zip(sizes, scores):
+            assert score == ImpactCalculator.calculate_ethical_risk(params_b, "Dense")
+    
+    def test_unknown_and_missing_categories_use_default(self, model):
+        domain = next(d for d in model.dimensions if d.dimension_id == "deployment_domain")
+        frame = pd.DataFrame({"deployment_domain": ["healthcare", None, "space_travel", "research"]})
+        
+        assert list(domain.scores[domain.codes(frame)]) == [9.0, 5.0, 5.0, 3.0]
+        assert list(domain.codes(pd.DataFrame(index=range(2)))) == [len(domain.categories)] * 2
+    
+    def test_blank_numeric_cells_are_rejected(self, model, tmp_path):
+        """A blank params_b is not scored as a frontier-scale model"""
+        inventory = pd.DataFrame({"params_b": [7.0, None, None], "tokens_per_day": [1e6, 1e6, 1e6]})
+        
+        with pytest.raises(ValueError, match="model_size: 2 rows without a params_b value"):
+            model.score(inventory)
+        path = tmp_path / "inventory.csv"
+        path.write_text("params_b,tokens_per_day\n7,1000000\n,1000000\n", encoding="utf-8")
+        assert main([str(path), "-o", str(tmp_path / "scored.csv")]) == 1
+        assert not (tmp_path / "scored.csv").exists()
+    
+    def test_invalid_definitions(self):
+        with pytest.raises(ValueError):
+            RiskDimension.from_dict({"id": "x", "column": "params_b", "weight": 1, "kind": "bins",
+                                     "edges": [1, 10], "scores": [1, 2], "reasons": ["a", "b"]})
+        with pytest.raises(ValueError):
+            RiskDimension.from_dict({"id": "x", "column": "params_b", "kind": "bins"})
+        with pytest.raises(ValueError):
+            RiskDimension("x", "params_b", 1, "lookup", [1], ["a"])
+
+class TestEthicalRiskModel:
+    """Test cases for weighted scores, levels and explanations"""
+    
+    def test_weighted_score_and_breakdown(self, model):
+        scored = model.score_one({
+            "params_b": 70.0, "model_type": "Dense", "tokens_per_day": 100000000,
+            "deployment_domain": "healthcare", "data_provenance": "licensed", "openness": "open_weights"
+        })
+        breakdown = model.breakdown(scored)
+        
+        # 0.25*7 + 0.05*5 + 0.25*9 + 0.2*2 + 0.1*4 + 0.15*8
+        assert scored["risk_score"] == 6.3
+        assert scored["risk_level"] == "Elevated"
+        assert scored["top_dimension"] == "deployment_domain"
+        assert breakdown["contribution"].sum() == pytest.approx(6.25)
+        assert breakdown.loc["deployment_domain", "reason"].startswith("Healthcare")
+    
+    def test_batch_equals_single_rows(self, model):
+        """Scoring an inventory at once equals scoring each row"""
+        rng = np.random.default_rng(3)
+        inventory = pd.DataFrame({
+            "params_b": rng.choice([0.5, 7.0, 70.0, 405.0, 1800.0], 200),
+            "model_type": rng.choice(["Dense", "MoE (Mixture of Experts)"], 200),
+            "tokens_per_day": rng.choice([1e4, 1e6, 1e8, 1e10], 200),
+            "deployment_domain": rng.choice(["finance", "education", "unknown_domain"], 200),
+            "openness": rng.choice(["closed", "open_source"], 200)
+        }, index=range(500, 700))
+        scored = model.score(inventory)
+        
+        assert list(scored.index) == list(inventory.index)
+        for label in (500, 555, 699):
+            single = model.score_one(inventory.loc[label])
+            for column in scored.columns:
+                assert scored.loc[label, column] == single[column]
+    
+    def test_level_bands_match_scalar_explanation(self, model):
+        """Scores on a band edge fall in the lower band, like get_ethical_explanation"""
+        levels = np.searchsorted(model.level_edges, [1.0, 3.0, 3.1, 5.0, 7.0, 7.1, 10.0], side="left")
+        
+        assert list(model.level_labels[levels]) == ["Low", "Low", "Moderate", "Moderate",
+                                                    "Elevated", "High", "High"]
+    
+    def test_custom_model_file(self, tmp_path):
+        with open(DEFAULT_MODEL_FILE, encoding="utf-8") as handle:
+            data = json.load(handle)
+        data["dimensions"] = [dimension for dimension in data["dimensions"] if dimension["id"] == "user_reach"]
+        path = tmp_path / "model.json"
+        path.write_text(json.dumps(data))
+        
+        scored = EthicalRiskModel.from_file(str(path)).score(pd.DataFrame({"tokens_per_day": [1e3, 1e10]}))
+        assert list(scored["risk_score"]) == [2.0, 10.0]
+        assert list(scored["risk_level"]) == ["Low", "High"]
+    
+    def test_empty_inventory(self, model):
+        scored = model.score(pd.DataFrame({"params_b": [], "tokens_per_day": []}))
+        
+        assert len(scored) == 0
+        assert "risk_score" in scored.columns
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,121 @@
+# test_forecast.py - OPTIONAL: Unit tests
+"""
+Unit tests for the multi-year forecasting engine
+Run with: pytest test_forecast.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from app import Config, ImpactCalculator
+from forecast import GRID_DECLINE, ForecastModel, main
+from golden import generate_corpus
+
+@pytest.fixture(scope="module")
+def inputs():
+    return generate_corpus(300, seed=5).set_axis(range(100, 400))
+
+@pytest.fixture
+def static_model():
+    """All trajectories flat"""
+    return ForecastModel({location: 0.0 for location in GRID_DECLINE}, grid_floor=0.0,
+                         hardware_improvement=0.0, traffic_growth=0.0)
+
+class TestTrajectories:
+    """Test cases for the grid and hardware factor tables"""
+    
+    def test_grid_decline_and_floor(self):
+        model = ForecastModel(grid_floor=300.0)
+        _, steps = model.periods(2026, 30)
+        factors = model.grid_factors(steps)
+        finland = list(Config.LOCATIONS).index("EU-North (Finland)")
+        virginia = list(Config.LOCATIONS).index("US-East (Virginia)")
+        
+        assert factors[virginia, 0] == pytest.approx(0.96 ** 1.5, rel=1e-3)
+        assert (np.diff(factors, axis=1) <= 0).all()
+        assert factors[virginia, -1] == pytest.approx(300 / 450)
+        # Grids already below the floor stay at their catalog intensity
+        assert (factors[finland] == 1.0).all()
+    
+    def test_hardware_refresh_follows_release_year(self):
+        """Energy per token steps down at each lifetime_years refresh after base_year"""
+        model = ForecastModel(hardware_improvement=0.1)
+        _, steps = model.periods(2024, 12)
+        factors = model.hardware_factors(steps)
+        a100 = factors[list(Config.HARDWARE).index("NVIDIA A100")]  # 2020, 5 years, refreshed 2025
+        h100 = factors[list(Config.HARDWARE).index("NVIDIA H100")]  # 2022, 5 years
+        
+        assert list(a100) == pytest.approx([1.0] * 6 + [0.9 ** 5] * 5 + [0.9 ** 10])
+        assert list(h100) == pytest.approx([1.0] * 3 + [0.9 ** 5] * 5 + [0.9 ** 10] * 4)
+    
+    @pytest.mark.parametrize("base_year", [2015, 2025, 2031])
+    def test_hardware_factors_are_one_at_base_year(self, base_year):
+        """The catalog describes the fleet of base_year, whatever each release year"""
+        model = ForecastModel(hardware_improvement=0.2, base_year=base_year)
+        _, steps = model.periods(base_year, 1)
+        
+        assert (model.hardware_factors(steps) == 1.0).all()
+    
+    def test_unknown_frequency_and_missing_location(self):
+        with pytest.raises(ValueError):
+            ForecastModel().periods(2027, 1, "week")
+        with pytest.raises(KeyError):
+            ForecastModel({"US-West (Oregon)": 0.05})
+
+class TestForecast:
+    """Test cases for scenario and portfolio projections"""
+    
+    def test_flat_trajectories_match_calculate_batch(self, inputs, static_model):
+        """A flat year of projection is the inference footprint over that year"""
+        frame = pd.concat(static_model.iter_forecast(inputs, 2028, 2, chunk_rows=64))
+        for year, days in ((2028, 366.0), (2029, 365.0)):
+            expected = ImpactCalculator.calculate_batch(inputs.assign(inference_days=days))
+            for quantity in ("co2", "energy", "water", "cost", "embodied_co2"):
+                np.testing.assert_allclose(frame[(quantity, pd.Period(str(year), "Y"))],
+                                           expected[f"inference_{quantity}"], rtol=1e-12)
+        assert list(frame.index) == list(inputs.index)
+    
+    def test_chunking_does_not_change_results(self, inputs):
+        model = ForecastModel(traffic_growth=0.4)
+        whole = pd.concat(model.iter_forecast(inputs, 2027, 3, "month"))
+        chunked = pd.concat(model.iter_forecast(inputs, 2027, 3, "month", chunk_rows=7))
+        
+        pd.testing.assert_frame_equal(whole, chunked)
+    
+    def test_traffic_growth_column_and_training(self, inputs, static_model):
+        """Per-scenario growth compounds from the start; training lands in the first step"""
+        growing = inputs.assign(traffic_growth=np.where(np.arange(len(inputs)) % 2 == 0, 0.0, 1.0))
+        flat = next(static_model.iter_forecast(inputs, 2027, 2))
+        grown = next(static_model.iter_forecast(growing, 2027, 2, include_training=True))
+        training = ImpactCalculator.calculate_batch(inputs)["training_energy"].to_numpy()
+        _, steps = static_model.periods(2027, 2)
+        
+        np.testing.assert_allclose(grown["energy"].iloc[::2, 1], flat["energy"].iloc[::2, 1])
+        np.testing.assert_allclose(grown["energy"].iloc[1::2, 1],
+                                   flat["energy"].iloc[1::2, 1] * 2 ** steps["since_start"][1])
+        np.testing.assert_allclose(grown["energy"].iloc[::2, 0], flat["energy"].iloc[::2, 0] + training[::2])
+    
+    def test_portfolio_months_add_up_to_years(self, inputs):
+        """Monthly steps sum to about the yearly ones (midpoint compounding)"""
+        model = ForecastModel(traffic_growth=0.3)
+        monthly = model.portfolio(inputs, 2027, 3, "month", chunk_rows=50)
+        yearly = model.portfolio(inputs, 2027, 3)
+        
+        assert list(yearly.columns) == ["co2", "energy", "water", "cost", "embodied_co2", "lifecycle_co2"]
+        np.testing.assert_allclose(monthly.groupby(monthly.index.year).sum().to_numpy(),
+                                   yearly.to_numpy(), rtol=1e-2)
+        np.testing.assert_allclose(yearly["lifecycle_co2"], yearly["co2"] + yearly["embodied_co2"])
+    
+    def test_cli_reads_traffic_growth_from_the_same_rows(self, inputs, tmp_path):
+        """The CSV is parsed once; its traffic_growth column stays with its scenarios"""
+        growing = inputs.assign(traffic_growth=np.linspace(0.0, 1.0, len(inputs)))
+        path = tmp_path / "scenarios.csv"
+        growing.to_csv(path, index=False)
+        
+        assert main([str(path), "-o", str(tmp_path / "forecast.csv"), "--start", "2027", "--years", "2"]) == 0
+        written = pd.read_csv(tmp_path / "forecast.csv", index_col=0)
+        expected = next(ForecastModel().iter_forecast(growing.reset_index(drop=True), 2027, 2))
+        np.testing.assert_allclose(written["energy_2028"], expected[("energy", pd.Period("2028", "Y"))])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,58 @@
+# test_golden.py - OPTIONAL: Unit tests
+"""
+Golden-result regression tests
+Run with: pytest test_golden.py
+"""
+
+import os
+
+import pytest
+from app import Config
+from golden import ENGINES, GoldenCorpus, check_engine, generate_corpus
+
+REFERENCE_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden_data", "reference_v1.npz")
+
+class TestGoldenCorpus:
+    """Test cases for the golden corpus and equivalence checker"""
+    
+    @pytest.mark.parametrize("engine", sorted(ENGINES))
+    def test_engines_match_stored_reference(self, engine):
+        """Every engine reproduces the committed reference outputs"""
+        corpus = GoldenCorpus.load(REFERENCE_CORPUS)
+        
+        report = check_engine(corpus, ENGINES[engine])
+        
+        assert report["passed"], report
+    
+    def test_corpus_is_deterministic_and_covers_catalog(self):
+        """Same seed gives the same corpus; all catalog entries appear"""
+        first = generate_corpus(2000, seed=7)
+        second = generate_corpus(2000, seed=7)
+        
+        assert first.equals(second)
+        assert set(first["location"]) == set(Config.LOCATIONS)
+        assert set(first["hardware"]) == set(Config.HARDWARE)
+        assert set(first["model_type"]) == set(Config.MODEL_TYPES)
+        assert first["params_b"].min() == 0.01
+        assert first["tokens_per_day"].max() == 10000000000
+    
+    def test_drift_is_reported(self, tmp_path):
+        """A drifting engine fails the check and points at the field"""
+        corpus = GoldenCorpus.build(300, seed=3)
+        path = tmp_path / "corpus.npz"
+        corpus.save(str(path))
+        loaded = GoldenCorpus.load(str(path))
+        
+        def drifting_engine(inputs):
+            results = ENGINES["batch"](inputs)
+            results["total_cost"] = results["total_cost"] * 1.001
+            return results
+        
+        report = check_engine(loaded, drifting_engine)
+        
+        assert not report["passed"]
+        assert report["fields"]["total_cost"]["mismatches"] > 0
+        assert report["fields"]["total_co2"]["mismatches"] == 0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,126 @@
+# test_instrumentation.py - OPTIONAL: Unit tests
+"""
+Unit tests for timing instrumentation and batch profiling
+Run with: pytest test_instrumentation.py
+"""
+
+import json
+
+import pandas as pd
+import pytest
+from instrumentation import Instrumentation, instrumentation
+import batch
+
+class TestInstrumentation:
+    """Test cases for the stage timing registry"""
+    
+    def test_disabled_records_nothing(self):
+        """Disabled instrumentation is a no-op"""
+        metrics = Instrumentation(enabled=False)
+        
+        with metrics.stage("training"):
+            pass
+        metrics.timed("comparisons")(lambda: None)()
+        
+        assert metrics.snapshot()["stages"] == {}
+    
+    def test_stage_and_decorator_counts(self):
+        """Context manager and decorator both feed the histograms"""
+        metrics = Instrumentation(enabled=True)
+        
+        @metrics.timed("comparisons")
+        def compare(value):
+            return value * 2
+        
+        with metrics.stage("training"):
+            pass
+        assert compare(3) == 6
+        assert compare(4) == 8
+        
+        stages = metrics.snapshot()["stages"]
+        assert stages["training"]["count"] == 1
+        assert stages["comparisons"]["count"] == 2
+        assert stages["comparisons"]["buckets"]["+Inf"] == 2
+    
+    def test_prometheus_export(self):
+        """Prometheus output has cumulative buckets, sum and count"""
+        metrics = Instrumentation(enabled=True, buckets=(0.1, 1.0))
+        metrics.observe("inference", 0.05)
+        metrics.observe("inference", 0.5)
+        metrics.observe("inference", 5.0)
+        
+        text = metrics.to_prometheus()
+        
+        assert "# TYPE eco_calc_stage_seconds histogram" in text
+        assert 'eco_calc_stage_seconds_bucket{stage="inference",le="0.1"} 1' in text
+        assert 'eco_calc_stage_seconds_bucket{stage="inference",le="1.0"} 2' in text
+        assert 'eco_calc_stage_seconds_bucket{stage="inference",le="+Inf"} 3' in text
+        assert 'eco_calc_stage_seconds_count{stage="inference"} 3' in text
+
+class TestBatchCli:
+    """Test cases for the batch command line"""
+    
+    def test_profile_and_metrics(self, tmp_path):
+        """--profile writes a pstats dump, --metrics-json a snapshot"""
+        scenarios = tmp_path / "scenarios.csv"
+        pd.DataFrame([{
+            "Model Parameters (B)": 7.0,
+            "Model Type": "Dense",
+            "Training Hours": 1000,
+            "Tokens per Day": 10000000,
+            "Inference Days": 365,
+            "Location": "Global Average",
+            "Hardware": "NVIDIA A100",
+            "PUE": 1.5
+        }]).to_csv(scenarios, index=False)
+        
+        try:
+            exit_code = batch.main([
+                str(scenarios),
+                "-o", str(tmp_path / "results.csv"),
+                "--profile", str(tmp_path / "run.pstats"),
+                "--metrics-json", str(tmp_path / "metrics.json")
+            ])
+        finally:
+            instrumentation.disable()
+            instrumentation.reset()
+        
+        assert exit_code == 0
+        assert (tmp_path / "run.pstats").stat().st_size > 0
+        results = pd.read_csv(tmp_path / "results.csv")
+        assert results["total_co2"].iloc[0] > 0
+        stages = json.loads((tmp_path / "metrics.json").read_text())["stages"]
+        assert stages["input_parsing"]["count"] == 1
+        assert stages["batch.training"]["count"] == 1
+    
+    def test_quarantine_invalid_rows(self, tmp_path):
+        """Invalid rows are reported and kept out of the results"""
+        scenarios = tmp_path / "scenarios.csv"
+        pd.DataFrame({
+            "params_b": [7.0, -1.0],
+            "model_type": ["Dense", "Dense"],
+            "training_hours": [1000, 1000],
+            "tokens_per_day": [10000000, 10000000],
+            "inference_days": [365, 365],
+            "location": ["Global Average", "Atlantis"],
+            "hardware": ["NVIDIA A100", "NVIDIA A100"],
+            "pue": [1.5, 1.5]
+        }).to_csv(scenarios, index=False)
+        
+        exit_code = batch.main([
+            str(scenarios),
+            "-o", str(tmp_path / "results.csv"),
+            "--on-invalid", "quarantine",
+            "--errors", str(tmp_path / "errors.csv"),
+            "--quarantine", str(tmp_path / "quarantine.csv")
+        ])
+        
+        assert exit_code == 0
+        assert len(pd.read_csv(tmp_path / "results.csv")) == 1
+        assert list(pd.read_csv(tmp_path / "quarantine.csv")["location"]) == ["Atlantis"]
+        errors = pd.read_csv(tmp_path / "errors.csv")
+        assert sorted(errors["reason"]) == ["below_min", "unknown_category"]
+        assert batch.main([str(scenarios), "-o", str(tmp_path / "rejected.csv")]) == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,170 @@
+# test_pricing.py - OPTIONAL: Unit tests
+"""
+Unit tests for the pricing engine and its use in ImpactCalculator
+Run with: pytest test_pricing.py
+"""
+
+import itertools
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from app import CalculationInput, Config, ImpactCalculator
+from pricing import PriceCatalog, TariffSchedule
+
+CATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "price_catalog.example.json")
+
+@pytest.fixture
+def catalog_pricing(monkeypatch):
+    """Route ImpactCalculator through the example catalog"""
+    catalog = PriceCatalog.from_file(CATALOG_FILE)
+    monkeypatch.setattr(ImpactCalculator, "PRICING", catalog)
+    return catalog
+
+class TestTariffSchedule:
+    """Test cases for time-of-use tariff lookup"""
+    
+    def test_weekday_peak_and_weekend(self):
+        """Bands apply on their days and [start, end) hours only"""
+        tariff = TariffSchedule(0.08, [{"days": "weekday", "start": "07:00", "end": "21:00", "price": 0.13}])
+        # 2025-01-06 is a Monday, 2025-01-11 a Saturday
+        times = np.array(["2025-01-06T06:59", "2025-01-06T07:00", "2025-01-06T20:59",
+                          "2025-01-06T21:00", "2025-01-11T12:00"], dtype="datetime64[m]")
+        
+        assert list(tariff.price_at(times)) == [0.08, 0.13, 0.13, 0.08, 0.08]
+        assert tariff.mean_price == pytest.approx((5 * 14 * 0.13 + (168 - 5 * 14) * 0.08) / 168)
+    
+    def test_later_bands_override(self):
+        """Overlapping bands: the later one wins, equal neighbours are merged"""
+        tariff = TariffSchedule(0.1, [
+            {"start": "08:00", "end": "20:00", "price": 0.2},
+            {"start": "12:00", "end": "14:00", "price": 0.3},
+            {"start": "20:00", "end": "24:00", "price": 0.1}
+        ])
+        times = np.array(["2025-01-07T11:00", "2025-01-07T13:00", "2025-01-07T22:00"], dtype="datetime64[m]")
+        
+        assert list(tariff.price_at(times)) == [0.2, 0.3, 0.1]
+        # Monday 00:00 plus four price changes a day; 20:00-08:00 runs through midnight
+        assert len(tariff.starts) == 1 + 4 * 7
+    
+    def test_energy_cost_series(self):
+        """Metered series are priced interval by interval"""
+        tariff = TariffSchedule(0.1, [{"start": "00:00", "end": "12:00", "price": 0.2}])
+        times = np.arange("2025-01-06T10", "2025-01-06T14", dtype="datetime64[h]")
+        
+        assert tariff.energy_cost(times, [1.0, 1.0, 1.0, 1.0]) == pytest.approx(0.6)
+    
+    def test_average_price_over_spans(self):
+        """Span prices match a minute-by-minute sum, across band edges and weeks"""
+        tariff = TariffSchedule(0.1, [{"days": "weekday", "start": "07:30", "end": "21:00", "price": 0.2}])
+        starts = np.array(["2025-01-06T06:00", "2025-01-10T20:15", "2025-01-11T00:00", "2025-01-08T13:07"],
+                          dtype="datetime64[m]")
+        hours = np.array([3.0, 60.0, 24.0, 24 * 7 * 3 + 5.5])
+        
+        expected = [
+            tariff.price_at(start + np.arange(int(span * 60)).astype("timedelta64[m]")).mean()
+            for start, span in zip(starts, hours)
+        ]
+        np.testing.assert_allclose(tariff.average_price(starts, hours), expected, rtol=1e-12)
+        assert tariff.average_price(starts[:1], [0.0])[0] == 0.1
+    
+    def test_profile_price(self):
+        """A flat load pays the mean price; a daytime load pays more"""
+        tariff = TariffSchedule(0.1, [{"start": "08:00", "end": "20:00", "price": 0.3}])
+        
+        assert tariff.profile_price(np.ones(168)) == pytest.approx(tariff.mean_price)
+        daytime = np.tile([0.0] * 8 + [1.0] * 12 + [0.0] * 4, 7)
+        assert tariff.profile_price(daytime) == pytest.approx(0.3)
+    
+    def test_invalid_band(self):
+        with pytest.raises(ValueError):
+            TariffSchedule(0.1, [{"start": "20:00", "end": "08:00", "price": 0.2}])
+
+class TestPriceCatalog:
+    """Test cases for catalog rates and calculator integration"""
+    
+    def test_purchase_options(self):
+        """Spot rates include the interruption overhead"""
+        catalog = PriceCatalog.from_file(CATALOG_FILE)
+        
+        assert catalog.hourly_rate("NVIDIA A100") == 3.0
+        assert catalog.hourly_rate("NVIDIA A100", "reserved") == 1.9
+        assert catalog.hourly_rate("NVIDIA A100", "spot") == pytest.approx(1.1 * 1.15)
+        assert catalog.missing(list(Config.HARDWARE), list(Config.LOCATIONS)) == []
+        with pytest.raises(ValueError):
+            PriceCatalog({}, {}, purchase_option="preemptible")
+    
+    def test_partial_catalog_is_one_error(self, tmp_path):
+        """Missing keys are all named when the catalog loads, not as a KeyError per calculation"""
+        with open(CATALOG_FILE, encoding="utf-8") as handle:
+            data = json.load(handle)
+        del data["hardware"]["NVIDIA H100"]["on_demand"]
+        del data["tariffs"]["EU-North (Finland)"]
+        catalog = PriceCatalog.from_dict(data)
+        
+        assert catalog.missing(list(Config.HARDWARE), list(Config.LOCATIONS)) == [
+            "NVIDIA H100", "EU-North (Finland)"
+        ]
+        with pytest.raises(ValueError, match=r"NVIDIA H100, EU-North \(Finland\)"):
+            catalog.require(list(Config.HARDWARE), list(Config.LOCATIONS))
+        path = tmp_path / "partial.json"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        result = subprocess.run([sys.executable, "-c", "import app"], capture_output=True, text=True,
+                                cwd=os.path.dirname(CATALOG_FILE), env=dict(os.environ, ECO_CALC_PRICING=str(path)))
+        assert result.returncode != 0 and "no on_demand rate or tariff for" in result.stderr
+    
+    def test_scalar_and_batch_use_catalog(self, catalog_pricing):
+        """Both calculation paths price with the catalog, identically"""
+        scenarios = [
+            CalculationInput(70.0, "Dense", 10000, 100000000, 365, location, hardware, 1.5)
+            for location, hardware in itertools.product(Config.LOCATIONS, Config.HARDWARE)
+        ]
+        batch = ImpactCalculator.calculate_batch(CalculationInput.to_frame(scenarios))
+        
+        for position, scenario in enumerate(scenarios):
+            result = ImpactCalculator.calculate_all(scenario)
+            for field in ("training_cost", "inference_cost", "total_cost"):
+                assert batch[field].iloc[position] == getattr(result, field)
+        
+        tdp_kw = Config.HARDWARE["NVIDIA A100"]["tdp"] / 1000
+        energy = tdp_kw * scenarios[0].training_hours * 1.5
+        hours = energy / tdp_kw
+        expected = hours * 3.0 + energy * catalog_pricing.energy_price(scenarios[0].location)
+        assert batch["training_cost"].iloc[0] == pytest.approx(expected)
+    
+    def test_time_profiles_in_batch(self, catalog_pricing):
+        """Inference follows the load profile; training_start prices the actual run"""
+        location = "US-East (Virginia)"
+        scenario = CalculationInput(70.0, "Dense", 12, 100000000, 365, location, "NVIDIA A100", 1.5)
+        inputs = CalculationInput.to_frame([scenario] * 2).assign(
+            training_start=["2025-01-07 08:00", "2025-01-11 08:00"]
+        )
+        batch = ImpactCalculator.calculate_batch(inputs)
+        flat = ImpactCalculator.calculate_batch(inputs.drop(columns="training_start"))
+        
+        tariff = catalog_pricing.tariffs[location]
+        energy = batch["training_energy"].iloc[0]
+        hours = energy / (Config.HARDWARE["NVIDIA A100"]["tdp"] / 1000)
+        # Tuesday daytime sits in the weekday peak band, Saturday at the default price
+        assert batch["training_cost"].iloc[0] == pytest.approx(hours * 3.0 + energy * 0.13)
+        assert batch["training_cost"].iloc[1] == pytest.approx(hours * 3.0 + energy * 0.08)
+        assert flat["training_cost"].iloc[0] == pytest.approx(hours * 3.0 + energy * tariff.mean_price)
+        
+        inference_price = tariff.profile_price(np.tile(catalog_pricing.inference_profile[:24], 7))
+        assert inference_price > tariff.mean_price
+        assert catalog_pricing.inference_price(location) == pytest.approx(inference_price)
+        assert (batch["inference_cost"] == flat["inference_cost"]).all()
+        assert batch["inference_cost"].iloc[0] == ImpactCalculator.calculate_all(scenario).inference_cost
+    
+    def test_flat_pricing_without_catalog(self):
+        """No catalog keeps the flat cost_per_hour and ENERGY_COST_PER_KWH"""
+        assert ImpactCalculator.PRICING is None
+        assert ImpactCalculator.calculate_cost(400.0, "NVIDIA A100", "EU-West (Ireland)") == pytest.approx(
+            1000 * 3.0 + 400.0 * Config.ENERGY_COST_PER_KWH
+        )
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,60 @@
+# test_report_renderer.py - OPTIONAL: Unit tests
+"""
+Unit tests for the offline report renderer
+Run with: pytest test_report_renderer.py
+"""
+
+import os
+
+import pytest
+from app import CalculationInput, ImpactCalculator, ReportGenerator
+from report_renderer import ChartCache, ReportRenderer, render_fleet
+
+SCENARIO = CalculationInput(70.0, "Dense", 10000, 100000000, 365, "US-East (Virginia)", "NVIDIA A100", 1.5)
+
+class TestReportRenderer:
+    """Test cases for HTML rendering and chart caching"""
+    
+    def test_html_contains_report_generator_outputs(self):
+        """Report shows the recommendations and ethical explanation"""
+        result = ImpactCalculator.calculate_all(SCENARIO)
+        html_text = ReportRenderer().render_html("Fleet <model>", SCENARIO, result)
+        
+        assert "Fleet &lt;model&gt;" in html_text
+        assert html_text.count("<svg") == 2
+        assert result.ethical_explanation in html_text
+        for rec in ReportGenerator.generate_recommendations(result, SCENARIO):
+            assert rec["category"] in html_text
+    
+    def test_chart_cache_reuses_identical_charts(self, tmp_path):
+        """Same chart content is rendered once and served from disk afterwards"""
+        renderer = ReportRenderer(ChartCache(str(tmp_path)))
+        renderer.render_html("a", SCENARIO)
+        renderer.render_html("b", SCENARIO)
+        
+        assert renderer.chart_cache.misses == 2
+        assert renderer.chart_cache.hits == 2
+        assert len(os.listdir(tmp_path)) == 2
+        
+        fresh = ChartCache(str(tmp_path))
+        ReportRenderer(fresh).render_html("c", SCENARIO)
+        assert fresh.misses == 0
+    
+    def test_render_fleet_in_worker_processes(self, tmp_path):
+        """Parallel rendering writes one file per scenario, in order"""
+        frame = CalculationInput.to_frame([SCENARIO] * 3).assign(name=["m1", "m2", "m/3"])
+        paths = render_fleet(frame, str(tmp_path / "out"), workers=2, chunk_size=1)
+        
+        assert [os.path.basename(path) for path in paths] == ["m1.html", "m2.html", "m_3.html"]
+        assert all(os.path.getsize(path) > 0 for path in paths)
+    
+    def test_colliding_names_get_suffixes(self, tmp_path):
+        """Names sanitizing to one file never overwrite each other"""
+        frame = CalculationInput.to_frame([SCENARIO] * 4).assign(name=["m/3", "m_3", "M_3", "m/3"])
+        paths = render_fleet(frame, str(tmp_path))
+        
+        assert [os.path.basename(path) for path in paths] == ["m_3.html", "m_3-2.html", "M_3-3.html", "m_3-4.html"]
+        assert len(os.listdir(tmp_path)) == 4
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
\ No newline at end of file
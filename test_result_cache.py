@@ -0,0 +1,157 @@
+# test_result_cache.py - OPTIONAL: Unit tests
+"""
+Unit tests for the persistent result cache
+Run with: pytest test_result_cache.py
+"""
+
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import result_cache
+from app import CalculationInput, CalculationResult, ImpactCalculator
+from golden import generate_corpus
+from result_cache import ResultCache
+
+SCENARIO = CalculationInput(70.0, "Dense", 10000, 100000000, 365, "US-East (Virginia)", "NVIDIA A100", 1.5)
+
+COLUMNS = ["value", "label"]
+
+def write_keys(path, start):
+    cache = ResultCache(path, COLUMNS, "v1")
+    for offset in range(50):
+        cache.put(cache.key([start + offset]), [float(start + offset), "x"])
+    return len(cache)
+
+@pytest.fixture
+def cached_calculator(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path / "results.sqlite"), CalculationResult.FIELDS, ImpactCalculator.CACHE_VERSION)
+    monkeypatch.setattr(ImpactCalculator, "CACHE", cache)
+    return cache
+
+class TestResultCache:
+    """Test cases for keys, eviction and concurrency"""
+    
+    def test_canonical_keys(self, tmp_path):
+        """Equal values hash equally across types; the version is part of the key"""
+        cache = ResultCache(str(tmp_path / "c.sqlite"), COLUMNS, "v1")
+        
+        assert cache.key([70, "Dense"]) == cache.key([np.float64(70.0), "Dense"])
+        assert cache.key([70, "Dense"]) != cache.key([70, "MoE"])
+        assert cache.key([70]) != ResultCache(str(tmp_path / "c.sqlite"), COLUMNS, "v2").key([70])
+    
+    def test_roundtrip_and_stats(self, tmp_path):
+        """get returns stored values exactly, typed, and counts hits/misses"""
+        cache = ResultCache(str(tmp_path / "c.sqlite"), COLUMNS, "v1")
+        cache.put(cache.key(["a"]), [0.1 + 0.2, "text"])
+        cache.put(cache.key(["b"]), [1e-300, None])
+        
+        assert cache.get(cache.key(["a"])) == [0.1 + 0.2, "text"]
+        assert cache.get(cache.key(["b"])) == [1e-300, None]
+        assert cache.get(cache.key(["c"])) is None
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_rate"] == pytest.approx(2 / 3)
+    
+    def test_ttl_and_size_eviction(self, tmp_path, monkeypatch):
+        """Expired entries miss; beyond max_entries the least recently used go"""
+        clock = [1000.0]
+        monkeypatch.setattr(result_cache, "time", SimpleNamespace(time=lambda: clock[0]))
+        cache = ResultCache(str(tmp_path / "c.sqlite"), COLUMNS, "v1", ttl_seconds=60, max_entries=1,
+                            touch_interval=0)
+        old, b, c = (cache.key([name]) for name in ("old", "b", "c"))
+        cache.put(old, [1.0, "old"])
+        clock[0] += 30
+        cache.put(b, [2.0, "b"])
+        cache.put(c, [3.0, "c"])
+        clock[0] += 1
+        cache.get(b)
+        clock[0] += 40
+        
+        assert cache.get(old) is None
+        assert cache.evict() == 2  # "old" expired, then "c" is the least recently used
+        assert cache.get(b) == [2.0, "b"]
+        assert cache.get(c) is None
+    
+    def test_hits_touch_only_stale_entries(self, tmp_path, monkeypatch):
+        """Repeated hits within touch_interval leave the database untouched"""
+        clock = [1000.0]
+        monkeypatch.setattr(result_cache, "time", SimpleNamespace(time=lambda: clock[0]))
+        cache = ResultCache(str(tmp_path / "c.sqlite"), COLUMNS, "v1", touch_interval=60)
+        key = cache.key(["a"])
+        cache.put(key, [1.0, "a"])
+        
+        def accessed():
+            return cache._connect().execute("SELECT accessed FROM results").fetchone()[0]
+        
+        observer = sqlite3.connect(cache.path)
+        version = observer.execute("PRAGMA data_version").fetchone()
+        clock[0] += 30
+        cache.get(key)
+        assert accessed() == 1000.0
+        assert observer.execute("PRAGMA data_version").fetchone() == version  # no commit to the shared file
+        clock[0] += 40
+        cache.get(key)
+        assert accessed() == 1070.0
+        assert observer.execute("PRAGMA data_version").fetchone() != version
+    
+    def test_other_versions_are_evicted(self, tmp_path):
+        path = str(tmp_path / "c.sqlite")
+        old = ResultCache(path, COLUMNS, "v1")
+        old.put(old.key(["a"]), [1.0, "a"])
+        current = ResultCache(path, COLUMNS, "v2")
+        current.put(current.key(["b"]), [2.0, "b"])
+        
+        assert current.evict() == 1
+        assert len(current) == 1
+    
+    def test_other_columns_rebuild_the_table(self, tmp_path):
+        path = str(tmp_path / "c.sqlite")
+        ResultCache(path, COLUMNS, "v1").put((1, 2), [1.0, "a"])
+        
+        cache = ResultCache(path, ["total"], "v1")
+        assert len(cache) == 0
+        cache.put((1, 2), [5.0])
+        assert cache.get((1, 2)) == [5.0]
+    
+    def test_concurrent_writer_processes(self, tmp_path):
+        """Several processes can write to the same file"""
+        path = str(tmp_path / "c.sqlite")
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            list(pool.map(write_keys, [path] * 4, [0, 50, 100, 150]))
+        
+        cache = ResultCache(path, COLUMNS, "v1")
+        assert len(cache) == 200
+        assert cache.get(cache.key([123])) == [123.0, "x"]
+
+class TestCachedCalculator:
+    """Test cases for the cache in front of ImpactCalculator"""
+    
+    def test_scalar_path(self, cached_calculator):
+        first = ImpactCalculator.calculate_cached(SCENARIO)
+        second = ImpactCalculator.calculate_cached(SCENARIO)
+        
+        for field in CalculationResult.FIELDS:
+            assert getattr(second, field) == getattr(first, field)
+        assert cached_calculator.stats()["hits"] == 1
+    
+    def test_stored_results_are_bit_exact(self, cached_calculator):
+        """A cached result equals calculate_batch's row bit for bit, whatever the input types"""
+        inputs = generate_corpus(20, seed=11)[list(CalculationInput.FIELDS)]
+        expected = ImpactCalculator.calculate_batch(inputs)
+        for row in range(len(inputs)):
+            ImpactCalculator.calculate_cached(CalculationInput(**inputs.iloc[row].to_dict()))
+        
+        for row, values in enumerate(inputs.itertuples(index=False)):
+            # Integral floats given as ints hit the same entries
+            scenario = CalculationInput(*(int(value) if isinstance(value, float) and value.is_integer()
+                                          else value for value in values))
+            result = ImpactCalculator.calculate_cached(scenario)
+            for field in CalculationResult.FIELDS:
+                assert getattr(result, field) == expected[field].iloc[row], field
+        assert cached_calculator.stats()["hits"] == 20
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
\ No newline at end of file
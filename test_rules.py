@@ -0,0 +1,71 @@
+# test_rules.py - OPTIONAL: Unit tests
+"""
+Unit tests for the recommendation rule engine
+Run with: pytest test_rules.py
+"""
+
+import json
+
+import numpy as np
+import pytest
+from rules import RecommendationRule, RuleSet
+
+def make_rule(rule_id="pue_high", message="PUE is high", op=">", value=2.0):
+    return RecommendationRule.from_dict({
+        "id": rule_id,
+        "priority": "medium",
+        "category": "Infrastructure",
+        "message": message,
+        "when": [{"field": "pue", "op": op, "value": value}]
+    })
+
+class TestRuleEngine:
+    """Test cases for rule loading and evaluation"""
+    
+    def test_scalar_and_mask_agree(self):
+        """Single-row and vectorized evaluation give the same answer"""
+        rule = make_rule()
+        pue = np.array([1.0, 2.0, 2.1, 3.0])
+        
+        mask = rule.mask({"pue": pue}, len(pue))
+        
+        assert list(mask) == [rule.matches({"pue": value}) for value in pue]
+        assert list(mask) == [False, False, True, True]
+    
+    def test_bulk_messages_formatted(self):
+        """Message placeholders are filled from feature columns"""
+        rules = RuleSet([make_rule(message="PUE is {pue}", op=">=", value=1.0)])
+        table = {"pue": np.array([1.5, 2.5, 1.5])}
+        
+        bulk = rules.apply_bulk(table, index=["a", "b", "c"])
+        
+        assert list(bulk["row"]) == ["a", "b", "c"]
+        assert list(bulk["message"]) == ["PUE is 1.5", "PUE is 2.5", "PUE is 1.5"]
+        assert rules.apply({"pue": 2.5}) == [
+            {"priority": "medium", "category": "Infrastructure", "message": "PUE is 2.5"}
+        ]
+    
+    def test_unknown_operator(self):
+        """Rules with unsupported operators are rejected at load time"""
+        with pytest.raises(ValueError, match="Unknown operator"):
+            make_rule(op="~=")
+    
+    def test_files_concatenate(self, tmp_path):
+        """Extra rule files are appended and duplicate ids rejected"""
+        path = tmp_path / "extra.json"
+        path.write_text(json.dumps({"rules": [{
+            "id": "tiny_pue",
+            "priority": "low",
+            "category": "Infrastructure",
+            "message": "Excellent PUE",
+            "when": [{"field": "pue", "op": "<", "value": 1.2}]
+        }]}))
+        
+        rules = RuleSet.from_files([str(path)])
+        assert [rule.rule_id for rule in rules.rules] == ["tiny_pue"]
+        
+        with pytest.raises(ValueError, match="Duplicate"):
+            RuleSet.from_files([str(path), str(path)])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
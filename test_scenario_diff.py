@@ -0,0 +1,73 @@
+# test_scenario_diff.py - OPTIONAL: Unit tests
+"""
+Unit tests for the scenario diff engine
+Run with: pytest test_scenario_diff.py
+"""
+
+from itertools import permutations
+
+import pytest
+from app import CalculationInput, ImpactCalculator
+from scenario_diff import ScenarioDiff
+
+BEFORE = CalculationInput(70.0, "Dense", 10000, 100000000, 365, "US-East (Virginia)", "NVIDIA A100", 1.5)
+AFTER = CalculationInput(70.0, "Dense", 10000, 100000000, 365, "EU-North (Finland)", "NVIDIA H100", 1.2)
+
+def permutation_shapley(before, after, fields, metric):
+    """Textbook Shapley values: average marginal contribution over all orderings"""
+    def value(applied):
+        values = {field: getattr(before, field) for field in CalculationInput.FIELDS}
+        values.update({field: getattr(after, field) for field in applied})
+        return getattr(ImpactCalculator.calculate_all(CalculationInput(**values)), metric)
+    
+    orderings = list(permutations(fields))
+    shapley = dict.fromkeys(fields, 0.0)
+    for ordering in orderings:
+        for position, field in enumerate(ordering):
+            applied = list(ordering[:position])
+            shapley[field] += (value(applied + [field]) - value(applied)) / len(orderings)
+    return shapley
+
+class TestScenarioDiff:
+    """Test cases for deltas and Shapley attribution"""
+    
+    @pytest.mark.parametrize("metric", ["total_co2", "total_cost", "total_water"])
+    def test_matches_permutation_shapley(self, metric):
+        """Attribution equals the brute-force Shapley values"""
+        report = ScenarioDiff.diff(BEFORE, AFTER, metrics=[metric])[metric]
+        
+        expected = permutation_shapley(BEFORE, AFTER, ["location", "hardware", "pue"], metric)
+        
+        assert report["attribution"] == pytest.approx(expected)
+        assert report["before"] == getattr(ImpactCalculator.calculate_all(BEFORE), metric)
+        assert report["after"] == getattr(ImpactCalculator.calculate_all(AFTER), metric)
+    
+    def test_batch_contributions_sum_to_delta(self):
+        """Mixed change patterns in one batch; unchanged fields get zero"""
+        befores = [BEFORE, BEFORE, AFTER]
+        afters = [
+            AFTER,
+            CalculationInput(7.0, "MoE (Mixture of Experts)", 500, 0, 30, "Global Average", "TPU v5", 2.5),
+            AFTER
+        ]
+        before_frame = CalculationInput.to_frame(befores)
+        before_frame.index = ["a", "b", "c"]
+        
+        result = ScenarioDiff.diff_batch(before_frame, CalculationInput.to_frame(afters))
+        
+        assert list(result.index) == ["a", "b", "c"]
+        for metric in ["total_co2", "total_cost", "total_water", "total_energy"]:
+            contributions = result[metric][list(CalculationInput.FIELDS)].sum(axis=1)
+            assert list(contributions) == pytest.approx(list(result[metric]["delta"]))
+        assert result[("total_co2", "params_b")]["a"] == 0
+        assert result[("total_co2", "delta")]["c"] == 0
+    
+    def test_format_report(self):
+        """Text report lists the changed fields with their share"""
+        text = ScenarioDiff.format_report(ScenarioDiff.diff(BEFORE, AFTER, metrics=["total_co2"]))
+        
+        assert text.startswith("total_co2: ")
+        assert "Location:" in text and "Hardware:" in text and "PUE:" in text
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
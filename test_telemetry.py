@@ -0,0 +1,133 @@
+# test_telemetry.py - OPTIONAL: Unit tests
+"""
+Unit tests for measured-power telemetry ingestion
+Run with: pytest test_telemetry.py
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from app import CalculationResult, Config, ImpactCalculator
+from pricing import PriceCatalog
+from telemetry import (TelemetryIntegrator, ingest, job_locations, measured_footprint, read_telemetry,
+                       to_calculation_results)
+
+CATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "price_catalog.example.json")
+DEFAULTS = {"location": "US-East (Virginia)", "hardware": "NVIDIA A100", "pue": 1.2}
+
+@pytest.fixture
+def power_log(tmp_path):
+    """Two jobs on two nodes each, samples of all series interleaved by time"""
+    rng = np.random.default_rng(7)
+    series = []
+    for job in ("job-a", "job-b"):
+        for node in (0, 1):
+            timestamps = np.sort(rng.uniform(0, 3600, 300))
+            series.append(pd.DataFrame({
+                "job_id": job, "node_id": node, "timestamp": timestamps, "power_w": rng.uniform(100, 400, 300)
+            }))
+    log = pd.concat(series).sort_values("timestamp")
+    path = tmp_path / "power.csv"
+    log.to_csv(path, index=False)
+    return str(path), log
+
+def expected_kwh(log):
+    """Reference trapezoidal energy per job, whole series at once"""
+    return {
+        job: sum(
+            np.trapz(group["power_w"], group["timestamp"]) for _, group in frame.groupby("node_id")
+        ) / 3600 / 1000
+        for job, frame in log.groupby("job_id")
+    }
+
+class TestTelemetryIntegrator:
+    """Test cases for chunked trapezoidal integration"""
+    
+    @pytest.mark.parametrize("chunksize", [7, 128, 100000])
+    def test_chunking_does_not_change_energy(self, power_log, chunksize):
+        """Energy per job matches whole-series integration for any chunk size"""
+        path, log = power_log
+        integrator = TelemetryIntegrator()
+        for chunk in read_telemetry(path, chunksize):
+            integrator.update(chunk)
+        totals = integrator.totals()
+        
+        for job, kwh in expected_kwh(log).items():
+            assert totals.loc[job, "it_energy_kwh"] == pytest.approx(kwh, rel=1e-12)
+        assert totals["samples"].tolist() == [600, 600]
+    
+    def test_long_gaps_are_skipped(self):
+        """Intervals above max_gap_s are not integrated"""
+        integrator = TelemetryIntegrator(max_gap_s=60)
+        integrator.update(pd.DataFrame({
+            "job": "j", "node": 0, "timestamp": [0.0, 10.0, 1000.0, 1010.0], "power": 360.0
+        }))
+        totals = integrator.totals()
+        
+        assert totals.loc["j", "device_hours"] == pytest.approx(20 / 3600)
+        assert totals.loc["j", "it_energy_kwh"] == pytest.approx(0.002)
+        assert totals.loc["j", "skipped_intervals"] == 1
+
+class TestMeasuredFootprint:
+    """Test cases for turning measured energy into results"""
+    
+    def test_footprint_uses_location_catalog(self, power_log):
+        """CO2/water/cost follow the catalog for the measured facility energy"""
+        path, log = power_log
+        footprint = ingest(path, defaults=DEFAULTS, chunksize=100)
+        row = footprint.loc["job-a"]
+        energy = expected_kwh(log)["job-a"] * DEFAULTS["pue"]
+        location = Config.LOCATIONS[DEFAULTS["location"]]
+        
+        assert list(footprint.columns[:len(CalculationResult.FIELDS)]) == list(CalculationResult.FIELDS)
+        assert row["training_energy"] == pytest.approx(energy)
+        assert row["training_co2"] == pytest.approx(energy * location["carbon"] / 1000)
+        assert row["training_water"] == pytest.approx(energy * location["water"])
+        assert row["training_embodied_co2"] == pytest.approx(
+            ImpactCalculator.calculate_embodied_carbon(row["device_hours"], DEFAULTS["hardware"])
+        )
+        assert row["inference_energy"] == 0
+        assert row["lifecycle_co2"] == pytest.approx(row["total_co2"] + row["total_embodied_co2"])
+    
+    def test_job_metadata_sets_phase_and_ethics(self, power_log):
+        """Per-job metadata overrides defaults and enables the ethical score"""
+        path, _ = power_log
+        jobs = pd.DataFrame(
+            {"phase": ["inference"], "params_b": [70.0], "model_type": ["Dense"]}, index=["job-b"]
+        )
+        results = to_calculation_results(ingest(path, jobs, DEFAULTS))
+        
+        assert results["job-b"].training_energy == 0
+        assert results["job-b"].inference_energy > 0
+        assert results["job-b"].ethical_score == ImpactCalculator.calculate_ethical_risk(70.0, "Dense")
+        assert results["job-a"].inference_energy == 0
+    
+    def test_time_of_use_pricing(self, monkeypatch):
+        """With a price catalog, each interval pays the tariff of its own hours"""
+        monkeypatch.setattr(ImpactCalculator, "PRICING", PriceCatalog.from_file(CATALOG_FILE))
+        # 1 kW on Monday 19:00-23:00 (epoch seconds, read as local time); the
+        # US-East weekday peak of 0.13 $/kWh ends at 21:00, then 0.08
+        start = np.datetime64("2025-01-06T19:00", "s").astype(np.int64)
+        integrator = TelemetryIntegrator(locations=job_locations(defaults=DEFAULTS))
+        integrator.update(pd.DataFrame({
+            "job": "j", "node": 0, "timestamp": start + np.arange(0, 4 * 3600 + 1, 1800.0), "power": 1000.0
+        }))
+        footprint = measured_footprint(integrator.totals(), defaults=DEFAULTS)
+        
+        assert integrator.totals().loc["j", "it_energy_cost"] == pytest.approx(2 * 0.13 + 2 * 0.08)
+        assert footprint.loc["j", "training_cost"] == pytest.approx(4 * 3.0 + 0.42 * DEFAULTS["pue"])
+        
+        unpriced = TelemetryIntegrator()
+        unpriced.update(pd.DataFrame({"job": "j", "node": 0, "timestamp": [0.0, 3600.0], "power": 1000.0}))
+        assert np.isnan(unpriced.totals().loc["j", "it_energy_cost"])
+    
+    def test_missing_metadata_raises(self, power_log):
+        """Jobs without location/hardware/PUE are rejected"""
+        path, _ = power_log
+        with pytest.raises(KeyError):
+            ingest(path, defaults={"location": "US-East (Virginia)"})
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,187 @@
+# test_utils.py - OPTIONAL: Unit tests
+"""
+Unit tests for utility helpers
+Run with: pytest test_utils.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from utils import (ArrayConversionHelpers, ArrayFormatters, BatchValidationError, BatchValidators,
+                   ConversionHelpers, DataHelpers, Formatters, Validators)
+
+LOCATIONS = ["Global Average", "EU-North (Finland)"]
+
+def make_frame():
+    return pd.DataFrame({
+        "params_b": [7.0, 0.001, 20000.0, np.nan],
+        "training_hours": [1000, 1000, 1000, 1000],
+        "tokens_per_day": [0, 10, 10, 10],
+        "pue": [1.5, 1.5, 3.5, 1.5],
+        "inference_days": [365, 365, 365, 365],
+        "location": ["Global Average", "Global Average", "Mars Base", "EU-North (Finland)"]
+    }, index=[10, 11, 12, 13])
+
+class TestBatchValidators:
+    """Test cases for column-wise validation"""
+    
+    def test_report_matches_scalar_validators(self):
+        """Bulk bounds agree with the scalar Validators"""
+        frame = make_frame()
+        
+        report = BatchValidators.check(frame, categories={"location": LOCATIONS})
+        
+        scalar_bad = [
+            not (Validators.validate_params_billions(row.params_b) and Validators.validate_pue(row.pue))
+            or row.location not in LOCATIONS
+            for row in frame.itertuples()
+        ]
+        assert list(report.invalid) == scalar_bad
+        assert report.errors[["row", "field", "reason"]].values.tolist() == [
+            [11, "params_b", "below_min"],
+            [12, "params_b", "above_max"],
+            [12, "pue", "above_max"],
+            [12, "location", "unknown_category"],
+            [13, "params_b", "missing"]
+        ]
+    
+    def test_reject_policy_raises(self):
+        """Reject policy raises with the report attached"""
+        with pytest.raises(BatchValidationError) as error:
+            BatchValidators.apply(make_frame(), "reject", categories={"location": LOCATIONS})
+        
+        assert error.value.report.n_invalid == 3
+    
+    def test_clip_and_quarantine_policies(self):
+        """Clip fixes ranges, quarantine splits rows off unchanged"""
+        categories = {"location": LOCATIONS}
+        
+        clean, quarantined, _ = BatchValidators.apply(make_frame(), "clip", categories=categories)
+        assert list(clean.index) == [10, 11]
+        assert clean.loc[11, "params_b"] == 0.01
+        assert list(quarantined.index) == [12, 13]
+        
+        clean, quarantined, _ = BatchValidators.apply(make_frame(), "quarantine", categories=categories)
+        assert list(clean.index) == [10]
+        assert quarantined.loc[11, "params_b"] == 0.001
+    
+    def test_duplicate_index_labels(self):
+        """Labels repeated after pd.concat are reported in row order"""
+        frame = pd.concat([make_frame(), make_frame()])
+        
+        report = BatchValidators.check(frame, categories={"location": LOCATIONS})
+        
+        assert report.n_invalid == 6
+        assert list(report.errors["row"]) == [11, 12, 12, 12, 13] * 2
+    
+    def test_missing_column_reported_once(self):
+        """A missing column is one error row but invalidates every row"""
+        report = BatchValidators.check(make_frame().drop(columns="pue"))
+        
+        missing = report.errors[report.errors["reason"] == "missing_column"]
+        assert missing[["row", "field"]].values.tolist() == [[None, "pue"]]
+        assert report.n_invalid == 4
+
+class TestArrayHelpers:
+    """Test cases for array-aware formatters and conversions"""
+    
+    VALUES = np.array([0.0, 0.005, 2.5, 1023.999, 1024.0, 1234567.891, -98765.4321, 1e18, np.nan])
+    
+    @pytest.mark.parametrize("method", [
+        "format_currency", "format_percentage", "format_scientific", "format_bytes"
+    ])
+    def test_formatters_match_per_cell(self, method):
+        """Array formatters produce exactly the per-cell strings"""
+        expected = [getattr(Formatters, method)(value) for value in self.VALUES]
+        
+        assert list(getattr(ArrayFormatters, method)(self.VALUES)) == expected
+    
+    def test_format_number_keeps_series_index(self):
+        """Series in, Series out with the same index"""
+        series = pd.Series(self.VALUES, index=range(10, 19), name="total_co2")
+        
+        formatted = ArrayFormatters.format_number(series, decimals=2)
+        
+        assert list(formatted.index) == list(series.index)
+        assert list(formatted) == [Formatters.format_number(value, 2) for value in self.VALUES]
+    
+    def test_convert_columns(self):
+        """Column conversions match the scalar helpers"""
+        frame = pd.DataFrame({"total_energy": [1500.0, 20.0], "total_water": [10.0, 0.0]})
+        
+        converted = ArrayConversionHelpers.convert_columns(
+            frame, {"total_energy": "kwh_to_mwh", "total_water": "liters_to_gallons"},
+            renames={"total_energy": "total_energy_mwh"}
+        )
+        
+        assert list(converted["total_energy_mwh"]) == [ConversionHelpers.kwh_to_mwh(1500.0), 0.02]
+        assert converted["total_water"].iloc[0] == ConversionHelpers.liters_to_gallons(10.0)
+        with pytest.raises(ValueError):
+            ArrayConversionHelpers.convert(frame["total_energy"], "params_to_flops")
+
+def reference_moving_average(values, window):
+    """The original O(n*w) slice-and-sum implementation"""
+    if len(values) < window:
+        return values
+    return [
+        sum(values[max(0, i - window + 1):i + 1]) / len(values[max(0, i - window + 1):i + 1])
+        for i in range(len(values))
+    ]
+
+class TestRollingHelpers:
+    """Test cases for O(n) moving averages and streaming variants"""
+    
+    @pytest.mark.parametrize("window", [1, 3, 24, 500])
+    def test_moving_average_matches_reference(self, window):
+        """O(n) moving average agrees with the slice-and-sum version"""
+        values = np.random.default_rng(window).lognormal(3, 2, 2000).tolist()
+        
+        expected = reference_moving_average(values, window)
+        
+        assert DataHelpers.moving_average(values, window) == pytest.approx(expected, rel=1e-12)
+        assert list(DataHelpers.stream_moving_average(iter(values), window)) == pytest.approx(expected, rel=1e-12)
+    
+    def test_moving_average_edge_cases(self):
+        """Short input is returned as is; NaN propagates through its window"""
+        short = [1, 2]
+        assert DataHelpers.moving_average(short, 3) is short
+        
+        values = [1.0, 2.0, float("nan"), 4.0, 5.0, 6.0]
+        expected = reference_moving_average(values, 2)
+        assert DataHelpers.moving_average(values, 2) == pytest.approx(expected, nan_ok=True)
+        assert list(DataHelpers.stream_moving_average(values, 2)) == pytest.approx(expected, nan_ok=True)
+        
+        with pytest.raises(ValueError):
+            DataHelpers.rolling_mean(values, 0)
+    
+    def test_rolling_sum(self):
+        """Trailing sums with a shorter window at the start"""
+        assert list(DataHelpers.rolling_sum([1, 2, 3, 4], 2)) == [1, 3, 5, 7]
+    
+    @pytest.mark.parametrize("window", [1, 2, 3])
+    def test_non_finite_values_propagate(self, window):
+        """inf, -inf and NaN reach exactly the windows holding them, as in the slice-and-sum version"""
+        inf = float("inf")
+        values = [1.0, inf, 1.0, 1.0, -inf, inf, 1.0, 1.0, float("nan"), 1.0, 1.0, 1.0]
+        
+        expected = reference_moving_average(values, window)
+        
+        assert DataHelpers.moving_average(values, window) == pytest.approx(expected, nan_ok=True)
+        assert list(DataHelpers.stream_moving_average(values, window)) == pytest.approx(expected, nan_ok=True)
+        sums = [mean * min(i + 1, window) for i, mean in enumerate(expected)]
+        assert list(DataHelpers.rolling_sum(values, window)) == pytest.approx(sums, nan_ok=True)
+        assert DataHelpers.moving_average([1, inf, 1, 1, 1, 1], 2) == [1.0, inf, inf, 1.0, 1.0, 1.0]
+    
+    def test_exponential_moving_average(self):
+        """Array and streaming EMA follow s[t] = a*x[t] + (1-a)*s[t-1]"""
+        values = [10.0, 20.0, 30.0]
+        
+        expected = [10.0, 15.0, 22.5]
+        
+        assert list(DataHelpers.exponential_moving_average(values, alpha=0.5)) == expected
+        assert list(DataHelpers.stream_exponential_moving_average(values, span=3)) == expected
+        with pytest.raises(ValueError):
+            DataHelpers.exponential_moving_average(values, alpha=0.5, span=3)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
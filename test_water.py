@@ -0,0 +1,97 @@
+# test_water.py - OPTIONAL: Unit tests
+"""
+Unit tests for the seasonal water footprint model
+Run with: pytest test_water.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from app import CalculationInput, Config, ImpactCalculator
+from water import WATER_PROFILES, WaterModel
+
+@pytest.fixture(scope="module")
+def model():
+    return WaterModel()
+
+@pytest.fixture(scope="module")
+def fleet():
+    scenarios = [
+        CalculationInput(params_b, "Dense", 1000, 10000000, 365, location, "NVIDIA A100", 1.5)
+        for params_b in (7.0, 70.0) for location in Config.LOCATIONS
+    ]
+    inputs = CalculationInput.to_frame(scenarios)
+    return inputs, ImpactCalculator.calculate_batch(inputs)
+
+class TestWaterModel:
+    """Test cases for WUE series and water profiles"""
+    
+    def test_annual_wue_matches_catalog(self, model):
+        """Seasonal series keep the catalog L/kWh as their annual mean"""
+        for code, location in enumerate(model.locations):
+            assert model.hourly_wue[code].mean() == pytest.approx(Config.LOCATIONS[location]["water"])
+        monthly = model.monthly_wue()
+        assert monthly.loc[7, "EU-North (Finland)"] > monthly.loc[1, "EU-North (Finland)"]
+    
+    def test_onsite_total_matches_scalar_water(self, model):
+        """On-site water of phases lasting whole years equals calculate_water_usage"""
+        inputs = CalculationInput.to_frame([
+            CalculationInput(70.0, "Dense", Config.HOURS_PER_YEAR, 10000000, days, location, "NVIDIA A100", 1.5)
+            for days in (365, 1095) for location in Config.LOCATIONS
+        ])
+        results = ImpactCalculator.calculate_batch(inputs)
+        totals = model.annual_totals(inputs, results)
+        
+        np.testing.assert_allclose(totals["onsite_water"], results["total_water"], rtol=1e-9)
+        grid = inputs["location"].map(lambda location: WATER_PROFILES[location]["grid_water"])
+        np.testing.assert_allclose(totals["offsite_water"], results["total_energy"] * grid, rtol=1e-9)
+        scarcity = inputs["location"].map(lambda location: WATER_PROFILES[location]["scarcity"])
+        np.testing.assert_allclose(
+            totals["scarcity_weighted_water"], totals["total_water"] * scarcity, rtol=1e-9
+        )
+    
+    def test_hourly_and_monthly_profiles_agree(self, fleet, model):
+        """Hourly profiles sum to the monthly ones, whatever the chunk size"""
+        inputs, results = fleet
+        monthly = pd.concat(model.iter_profiles(inputs, results, "month", chunk_rows=5))
+        hourly = pd.concat(model.iter_profiles(inputs, results, "hour", chunk_rows=3))
+        by_month = hourly["total_water"].T.groupby(model.month_of_hour + 1).sum().T
+        
+        assert monthly.shape == (len(inputs), 4 * 12)
+        np.testing.assert_allclose(by_month.to_numpy(), monthly["total_water"].to_numpy(), rtol=1e-9)
+    
+    def test_profiles_follow_the_scenario_period(self, model):
+        """Short phases stay in their months; multi-year phases wrap, not compress"""
+        inputs = CalculationInput.to_frame([
+            CalculationInput(7.0, "Dense", 24, 10000000, days, "EU-North (Finland)", "NVIDIA A100", 1.5)
+            for days in (31, 365, 730)
+        ])
+        results = ImpactCalculator.calculate_batch(inputs)
+        energy, onsite = model.spread(np.full(3, model.locations.index("EU-North (Finland)")),
+                                      results["inference_energy"].to_numpy(), inputs["inference_days"].to_numpy() * 24)
+        monthly = next(model.iter_profiles(inputs, results, "month"))["onsite_water"].to_numpy()
+        
+        np.testing.assert_allclose(energy.sum(axis=1), results["inference_energy"], rtol=1e-12)
+        np.testing.assert_allclose(onsite[2], 2 * onsite[1], rtol=1e-12)
+        # A January-only job sees the season's low cooling demand, below the annual constant
+        assert (monthly[0, 1:] == 0).all()
+        january = model.monthly_wue().loc[1, "EU-North (Finland)"] * results["inference_energy"][0]
+        assert onsite[0, 0] == pytest.approx(january)
+        assert monthly[0, 0] < results["total_water"][0]
+    
+    def test_explicit_monthly_series(self):
+        """Profiles may give their own monthly WUE"""
+        profiles = dict(WATER_PROFILES)
+        profiles["Global Average"] = dict(profiles["Global Average"], monthly_wue=[1.0] * 6 + [5.0] * 6)
+        monthly = WaterModel(profiles).monthly_wue()
+        
+        assert list(monthly["Global Average"]) == [1.0] * 6 + [5.0] * 6
+    
+    def test_missing_profile_raises(self):
+        """Every catalog location needs a water profile"""
+        profiles = {location: WATER_PROFILES[location] for location in list(WATER_PROFILES)[1:]}
+        with pytest.raises(KeyError):
+            WaterModel(profiles)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -5,30 +5,56 @@ Helper functions for formatting, validation, and common operations
 """
 
 import re
-from typing import Dict, Any, Optional
+from collections import deque
+from itertools import repeat
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[np.ndarray, pd.Series]
 
 class Validators:
     """Input validation utilities"""
     
+    # Inclusive (min, max) bounds per CalculationInput field
+    BOUNDS = {
+        "params_b": (0.01, 10000.0),
+        "training_hours": (1, 1000000),
+        "tokens_per_day": (0, 10000000000),
+        "pue": (1.0, 3.0),
+        "inference_days": (1, 3650)
+    }
+    
     @staticmethod
     def validate_params_billions(value: float) -> bool:
         """Validate parameter count is within reasonable range"""
-        return 0.01 <= value <= 10000.0
+        low, high = Validators.BOUNDS["params_b"]
+        return low <= value <= high
     
     @staticmethod
     def validate_training_hours(value: int) -> bool:
         """Validate training hours"""
-        return 1 <= value <= 1000000
+        low, high = Validators.BOUNDS["training_hours"]
+        return low <= value <= high
     
     @staticmethod
     def validate_tokens(value: int) -> bool:
         """Validate token count"""
-        return 0 <= value <= 10000000000
+        low, high = Validators.BOUNDS["tokens_per_day"]
+        return low <= value <= high
     
     @staticmethod
     def validate_pue(value: float) -> bool:
         """Validate PUE value"""
-        return 1.0 <= value <= 3.0
+        low, high = Validators.BOUNDS["pue"]
+        return low <= value <= high
+    
+    @staticmethod
+    def validate_inference_days(value: int) -> bool:
+        """Validate inference period in days"""
+        low, high = Validators.BOUNDS["inference_days"]
+        return low <= value <= high
     
     @staticmethod
     def validate_email(email: str) -> bool:
@@ -36,6 +62,159 @@ class Validators:
         pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
         return re.match(pattern, email) is not None
 
+class ValidationReport:
+    """Row-level errors found by BatchValidators"""
+    
+    COLUMNS = ["row", "field", "reason", "value"]
+    
+    def __init__(self, errors: pd.DataFrame, invalid: np.ndarray, n_rows: int):
+        self.errors = errors
+        self.invalid = invalid
+        self.n_rows = n_rows
+    
+    @property
+    def ok(self) -> bool:
+        return not self.invalid.any()
+    
+    @property
+    def n_invalid(self) -> int:
+        return int(self.invalid.sum())
+    
+    def summary(self) -> pd.DataFrame:
+        """Error counts per field and reason"""
+        return self.errors.groupby(["field", "reason"]).size().rename("rows").reset_index()
+
+class BatchValidationError(ValueError):
+    """Raised by the "reject" policy; carries the full ValidationReport"""
+    
+    def __init__(self, report: ValidationReport):
+        self.report = report
+        super().__init__(
+            f"{report.n_invalid} of {report.n_rows} rows failed validation "
+            f"({len(report.errors)} errors)"
+        )
+
+class BatchValidators:
+    """Column-wise validation against the Validators bounds"""
+    
+    POLICIES = ("reject", "clip", "quarantine")
+    
+    @staticmethod
+    def check(frame: pd.DataFrame, categories: Optional[Dict[str, Iterable[str]]] = None,
+              bounds: Optional[Dict[str, Tuple[float, float]]] = None) -> ValidationReport:
+        """
+        Validate whole columns in one pass per check.
+        
+        Args:
+            frame: Batch input frame
+            categories: Column -> allowed values (e.g. known locations)
+            bounds: Column -> inclusive (min, max), defaults to Validators.BOUNDS
+            
+        Returns:
+            ValidationReport with one error row per (row, field) problem;
+            reasons are missing_column, missing, not_numeric, below_min,
+            above_max and unknown_category. A missing column is reported
+            once, with row None, but makes every row invalid.
+        """
+        bounds = Validators.BOUNDS if bounds is None else bounds
+        categories = categories or {}
+        n_rows = len(frame)
+        invalid = np.zeros(n_rows, dtype=bool)
+        parts = []
+        
+        def record(field, reason, mask, values):
+            positions = np.flatnonzero(mask)
+            if len(positions):
+                invalid[positions] = True
+                parts.append(pd.DataFrame({
+                    "position": positions,
+                    "row": frame.index[positions],
+                    "field": field,
+                    "reason": reason,
+                    "value": np.asarray(values, dtype=object)[positions]
+                }))
+        
+        def record_missing_column(field):
+            invalid[:] = True
+            parts.append(pd.DataFrame({
+                "position": [-1], "row": [None], "field": field, "reason": "missing_column", "value": [None]
+            }))
+        
+        for field, (low, high) in bounds.items():
+            if field not in frame.columns:
+                record_missing_column(field)
+                continue
+            raw = frame[field]
+            values = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=float)
+            missing = raw.isna().to_numpy()
+            record(field, "missing", missing, raw)
+            record(field, "not_numeric", np.isnan(values) & ~missing, raw)
+            record(field, "below_min", values < low, raw)
+            record(field, "above_max", values > high, raw)
+        
+        for field, allowed in categories.items():
+            if field not in frame.columns:
+                record_missing_column(field)
+                continue
+            raw = frame[field]
+            codes = pd.Categorical(raw, categories=list(allowed)).codes
+            missing = raw.isna().to_numpy()
+            record(field, "missing", missing, raw)
+            record(field, "unknown_category", (codes < 0) & ~missing, raw)
+        
+        if parts:
+            errors = pd.concat(parts, ignore_index=True)
+            # Sort by position, not label, so duplicate index labels work;
+            # the stable sort keeps check order within a row
+            errors = errors.iloc[np.argsort(errors["position"].to_numpy(), kind="stable")]
+            errors = errors[ValidationReport.COLUMNS].reset_index(drop=True)
+        else:
+            errors = pd.DataFrame(columns=ValidationReport.COLUMNS)
+        return ValidationReport(errors, invalid, n_rows)
+    
+    @staticmethod
+    def apply(frame: pd.DataFrame, policy: str = "reject",
+              categories: Optional[Dict[str, Iterable[str]]] = None,
+              bounds: Optional[Dict[str, Tuple[float, float]]] = None
+              ) -> Tuple[pd.DataFrame, pd.DataFrame, ValidationReport]:
+        """
+        Validate and apply a policy to bad rows.
+        
+        Policies:
+            reject: raise BatchValidationError if any row is invalid
+            clip: clamp out-of-range numbers to the bounds; rows that are
+                still invalid (missing, non-numeric, unknown category) are
+                quarantined
+            quarantine: split invalid rows off unchanged
+            
+        Returns:
+            (valid rows, quarantined rows, report of the original frame)
+            
+        Raises:
+            ValueError: If the policy is unknown
+            BatchValidationError: For the reject policy when rows are invalid
+        """
+        if policy not in BatchValidators.POLICIES:
+            raise ValueError(f"Unknown policy '{policy}' (expected one of {', '.join(BatchValidators.POLICIES)})")
+        bounds = Validators.BOUNDS if bounds is None else bounds
+        report = BatchValidators.check(frame, categories, bounds)
+        
+        if policy == "reject":
+            if not report.ok:
+                raise BatchValidationError(report)
+            return frame, frame.iloc[:0], report
+        
+        if policy == "clip" and not report.ok:
+            frame = frame.copy()
+            for field, (low, high) in bounds.items():
+                if field in frame.columns and pd.api.types.is_numeric_dtype(frame[field]):
+                    frame[field] = frame[field].clip(low, high)
+            invalid = BatchValidators.check(frame, categories, bounds).invalid
+        else:
+            invalid = report.invalid
+        
+        return frame[~invalid], frame[invalid], report
+
 class Formatters:
     """Output formatting utilities"""
     
@@ -70,6 +249,84 @@ class Formatters:
             bytes_value /= 1024.0
         return f"{bytes_value:.2f} PB"
 
+class ArrayFormatters:
+    """Formatters for NumPy arrays / pandas Series, same output as Formatters"""
+    
+    @staticmethod
+    def _format(values: ArrayLike, spec: str, prefix: str = "", suffix: str = "") -> ArrayLike:
+        # Formats each distinct value once and scatters the strings back;
+        # format() is used so the text matches the per-cell f-strings exactly.
+        codes, uniques = pd.factorize(np.asarray(values, dtype=float).ravel(), use_na_sentinel=False)
+        texts = np.array(
+            [prefix + text + suffix for text in map(format, uniques.tolist(), repeat(spec))],
+            dtype=object
+        )
+        result = texts[codes].reshape(np.shape(values))
+        if isinstance(values, pd.Series):
+            return pd.Series(result, index=values.index, name=values.name)
+        return result
+    
+    @staticmethod
+    def format_number(values: ArrayLike, decimals: int = 0) -> ArrayLike:
+        """Format numbers with thousand separators"""
+        return ArrayFormatters._format(values, f",.{decimals}f")
+    
+    @staticmethod
+    def format_currency(values: ArrayLike) -> ArrayLike:
+        """Format as USD currency"""
+        return ArrayFormatters._format(values, ",.2f", prefix="$")
+    
+    @staticmethod
+    def format_percentage(values: ArrayLike) -> ArrayLike:
+        """Format as percentages"""
+        return ArrayFormatters._format(values, ".1f", suffix="%")
+    
+    @staticmethod
+    def format_scientific(values: ArrayLike) -> ArrayLike:
+        """Format in scientific notation"""
+        return ArrayFormatters._format(values, ".2e")
+    
+    @staticmethod
+    def format_bytes(values: ArrayLike) -> ArrayLike:
+        """Format byte counts to human readable units"""
+        scaled = np.asarray(values, dtype=float).copy()
+        unit_index = np.zeros(scaled.shape, dtype=np.int8)
+        units = ['B', 'KB', 'MB', 'GB', 'TB', 'PB']
+        # Same repeated division as Formatters.format_bytes, one pass per unit
+        for step in range(1, len(units)):
+            larger = ~(scaled < 1024.0)
+            if not larger.any():
+                break
+            scaled[larger] /= 1024.0
+            unit_index[larger] = step
+        result = np.empty(scaled.shape, dtype=object)
+        for step, unit in enumerate(units):
+            selected = unit_index == step
+            if selected.any():
+                result[selected] = ArrayFormatters._format(scaled[selected], ".2f", suffix=f" {unit}")
+        if isinstance(values, pd.Series):
+            return pd.Series(result, index=values.index, name=values.name)
+        return result
+    
+    @staticmethod
+    def format_frame(frame: pd.DataFrame, formats: Dict[str, str]) -> pd.DataFrame:
+        """
+        Format selected columns of a table.
+        
+        Args:
+            frame: Numeric table
+            formats: Column -> ArrayFormatters method name, or (name, kwargs), e.g.
+                {"total_cost": "format_currency", "total_co2": ("format_number", {"decimals": 2})}
+            
+        Returns:
+            Copy of `frame` with the listed columns replaced by strings
+        """
+        formatted = frame.copy()
+        for column, method in formats.items():
+            name, kwargs = (method, {}) if isinstance(method, str) else method
+            formatted[column] = getattr(ArrayFormatters, name)(frame[column], **kwargs)
+        return formatted
+
 class DataHelpers:
     """Data manipulation helpers"""
     
@@ -92,12 +349,103 @@ class DataHelpers:
         """Calculate moving average"""
         if len(values) < window:
             return values
-        result = []
-        for i in range(len(values)):
-            start = max(0, i - window + 1)
-            end = i + 1
-            result.append(sum(values[start:end]) / len(values[start:end]))
+        return DataHelpers.rolling_mean(values, window).tolist()
+    
+    @staticmethod
+    def _rolling(values: ArrayLike, window: int, how: str) -> np.ndarray:
+        # pandas' rolling kernels add/remove one element per step (O(n)) with
+        # compensated summation, so long series don't drift like a plain
+        # cumulative sum. min_periods=1 gives the expanding start that
+        # moving_average has always produced.
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        data = np.asarray(values, dtype=float)
+        finite = np.isfinite(data)
+        if finite.all():
+            return getattr(pd.Series(data).rolling(window, min_periods=1), how)().to_numpy()
+        # pandas skips NaN and +-inf inside a window; a plain sum propagates
+        # them, so those windows get what the sum of their non-finite values gives
+        result = getattr(pd.Series(np.where(finite, data, 0.0)).rolling(window, min_periods=1), how)().to_numpy()
+        
+        def in_window(mask):
+            counts = np.concatenate(([0], np.cumsum(mask)))
+            return counts[1:] - counts[np.maximum(np.arange(1, len(mask) + 1) - window, 0)] > 0
+        
+        positive, negative = in_window(data == np.inf), in_window(data == -np.inf)
+        result[positive] = np.inf
+        result[negative] = -np.inf
+        result[in_window(np.isnan(data)) | (positive & negative)] = np.nan
         return result
+    
+    @staticmethod
+    def rolling_mean(values: ArrayLike, window: int) -> np.ndarray:
+        """O(n) moving average; the first window-1 points average what is available"""
+        return DataHelpers._rolling(values, window, "mean")
+    
+    @staticmethod
+    def rolling_sum(values: ArrayLike, window: int) -> np.ndarray:
+        """O(n) trailing sum over `window` points (shorter at the start)"""
+        return DataHelpers._rolling(values, window, "sum")
+    
+    @staticmethod
+    def _ema_alpha(alpha: Optional[float], span: Optional[float]) -> float:
+        if (alpha is None) == (span is None):
+            raise ValueError("Pass exactly one of alpha or span")
+        if alpha is None:
+            alpha = 2 / (span + 1)
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        return alpha
+    
+    @staticmethod
+    def exponential_moving_average(values: ArrayLike, alpha: Optional[float] = None,
+                                   span: Optional[float] = None) -> np.ndarray:
+        """
+        Exponential moving average s[t] = alpha * x[t] + (1 - alpha) * s[t-1], s[0] = x[0].
+        
+        Args:
+            values: Series to smooth
+            alpha: Smoothing factor in (0, 1]
+            span: Alternative to alpha, alpha = 2 / (span + 1)
+        """
+        alpha = DataHelpers._ema_alpha(alpha, span)
+        data = pd.Series(np.asarray(values, dtype=float))
+        return data.ewm(alpha=alpha, adjust=False, ignore_na=False).mean().to_numpy()
+    
+    @staticmethod
+    def stream_moving_average(values: Iterable[float], window: int = 3) -> Iterator[float]:
+        """
+        Moving average over an iterator, holding only `window` values.
+        
+        Yields the rolling_mean sequence up to rounding. The running sum is
+        updated incrementally and recomputed from the window every `window`
+        steps, so error cannot build up over very long streams; but while a
+        window mixes very different magnitudes (1e16 next to 1) the small
+        values can be lost, where rolling_mean keeps them.
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        buffer = deque(maxlen=window)
+        total = 0.0
+        for step, value in enumerate(values, start=1):
+            if len(buffer) == window:
+                total -= buffer[0]
+            buffer.append(value)
+            total += value
+            if step % window == 0 or total != total:
+                # NaN never subtracts back out, so resum while one is in the window
+                total = float(sum(buffer))
+            yield total / len(buffer)
+    
+    @staticmethod
+    def stream_exponential_moving_average(values: Iterable[float], alpha: Optional[float] = None,
+                                          span: Optional[float] = None) -> Iterator[float]:
+        """Streaming counterpart of exponential_moving_average (O(1) memory)"""
+        alpha = DataHelpers._ema_alpha(alpha, span)
+        smoothed = None
+        for value in values:
+            smoothed = value if smoothed is None else alpha * value + (1 - alpha) * smoothed
+            yield smoothed
 
 class ConversionHelpers:
     """Unit conversion helpers"""
@@ -126,4 +474,35 @@ class ConversionHelpers:
     def params_to_flops(params_billions: float, tokens: int = 1) -> float:
         """Estimate FLOPs from parameters and tokens"""
         # Rough estimate: 6 * params * tokens for transformer
-        return 6 * params_billions * 1e9 * tokens
\ No newline at end of file
+        return 6 * params_billions * 1e9 * tokens
+
+class ArrayConversionHelpers:
+    """Column-wise unit conversions for arrays and tables"""
+    
+    # Single-argument ConversionHelpers usable on whole columns
+    CONVERSIONS = ("kwh_to_mwh", "kg_to_tons", "liters_to_gallons", "celsius_to_fahrenheit")
+    
+    @staticmethod
+    def convert(values: ArrayLike, conversion: str) -> ArrayLike:
+        """Apply a ConversionHelpers function to a whole array/Series"""
+        if conversion not in ArrayConversionHelpers.CONVERSIONS:
+            raise ValueError(f"Unknown conversion '{conversion}'")
+        if isinstance(values, pd.Series):
+            return getattr(ConversionHelpers, conversion)(values)
+        return getattr(ConversionHelpers, conversion)(np.asarray(values, dtype=float))
+    
+    @staticmethod
+    def convert_columns(frame: pd.DataFrame, conversions: Dict[str, str],
+                        renames: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        Convert table columns in place of a copy, e.g. {"total_energy": "kwh_to_mwh"}.
+        
+        Args:
+            frame: Numeric table
+            conversions: Column -> conversion name (see CONVERSIONS)
+            renames: Optional column renames applied afterwards
+        """
+        converted = frame.copy()
+        for column, conversion in conversions.items():
+            converted[column] = ArrayConversionHelpers.convert(frame[column], conversion)
+        return converted.rename(columns=renames or {})
\ No newline at end of file
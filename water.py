@@ -0,0 +1,283 @@
+# water.py - OPTIONAL: Seasonal water footprint model
+"""
+Water footprint model for AI Model Eco & Ethics Calculator
+Extends the single annual L/kWh constant of Config.LOCATIONS with:
+- an hourly on-site WUE series per location (seasonal cooling demand plus a
+  daily cycle), scaled so its annual mean is the catalog constant
+- off-site water consumed by electricity generation (L per kWh drawn)
+- a water-scarcity factor weighting consumption by local water stress
+
+Profiles are evaluated over time-indexed arrays in row chunks, so annual
+monthly or hourly profiles for a whole fleet stay fast and bounded in memory.
+
+This is a standalone estimator next to the calculators: calculate_all,
+calculate_batch and the app keep the single annual L/kWh constant.
+Scenario profiles place each phase on the calendar from January 1 of
+PROFILE_YEAR for its own duration (training_hours, inference_days); phases
+longer than a year wrap around, so every period sums all the years of
+the scenario.
+
+Usage:
+    python water.py scenarios.csv -o water_monthly.csv --freq month
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from app import Config, ImpactCalculator
+
+# Per-location water parameters:
+# grid_water: L consumed per kWh by the generation mix (off-site)
+# scarcity: water stress factor (1.0 = world average, AWARE-style)
+# seasonal_amplitude / peak_month: relative swing of cooling water over the year
+# diurnal_amplitude / peak_hour: relative swing over the day (local time)
+WATER_PROFILES = {
+    "US-West (Oregon)": {"grid_water": 4.0, "scarcity": 1.5, "seasonal_amplitude": 0.4, "peak_month": 8,
+                         "diurnal_amplitude": 0.15, "peak_hour": 15},
+    "US-East (Virginia)": {"grid_water": 2.2, "scarcity": 1.0, "seasonal_amplitude": 0.35, "peak_month": 7,
+                           "diurnal_amplitude": 0.1, "peak_hour": 15},
+    "EU-West (Ireland)": {"grid_water": 1.2, "scarcity": 0.4, "seasonal_amplitude": 0.2, "peak_month": 7,
+                          "diurnal_amplitude": 0.05, "peak_hour": 15},
+    "EU-Central (Germany)": {"grid_water": 1.6, "scarcity": 0.9, "seasonal_amplitude": 0.3, "peak_month": 7,
+                             "diurnal_amplitude": 0.1, "peak_hour": 15},
+    "EU-North (Finland)": {"grid_water": 1.0, "scarcity": 0.2, "seasonal_amplitude": 0.5, "peak_month": 7,
+                           "diurnal_amplitude": 0.05, "peak_hour": 15},
+    "Asia-Pacific (Singapore)": {"grid_water": 1.5, "scarcity": 2.5, "seasonal_amplitude": 0.05, "peak_month": 5,
+                                 "diurnal_amplitude": 0.1, "peak_hour": 14},
+    "Asia-East (Tokyo)": {"grid_water": 1.8, "scarcity": 1.3, "seasonal_amplitude": 0.3, "peak_month": 8,
+                          "diurnal_amplitude": 0.1, "peak_hour": 14},
+    "Global Average": {"grid_water": 2.0, "scarcity": 1.0, "seasonal_amplitude": 0.2, "peak_month": 7,
+                       "diurnal_amplitude": 0.1, "peak_hour": 15}
+}
+
+PROFILE_YEAR = 2025  # non-leap, so one year is Config.HOURS_PER_YEAR hours
+# Scenario x period cells per quantity in one chunk (about 16 MB of float64)
+CHUNK_CELLS = 2000000
+FREQUENCIES = ("month", "hour")
+
+class WaterModel:
+    """Hourly WUE, grid water and scarcity per location, evaluated on arrays"""
+
+    def __init__(self, profiles: Optional[Dict[str, dict]] = None):
+        """
+        Args:
+            profiles: Location -> parameters as in WATER_PROFILES. A profile
+                may also give explicit "monthly_wue" (12 values) or
+                "hourly_wue" (Config.HOURS_PER_YEAR values) in L/kWh.
+
+        Raises:
+            KeyError: If a Config.LOCATIONS entry has no profile
+        """
+        self.profiles = profiles or WATER_PROFILES
+        missing = [location for location in Config.LOCATIONS if location not in self.profiles]
+        if missing:
+            raise KeyError(f"No water profile for: {', '.join(missing)}")
+        self.locations = list(Config.LOCATIONS)
+        self.hours = pd.date_range(f"{PROFILE_YEAR}-01-01", periods=Config.HOURS_PER_YEAR, freq="h")
+        self.month_of_hour = self.hours.month.to_numpy() - 1
+        # locations x hours, built once; every evaluation is a gather from it
+        self.hourly_wue = np.vstack([self._hourly_series(location) for location in self.locations])
+        self.hours_per_month = np.bincount(self.month_of_hour, minlength=12)
+        # Cumulative WUE-hours per location, for the water of partly covered periods
+        self.cumulative_wue = np.hstack([np.zeros((len(self.locations), 1)), np.cumsum(self.hourly_wue, axis=1)])
+        # Mean WUE per period, the energy-weighted mean for a flat load within the period
+        self.period_wue = {
+            "hour": self.hourly_wue,
+            "month": (self.hourly_wue @ np.eye(12)[self.month_of_hour]) / self.hours_per_month
+        }
+        self.period_hours = {"hour": np.ones(Config.HOURS_PER_YEAR), "month": self.hours_per_month.astype(float)}
+        self.period_starts = {freq: np.cumsum(hours) - hours for freq, hours in self.period_hours.items()}
+        self.grid_water = np.array([self.profiles[location]["grid_water"] for location in self.locations], dtype=float)
+        self.scarcity = np.array([self.profiles[location]["scarcity"] for location in self.locations], dtype=float)
+
+    @classmethod
+    def from_file(cls, path: str) -> "WaterModel":
+        """Load profiles from a JSON object keyed by location"""
+        with open(path, encoding="utf-8") as handle:
+            return cls(json.load(handle))
+
+    def _hourly_series(self, location: str) -> np.ndarray:
+        profile = self.profiles[location]
+        if "hourly_wue" in profile:
+            series = np.asarray(profile["hourly_wue"], dtype=float)
+            if len(series) != Config.HOURS_PER_YEAR:
+                raise ValueError(f"{location}: hourly_wue needs {Config.HOURS_PER_YEAR} values")
+            return series
+        if "monthly_wue" in profile:
+            monthly = np.asarray(profile["monthly_wue"], dtype=float)
+            if len(monthly) != 12:
+                raise ValueError(f"{location}: monthly_wue needs 12 values")
+            return monthly[self.month_of_hour]
+
+        # Cosine cycles around the catalog constant, rescaled to keep its annual mean
+        month_phase = 2 * np.pi * (self.month_of_hour + 1 - profile["peak_month"]) / 12
+        hour_phase = 2 * np.pi * (self.hours.hour.to_numpy() - profile["peak_hour"]) / 24
+        shape = (1 + profile["seasonal_amplitude"] * np.cos(month_phase)) * (
+            1 + profile["diurnal_amplitude"] * np.cos(hour_phase)
+        )
+        return Config.LOCATIONS[location]["water"] * shape / shape.mean()
+
+    def monthly_wue(self) -> pd.DataFrame:
+        """Mean on-site WUE (L/kWh) per location and month"""
+        return pd.DataFrame(
+            self.period_wue["month"].T, columns=self.locations, index=pd.RangeIndex(1, 13, name="month")
+        )
+
+    def evaluate(self, location_codes: np.ndarray, energy_kwh: np.ndarray,
+                 freq: str = "hour") -> Dict[str, np.ndarray]:
+        """
+        Water for a time series of energy use.
+
+        Args:
+            location_codes: (n,) positions in Config.LOCATIONS
+            energy_kwh: (n, periods) facility energy per hour (freq="hour",
+                Config.HOURS_PER_YEAR columns) or per month (freq="month", 12)
+            freq: Resolution of `energy_kwh`
+
+        Returns:
+            (n, periods) arrays: "onsite_water", "offsite_water",
+            "total_water" and "scarcity_weighted_water" (L)
+        """
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unknown frequency '{freq}', expected one of {', '.join(FREQUENCIES)}")
+        onsite = energy_kwh * self.period_wue[freq][location_codes]
+        offsite = energy_kwh * self.grid_water[location_codes, None]
+        total = onsite + offsite
+        return {
+            "onsite_water": onsite,
+            "offsite_water": offsite,
+            "total_water": total,
+            "scarcity_weighted_water": total * self.scarcity[location_codes, None]
+        }
+
+    def _wue_hours(self, location_codes: np.ndarray, hours: np.ndarray) -> np.ndarray:
+        # WUE summed over the first `hours` (fractional, 0..HOURS_PER_YEAR) hours of the year
+        whole = np.minimum(np.floor(hours).astype(np.int64), Config.HOURS_PER_YEAR - 1)
+        return self.cumulative_wue[location_codes, whole] + (hours - whole) * self.hourly_wue[location_codes, whole]
+
+    def spread(self, location_codes: np.ndarray, energy_kwh: np.ndarray, duration_hours: np.ndarray,
+               freq: str = "month"):
+        """
+        Facility energy and on-site water per period of a flat load.
+
+        The load runs from the start of the profile year for
+        `duration_hours`; time past the end of the year wraps around, so a
+        three-year load puts three Januaries into the January column.
+
+        Args:
+            location_codes: (n,) positions in Config.LOCATIONS
+            energy_kwh: (n,) energy of the whole load
+            duration_hours: (n,) hours it runs for
+            freq: "month" or "hour"
+
+        Returns:
+            ((n, periods) energy in kWh, (n, periods) on-site water in L)
+        """
+        lengths, starts = self.period_hours[freq], self.period_starts[freq]
+        duration = np.asarray(duration_hours, dtype=float)
+        load = np.divide(energy_kwh, duration, out=np.zeros(len(duration)), where=duration > 0)
+        full_years, rest = np.divmod(duration, Config.HOURS_PER_YEAR)
+
+        # Every period is covered full_years times, plus once more if it ends
+        # before `rest`; only the period holding `rest` is partly covered
+        hours = np.clip(rest[:, None] - starts, 0, lengths)
+        hours += full_years[:, None] * lengths
+        wue_hours = (self.period_wue[freq] * lengths)[location_codes]
+        wue_hours *= full_years[:, None] + (starts + lengths <= rest[:, None])
+        partial = np.searchsorted(starts + lengths, rest, side="right")
+        rows = np.flatnonzero((partial < len(starts)) & (rest > 0))
+        wue_hours[rows, partial[rows]] += (self._wue_hours(location_codes[rows], rest[rows])
+                                           - self._wue_hours(location_codes[rows], starts[partial[rows]]))
+        hours *= load[:, None]
+        wue_hours *= load[:, None]
+        return hours, wue_hours
+
+    def iter_profiles(self, inputs: pd.DataFrame, results: pd.DataFrame, freq: str = "month",
+                      chunk_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Calendar water profiles, one chunk of scenarios at a time.
+
+        Training energy is spread over training_hours and inference energy
+        over inference_days, both from the start of the profile year (see
+        spread), so the periods sum to the scenario's whole water use. For
+        phases of whole years, on-site water equals calculate_water_usage.
+
+        Args:
+            inputs: Batch input frame (needs location, training_hours and
+                inference_days)
+            results: calculate_batch output for `inputs`
+            freq: "month" (12 columns) or "hour" (Config.HOURS_PER_YEAR columns)
+            chunk_rows: Scenarios evaluated per chunk, by default as many as
+                fit in CHUNK_CELLS at the chosen resolution
+
+        Yields:
+            Frames indexed like the chunk with (quantity, period) columns
+        """
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unknown frequency '{freq}', expected one of {', '.join(FREQUENCIES)}")
+        codes = ImpactCalculator._codes(inputs["location"], Config.LOCATIONS)
+        phases = [
+            (results["training_energy"].to_numpy(dtype=float), inputs["training_hours"].to_numpy(dtype=float)),
+            (results["inference_energy"].to_numpy(dtype=float), inputs["inference_days"].to_numpy(dtype=float) * 24)
+        ]
+        periods = np.arange(1, 13) if freq == "month" else np.arange(Config.HOURS_PER_YEAR)
+        chunk_rows = chunk_rows or max(1, CHUNK_CELLS // len(periods))
+
+        for start in range(0, len(inputs), chunk_rows):
+            rows = slice(start, start + chunk_rows)
+            (energy, onsite), (phase_kwh, phase_onsite) = (
+                self.spread(codes[rows], phase_energy[rows], duration[rows], freq) for phase_energy, duration in phases
+            )
+            energy += phase_kwh
+            onsite += phase_onsite
+            offsite = energy * self.grid_water[codes[rows], None]
+            water = {
+                "onsite_water": onsite,
+                "offsite_water": offsite,
+                "total_water": onsite + offsite,
+                "scarcity_weighted_water": (onsite + offsite) * self.scarcity[codes[rows], None]
+            }
+            columns = pd.MultiIndex.from_product([list(water), periods], names=["quantity", freq])
+            yield pd.DataFrame(np.hstack(list(water.values())), index=inputs.index[rows], columns=columns)
+
+    def annual_totals(self, inputs: pd.DataFrame, results: pd.DataFrame,
+                      chunk_rows: Optional[int] = None) -> pd.DataFrame:
+        """Onsite/offsite/total/scarcity-weighted water over each scenario's period and its peak month"""
+        parts = []
+        for monthly in self.iter_profiles(inputs, results, "month", chunk_rows):
+            totals = monthly.T.groupby(level="quantity", sort=False).sum().T
+            totals["peak_month"] = monthly["total_water"].to_numpy().argmax(axis=1) + 1
+            parts.append(totals)
+        return pd.concat(parts) if parts else pd.DataFrame()
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Seasonal water profiles for a scenario CSV")
+    parser.add_argument("input", help="Scenario CSV (batch.py columns)")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--freq", choices=FREQUENCIES + ("year",), default="year",
+                        help="Profile resolution; 'year' writes whole-period totals only")
+    parser.add_argument("--profiles", metavar="PATH", help="JSON water profiles replacing the built-in ones")
+    parser.add_argument("--chunk-rows", type=int, help="Scenarios per chunk (default: sized by resolution)")
+    args = parser.parse_args(argv)
+
+    from batch import load_scenarios
+    model = WaterModel.from_file(args.profiles) if args.profiles else WaterModel()
+    inputs = load_scenarios(args.input)
+    results = ImpactCalculator.calculate_batch(inputs)
+    if args.freq == "year":
+        model.annual_totals(inputs, results, args.chunk_rows).to_csv(args.output)
+    else:
+        # Chunks are appended as they are computed, so hourly output never sits in memory whole
+        for number, frame in enumerate(model.iter_profiles(inputs, results, args.freq, args.chunk_rows)):
+            frame.columns = [f"{quantity}_{period}" for quantity, period in frame.columns]
+            frame.to_csv(args.output, mode="w" if number == 0 else "a", header=number == 0)
+    print(f"Wrote water profiles for {len(inputs)} scenarios to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())